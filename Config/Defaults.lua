@@ -50,6 +50,7 @@ local ICON_DEFAULTS = {
 local LEARN_CONFIG_DEFAULTS = {
     enabled = true,
     maxPerMinute = 5,
+    maxPending = 64, -- spells awaiting a learned-DB commit; observations of further spells are dropped
     agingSoftDays = 30,
     agingHardDays = 90,
 }
@@ -74,8 +75,40 @@ local HEALS_DEFAULTS = {
     useLHC = false,
 }
 
+-- DamagePrediction EMA and confidence buckets; tuned with scripts/bench/score_predictions.py.
+local DAMAGE_DEFAULTS = {
+    emaWindow = 3,
+    staleWindow = 5,
+    highSamples = 10,
+    highAge = 1.5,
+    mediumSamples = 3,
+    mediumAge = 3,
+}
+
+-- PredictiveSolver projection cache: results live for one dispatcher tick, keyed by tLand rounded to landQuantum.
+local SOLVER_DEFAULTS = {
+    cacheWindow = 0.2,
+    landQuantum = 0.05,
+}
+
+-- Dispatcher tick scheduler: interval multipliers out of combat and for high-priority handlers
+-- while a unit is dying or the player casts, and the per-tick budget before lower priorities back off.
+local SCHEDULER_DEFAULTS = {
+    idleFactor = 2.5,
+    urgentFactor = 0.5,
+    budgetMs = 2,
+}
+
+-- Dispatcher profiler (/nod prof): sessions saved to NODHealDB.profiling for scripts/profile_report.py.
+local PROFILER_DEFAULTS = {
+    persist = false, -- save the running profile on logout
+    maxSessions = 5,
+}
+
 local LEARNED_DEFAULTS = {
-    -- learned.hots = { [spellId] = { learned = true, class = "PRIEST", lastSeen = timestamp } }
+    -- learned.hots = { [spellId] = { seen, avg_tick, period, lastTimestamp, lastSeen = time() } }
+    -- learned.cds = { [spellId] = { class = "EXTERNAL", lastSeen = time() } }
+    -- Between sessions both live in learned.packed (see Core/LearnedStore.lua).
     hots = {},
     cds = {},
     block = {},
@@ -93,10 +126,15 @@ local CONFIG_DEFAULTS = {
     showIncoming = true,
     showOverheal = true,
     lockGrid = false,
+    gridTickBudgetMs = 1.5, -- per-tick time for refreshing changed grid frames, lowest health first
     icons = ICON_DEFAULTS,
     learn = LEARN_CONFIG_DEFAULTS,
     major = MAJOR_DEFAULTS,
     heals = HEALS_DEFAULTS,
+    damage = DAMAGE_DEFAULTS,
+    solver = SOLVER_DEFAULTS,
+    scheduler = SCHEDULER_DEFAULTS,
+    profiler = PROFILER_DEFAULTS,
 }
 
 local function mergeDefaults(target, defaults)
@@ -188,6 +226,18 @@ local function ensureConfig(store)
     local healsCfg = ensureSubtable("heals", HEALS_DEFAULTS)
     config.heals = healsCfg
 
+    local damageCfg = ensureSubtable("damage", DAMAGE_DEFAULTS)
+    config.damage = damageCfg
+
+    local solverCfg = ensureSubtable("solver", SOLVER_DEFAULTS)
+    config.solver = solverCfg
+
+    local schedulerCfg = ensureSubtable("scheduler", SCHEDULER_DEFAULTS)
+    config.scheduler = schedulerCfg
+
+    local profilerCfg = ensureSubtable("profiler", PROFILER_DEFAULTS)
+    config.profiler = profilerCfg
+
     if type(config.logThrottle) == "number" and config.logThrottle < 0 then
         config.logThrottle = 0
     end
@@ -0,0 +1,353 @@
+-- Module: AuraCache
+-- Purpose: Scan each unit's auras once per UNIT_AURA into pooled records shared by the solver and the grid.
+-- API: C_UnitAuras.GetAuraDataByIndex, C_UnitAuras.GetAuraDataByAuraInstanceID, UnitAura, UnitIsUnit, UnitGUID, GetTime
+
+local C_UnitAuras = C_UnitAuras
+local UnitAura = UnitAura
+local UnitIsUnit = UnitIsUnit
+local UnitGUID = UnitGUID
+local GetTime = GetTime
+local pairs = pairs
+local type = type
+local tremove = table.remove
+
+local MAX_AURAS = 40
+
+-- Snapshots per unit token. A snapshot is rescanned lazily on the first read after a full
+-- UNIT_AURA; incremental updateInfo payloads are applied in place while the snapshot is current.
+local snapshots = {}
+local recordPool = {}
+local rosterModule
+local scans = 0
+
+local function acquireRecord()
+  local count = #recordPool
+  local record = recordPool[count]
+  if record then
+    recordPool[count] = nil
+    return record
+  end
+  return {}
+end
+
+local function releaseRecord(record)
+  for key in pairs(record) do
+    record[key] = nil
+  end
+  recordPool[#recordPool + 1] = record
+end
+
+local function isOwnCaster(source)
+  if not source or not UnitIsUnit then
+    return false
+  end
+  return UnitIsUnit(source, "player") or UnitIsUnit(source, "pet") or false
+end
+
+-- Record fields follow the client's AuraData names, so AuraData-shaped consumers read either.
+local function fillFromData(record, data, harmful)
+  record.name = data.name
+  record.icon = data.icon
+  record.applications = data.applications or 0
+  record.dispelName = data.dispelName
+  record.duration = data.duration or 0
+  record.expirationTime = data.expirationTime or 0
+  record.sourceUnit = data.sourceUnit
+  record.spellId = data.spellId
+  record.auraInstanceID = data.auraInstanceID
+  record.timeMod = data.timeMod
+  record.points = data.points
+  record.isHarmful = harmful
+  record.own = isOwnCaster(data.sourceUnit)
+  return record
+end
+
+local function fillFromLegacy(record, harmful, name, icon, count, dispelType, duration, expirationTime, source, spellId)
+  record.name = name
+  record.icon = icon
+  record.applications = count or 0
+  record.dispelName = dispelType
+  record.duration = duration or 0
+  record.expirationTime = expirationTime or 0
+  record.sourceUnit = source
+  record.spellId = spellId
+  record.isHarmful = harmful
+  record.own = isOwnCaster(source)
+  return record
+end
+
+local function newSnapshot()
+  return {
+    dirty = true,
+    helpful = {},
+    harmful = {},
+    bySpell = {},
+    ownBySpell = {},
+    byInstance = {},
+  }
+end
+
+local function clearList(list)
+  for index = #list, 1, -1 do
+    releaseRecord(list[index])
+    list[index] = nil
+  end
+end
+
+local function clearMap(map)
+  for key in pairs(map) do
+    map[key] = nil
+  end
+end
+
+local function indexInstances(byInstance, list)
+  for index = 1, #list do
+    local instance = list[index].auraInstanceID
+    if instance then
+      byInstance[instance] = list[index]
+    end
+  end
+end
+
+-- True when `record` was applied before `other` (lower auraInstanceID). List position is no
+-- tie-break: incremental updates append added auras, so it stops matching the aura index.
+local function appliedBefore(record, other)
+  local instance, otherInstance = record.auraInstanceID, other.auraInstanceID
+  return instance ~= nil and otherInstance ~= nil and instance < otherInstance
+end
+
+local function reindex(snapshot)
+  local bySpell, ownBySpell, byInstance = snapshot.bySpell, snapshot.ownBySpell, snapshot.byInstance
+  clearMap(bySpell)
+  clearMap(ownBySpell)
+  clearMap(byInstance)
+  local helpful = snapshot.helpful
+  for index = 1, #helpful do
+    local record = helpful[index]
+    local spellId = record.spellId
+    if spellId then
+      -- The player's own copy wins the plain spell index, as it is the one a healer acts on.
+      local best = bySpell[spellId]
+      if not best or (record.own and not best.own)
+          or (record.own == best.own and appliedBefore(record, best)) then
+        bySpell[spellId] = record
+      end
+      local ownBest = ownBySpell[spellId]
+      if record.own and (not ownBest or appliedBefore(record, ownBest)) then
+        ownBySpell[spellId] = record
+      end
+    end
+  end
+  indexInstances(byInstance, helpful)
+  indexInstances(byInstance, snapshot.harmful)
+  snapshot.indexDirty = false
+end
+
+local function scanFilter(unit, list, filter, harmful)
+  local getByIndex = C_UnitAuras and C_UnitAuras.GetAuraDataByIndex
+  for index = 1, MAX_AURAS do
+    if getByIndex then
+      local data = getByIndex(unit, index, filter)
+      if not data then
+        break
+      end
+      list[index] = fillFromData(acquireRecord(), data, harmful)
+    elseif UnitAura then
+      local name, icon, count, dispelType, duration, expirationTime, source, _, _, spellId = UnitAura(unit, index, filter)
+      if not name then
+        break
+      end
+      list[index] = fillFromLegacy(acquireRecord(), harmful, name, icon, count, dispelType, duration, expirationTime, source, spellId)
+    else
+      break
+    end
+  end
+end
+
+local function scan(unit, snapshot)
+  clearList(snapshot.helpful)
+  clearList(snapshot.harmful)
+  scanFilter(unit, snapshot.helpful, "HELPFUL", false)
+  scanFilter(unit, snapshot.harmful, "HARMFUL", true)
+  snapshot.dirty = false
+  snapshot.indexDirty = true
+  scans = scans + 1
+end
+
+local function removeFromList(list, instance)
+  for index = 1, #list do
+    if list[index].auraInstanceID == instance then
+      releaseRecord(tremove(list, index))
+      return true
+    end
+  end
+  return false
+end
+
+local function removeInstance(snapshot, instance)
+  return removeFromList(snapshot.helpful, instance) or removeFromList(snapshot.harmful, instance)
+end
+
+-- Applies an incremental UNIT_AURA payload; returns false when a full rescan is needed instead.
+local function applyUpdate(unit, snapshot, info)
+  local getByInstance = C_UnitAuras and C_UnitAuras.GetAuraDataByAuraInstanceID
+  if not getByInstance then
+    return false
+  end
+  if snapshot.indexDirty then
+    reindex(snapshot)
+  end
+
+  local removed = info.removedAuraInstanceIDs
+  if removed then
+    for index = 1, #removed do
+      if not removeInstance(snapshot, removed[index]) then
+        return false
+      end
+    end
+  end
+
+  local updated = info.updatedAuraInstanceIDs
+  if updated then
+    for index = 1, #updated do
+      local instance = updated[index]
+      local record = snapshot.byInstance[instance]
+      local data = getByInstance(unit, instance)
+      if not record or not data then
+        return false
+      end
+      fillFromData(record, data, record.isHarmful)
+    end
+  end
+
+  local added = info.addedAuras
+  if added then
+    for index = 1, #added do
+      local data = added[index]
+      local harmful = data.isHarmful and true or false
+      local list = harmful and snapshot.harmful or snapshot.helpful
+      if #list >= MAX_AURAS then
+        return false
+      end
+      list[#list + 1] = fillFromData(acquireRecord(), data, harmful)
+    end
+  end
+
+  snapshot.indexDirty = true
+  return true
+end
+
+-- Group members are cached until UNIT_AURA or a roster change. Target, focus, nameplate and pet
+-- tokens can be reassigned to another unit without a full UNIT_AURA, so their snapshots only
+-- hold for the frame they were scanned in and while the token still points at the same GUID.
+local function isCachedUnit(unit)
+  if not rosterModule then
+    local namespace = _G.NODHeal
+    rosterModule = namespace and namespace.GetModule and namespace:GetModule("RosterIndex")
+    if not rosterModule then
+      return true
+    end
+  end
+  return rosterModule.IsRosterUnit(unit)
+end
+
+local function ensureSnapshot(unit)
+  if type(unit) ~= "string" then
+    return nil
+  end
+  local snapshot = snapshots[unit]
+  if not snapshot then
+    snapshot = newSnapshot()
+    snapshots[unit] = snapshot
+  end
+  if not snapshot.dirty and not isCachedUnit(unit) then
+    local guid = UnitGUID and UnitGUID(unit)
+    local now = GetTime and GetTime()
+    if guid ~= snapshot.guid or now ~= snapshot.scannedAt then
+      snapshot.dirty = true
+    end
+  end
+  if snapshot.dirty then
+    scan(unit, snapshot)
+    snapshot.guid = UnitGUID and UnitGUID(unit)
+    snapshot.scannedAt = GetTime and GetTime()
+  end
+  if snapshot.indexDirty then
+    reindex(snapshot)
+  end
+  return snapshot
+end
+
+local function dropSnapshot(unit)
+  local snapshot = snapshots[unit]
+  if snapshot then
+    clearList(snapshot.helpful)
+    clearList(snapshot.harmful)
+    clearMap(snapshot.bySpell)
+    clearMap(snapshot.ownBySpell)
+    clearMap(snapshot.byInstance)
+    snapshot.dirty = true
+  end
+end
+
+local M = {}
+
+function M.Initialize(dispatcher)
+  if dispatcher and dispatcher.RegisterHandler then
+    dispatcher.RegisterHandler("UNIT_AURA", function(_, unit, info)
+      M.Invalidate(unit, info)
+    end)
+    dispatcher.RegisterHandler("GROUP_ROSTER_UPDATE", function()
+      M.Invalidate(nil)
+    end)
+  end
+end
+
+-- Marks `unit` (every unit when nil) for a rescan, or applies a UNIT_AURA updateInfo in place.
+function M.Invalidate(unit, info)
+  if not unit then
+    for token in pairs(snapshots) do
+      dropSnapshot(token)
+    end
+    return
+  end
+  local snapshot = snapshots[unit]
+  if not snapshot or snapshot.dirty then
+    return
+  end
+  if type(info) == "table" and not info.isFullUpdate and applyUpdate(unit, snapshot, info) then
+    return
+  end
+  dropSnapshot(unit)
+end
+
+-- Returns the unit's snapshot: `helpful` and `harmful` record lists plus `bySpell`, `ownBySpell`
+-- (player/pet casts) and `byInstance` indexes. Lists are in aura index order after a full scan
+-- only; incremental updates append added auras, so break ties on auraInstanceID, not position.
+-- Records are pooled; read them during the call and keep no references across UNIT_AURA events.
+function M.GetUnit(unit)
+  return ensureSnapshot(unit)
+end
+
+-- Helpful aura with `spellId` on `unit`, preferring the player's own; `ownOnly` skips others'.
+function M.FindHelpful(unit, spellId, ownOnly)
+  local snapshot = ensureSnapshot(unit)
+  if not snapshot or not spellId then
+    return nil
+  end
+  if ownOnly then
+    return snapshot.ownBySpell[spellId]
+  end
+  return snapshot.bySpell[spellId]
+end
+
+function M.DebugStats()
+  local units, records = 0, 0
+  for _, snapshot in pairs(snapshots) do
+    units = units + 1
+    records = records + #snapshot.helpful + #snapshot.harmful
+  end
+  return { units = units, records = records, pooled = #recordPool, scans = scans }
+end
+
+return _G.NODHeal:RegisterModule("AuraCache", M)
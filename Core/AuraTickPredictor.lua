@@ -1,18 +1,15 @@
 -- Module: AuraTickPredictor
 -- Purpose: Derive upcoming HoT ticks until the specified landing window for predictive healing merges.
--- API: AuraUtil.ForEachAura, UnitAura, GetTime
+-- API: AuraCache.FindHelpful, GetTime
 
-local AuraUtil = AuraUtil
-local UnitAura = UnitAura
 local GetTime = GetTime
 local pairs = pairs
-local ipairs = ipairs
 local wipe = wipe
 local floor = math.floor
 local max = math.max
 local min = math.min
 local sort = table.sort
-local tinsert = table.insert
+local type = type
 
 local auraCache = {}
 
@@ -27,52 +24,21 @@ if not wipe then
   end
 end
 
+local auraCacheModule
+
 local function fetchAura(unit, spellID)
   if not unit or not spellID then
     return nil
   end
 
-  local auraData
-  if AuraUtil and AuraUtil.ForEachAura then
-    AuraUtil.ForEachAura(unit, "HELPFUL", nil, function(aura)
-      if aura and aura.spellId == spellID then
-        auraData = aura
-        return true
-      end
-    end)
-  elseif AuraUtil and AuraUtil.FindAuraBySpellID then
-    local name, _, _, _, duration, expirationTime, source, _, _, spellId = AuraUtil.FindAuraBySpellID(spellID, unit, "HELPFUL")
-    if name then
-      auraData = {
-        spellId = spellId,
-        duration = duration,
-        expirationTime = expirationTime,
-        sourceUnit = source,
-      }
-    end
-  end
-
-  if not auraData and UnitAura then
-    for index = 1, 40 do
-      local name, _, count, _, duration, expirationTime, source, _, _, auraSpellID = UnitAura(unit, index, "HELPFUL")
-      if not name then
-        break
-      end
-
-      if auraSpellID == spellID then
-        auraData = {
-          spellId = auraSpellID,
-          duration = duration,
-          expirationTime = expirationTime,
-          applications = count,
-          sourceUnit = source,
-        }
-        break
-      end
+  if not auraCacheModule then
+    local namespace = _G.NODHeal
+    auraCacheModule = namespace and namespace.GetModule and namespace:GetModule("AuraCache")
+    if not auraCacheModule then
+      return nil
     end
   end
-
-  return auraData
+  return auraCacheModule.FindHelpful(unit, spellID)
 end
 
 local function resolveTickInterval(aura)
@@ -131,29 +97,20 @@ local function resolveTickAmount(aura)
   return 0
 end
 
-local function buildTickSchedule(aura, now, horizon)
+-- Ticks land at auraStart + k * tickInterval; a tick this close past the horizon still counts.
+local TICK_TOLERANCE = 0.01
+
+-- Closed-form tick schedule up to `horizon`, without building the tick list.
+-- Returns count, total, tickInterval, tickAmount, expires, firstTick.
+local function summarize(aura, now, horizon)
   local expires = aura and aura.expirationTime
   if not expires or expires <= now then
-    return {
-      count = 0,
-      ticks = {},
-      expires = expires or 0,
-      tickInterval = 0,
-      tickAmount = 0,
-      total = 0,
-    }
+    return 0, 0, 0, 0, expires or 0, 0
   end
 
   local tickInterval = resolveTickInterval(aura)
   if not tickInterval or tickInterval <= 0 then
-    return {
-      count = 0,
-      ticks = {},
-      expires = expires,
-      tickInterval = 0,
-      tickAmount = 0,
-      total = 0,
-    }
+    return 0, 0, 0, 0, expires, 0
   end
 
   local duration = aura.duration or 0
@@ -162,113 +119,167 @@ local function buildTickSchedule(aura, now, horizon)
     auraStart = now
   end
 
+  local tickAmount = resolveTickAmount(aura)
   local effectiveEnd = min(expires, horizon)
   if effectiveEnd <= now then
-    return {
-      count = 0,
-      ticks = {},
-      expires = expires,
-      tickInterval = tickInterval,
-      tickAmount = resolveTickAmount(aura),
-      total = 0,
-    }
+    return 0, 0, tickInterval, tickAmount, expires, 0
   end
 
   local elapsed = max(0, now - auraStart)
-  local ticksPassed = floor(elapsed / tickInterval)
-  local nextTick = auraStart + (ticksPassed + 1) * tickInterval
+  local firstTick = auraStart + (floor(elapsed / tickInterval) + 1) * tickInterval
+  local span = effectiveEnd + TICK_TOLERANCE - firstTick
+  if span < 0 then
+    return 0, 0, tickInterval, tickAmount, expires, firstTick
+  end
 
-  local tickAmount = resolveTickAmount(aura)
-  local ticks = {}
-  while nextTick <= effectiveEnd + 0.01 do
-    if nextTick >= now then
-      tinsert(ticks, { time = nextTick, amount = tickAmount })
+  local count = floor(span / tickInterval) + 1
+  return count, tickAmount * count, tickInterval, tickAmount, expires, firstTick
+end
+
+local function clampHorizon(now, T_land)
+  local horizon = T_land or now
+  if horizon < now then
+    horizon = now
+  end
+  return horizon
+end
+
+local function resetSchedule(schedule)
+  schedule.count = 0
+  schedule.total = 0
+  schedule.expires = 0
+  schedule.tickInterval = 0
+  schedule.tickAmount = 0
+  schedule.firstTick = 0
+  schedule.horizon = nil
+  schedule.spellID = nil
+  local ticks = schedule.ticks
+  for index = #ticks, 1, -1 do
+    ticks[index] = nil
+  end
+  return schedule
+end
+
+local function newSchedule()
+  return resetSchedule({ ticks = {} })
+end
+
+local emptySchedule = newSchedule()
+
+-- Fills `schedule.ticks` from the summary, reusing the tick tables already in it.
+local function fillTicks(schedule)
+  local ticks = schedule.ticks
+  local count = schedule.count
+  for index = 1, count do
+    local tick = ticks[index]
+    if not tick then
+      tick = {}
+      ticks[index] = tick
     end
-    nextTick = nextTick + tickInterval
+    tick.time = schedule.firstTick + (index - 1) * schedule.tickInterval
+    tick.amount = schedule.tickAmount
   end
+  for index = #ticks, count + 1, -1 do
+    ticks[index] = nil
+  end
+end
 
-  return {
-    count = #ticks,
-    ticks = ticks,
-    expires = expires,
-    tickInterval = tickInterval,
-    tickAmount = tickAmount,
-    total = tickAmount * #ticks,
-  }
+local function markStale(unitCache)
+  for _, schedule in pairs(unitCache) do
+    schedule.horizon = nil
+  end
 end
 
 local M = {}
 
 function M.Initialize(dispatcher)
   if dispatcher and dispatcher.RegisterHandler then
-    dispatcher:RegisterHandler("UNIT_AURA", function(_, unit)
-      if unit then
-        auraCache[unit] = nil
-      end
+    dispatcher.RegisterHandler("UNIT_AURA", function(_, unit)
+      M.RefreshUnit(unit)
     end)
-    dispatcher:RegisterHandler("GROUP_ROSTER_UPDATE", function()
+    dispatcher.RegisterHandler("GROUP_ROSTER_UPDATE", function()
       wipe(auraCache)
     end)
   end
 end
 
+-- Cached schedules are kept and recomputed in place on their next read.
 function M.RefreshUnit(unit)
   if not unit then
     return
   end
 
-  auraCache[unit] = nil
+  local unitCache = auraCache[unit]
+  if unitCache then
+    markStale(unitCache)
+  end
 end
 
-function M.GetHoTTicks(unit, spellID, T_land)
+-- Allocation-free fast path: count, total, tickInterval, tickAmount and expires of `spellID`'s
+-- HoT on `unit` up to T_land.
+function M.SummarizeHoT(unit, spellID, T_land)
   if not unit or not spellID then
-    return { ticks = {}, total = 0, count = 0, expires = 0, tickInterval = 0, tickAmount = 0 }
+    return 0, 0, 0, 0, 0
   end
 
   local now = GetTime()
-  local horizon = T_land or now
-  if horizon < now then
-    horizon = now
+  local count, total, tickInterval, tickAmount, expires = summarize(fetchAura(unit, spellID), now, clampHorizon(now, T_land))
+  return count, total, tickInterval, tickAmount, expires
+end
+
+-- Detailed schedule with its `ticks` list. The table is reused per unit and spell: read it,
+-- do not keep it across calls.
+function M.GetHoTTicks(unit, spellID, T_land)
+  if not unit or not spellID then
+    return resetSchedule(emptySchedule)
   end
 
+  local now = GetTime()
+  local horizon = clampHorizon(now, T_land)
+
   local unitCache = auraCache[unit]
   if not unitCache then
     unitCache = {}
     auraCache[unit] = unitCache
   end
 
-  local key = spellID
-  local cached = unitCache[key]
-  if cached and cached.expires and cached.expires > now and cached.horizon == horizon then
-    return cached
+  local schedule = unitCache[spellID]
+  if schedule and schedule.expires > now and schedule.horizon == horizon then
+    return schedule
   end
-
-  local aura = fetchAura(unit, spellID)
-  if not aura then
-    unitCache[key] = { ticks = {}, total = 0, count = 0, expires = 0, tickInterval = 0, tickAmount = 0 }
-    return unitCache[key]
+  if not schedule then
+    schedule = newSchedule()
+    unitCache[spellID] = schedule
   end
 
-  local schedule = buildTickSchedule(aura, now, horizon)
+  local count, total, tickInterval, tickAmount, expires, firstTick = summarize(fetchAura(unit, spellID), now, horizon)
+  schedule.count = count
+  schedule.total = total
+  schedule.tickInterval = tickInterval
+  schedule.tickAmount = tickAmount
+  schedule.expires = expires
+  schedule.firstTick = firstTick
   schedule.horizon = horizon
   schedule.spellID = spellID
-  unitCache[key] = schedule
+  fillTicks(schedule)
   return schedule
 end
 
+local filterSet = {}
+
 local function normalizeFilter(filter)
   if type(filter) ~= "table" then
     return nil
   end
 
-  local normalized = {}
+  wipe(filterSet)
   local count = 0
   for key, value in pairs(filter) do
     if type(key) == "number" and value then
-      normalized[key] = true
+      filterSet[key] = true
       count = count + 1
     elseif type(value) == "number" then
-      normalized[value] = true
+      filterSet[value] = true
       count = count + 1
     end
   end
@@ -277,54 +288,78 @@ local function normalizeFilter(filter)
     return nil
   end
 
-  return normalized
+  return filterSet
+end
+
+-- Summed HoT count and total up to T_land over `spellFilter` (a list or set of spell IDs).
+function M.SummarizeHoTs(unit, spellFilter, T_land)
+  local filter = unit and normalizeFilter(spellFilter)
+  if not filter then
+    return 0, 0
+  end
+
+  local now = GetTime()
+  local horizon = clampHorizon(now, T_land)
+  local count, total = 0, 0
+  for spellID in pairs(filter) do
+    local spellCount, spellTotal = summarize(fetchAura(unit, spellID), now, horizon)
+    count = count + spellCount
+    total = total + spellTotal
+  end
+  return count, total
 end
 
+local collected = { total = 0, ticks = {}, spells = {} }
+local mergedPool = {}
+
+local function byTimeThenSpell(left, right)
+  if left.time == right.time then
+    return (left.spellID or 0) < (right.spellID or 0)
+  end
+  return left.time < right.time
+end
+
+-- Merged, time-ordered ticks of every HoT in `spellFilter`. The result and its tick entries are
+-- reused by the next call.
 function M.CollectHoTs(unit, spellFilter, T_land)
-  if not unit then
-    return { total = 0, ticks = {}, spells = {} }
+  local ticks = collected.ticks
+  for index = #ticks, 1, -1 do
+    ticks[index] = nil
   end
+  wipe(collected.spells)
+  collected.total = 0
 
-  local filterSet = normalizeFilter(spellFilter)
-  if not filterSet then
-    return { total = 0, ticks = {}, spells = {} }
+  local filter = unit and normalizeFilter(spellFilter)
+  if not filter then
+    return collected
   end
 
-  local ticks = {}
-  local spells = {}
   local total = 0
-  for spellID in pairs(filterSet) do
+  local merged = 0
+  for spellID in pairs(filter) do
     local schedule = M.GetHoTTicks(unit, spellID, T_land)
-    spells[spellID] = schedule
-    if schedule and schedule.count > 0 then
-      total = total + (schedule.total or 0)
-      for index, tick in ipairs(schedule.ticks or {}) do
-        ticks[#ticks + 1] = {
-          spellID = spellID,
-          time = tick.time,
-          amount = tick.amount,
-          index = index,
-        }
+    collected.spells[spellID] = schedule
+    if schedule.count > 0 then
+      total = total + schedule.total
+      for index = 1, schedule.count do
+        local tick = schedule.ticks[index]
+        merged = merged + 1
+        local entry = mergedPool[merged]
+        if not entry then
+          entry = {}
+          mergedPool[merged] = entry
+        end
+        entry.spellID = spellID
+        entry.time = tick.time
+        entry.amount = tick.amount
+        ticks[merged] = entry
       end
     end
   end
 
-  sort(ticks, function(left, right)
-    if left.time == right.time then
-      return (left.spellID or 0) < (right.spellID or 0)
-    end
-    return left.time < right.time
-  end)
-
-  for i = 1, #ticks do
-    ticks[i].index = nil
-  end
-
-  return {
-    total = total,
-    ticks = ticks,
-    spells = spells,
-  }
+  sort(ticks, byTimeThenSpell)
+  collected.total = total
+  return collected
 end
 
 return _G.NODHeal:RegisterModule("AuraTickPredictor", M)
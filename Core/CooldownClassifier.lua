@@ -4,14 +4,12 @@ NODHeal.Core = NODHeal.Core or {}
 NODHeal.Core.CooldownClassifier = M
 
 local CreateFrame = CreateFrame
-local CombatLogGetCurrentEventInfo = CombatLogGetCurrentEventInfo
 local GetTime = GetTime
 local UnitGetTotalAbsorbs = UnitGetTotalAbsorbs
 local UnitGUID = UnitGUID
 local math = math
 local pairs = pairs
 local type = type
-local tremove = table.remove
 local math_min = math and math.min
 local math_max = math and math.max
 local math_floor = math and math.floor
@@ -43,8 +41,16 @@ local SEED = {
     },
 }
 
-local pending = {}
 local lastMinute, learnedCount = 0, 0
+local storeModule
+
+-- Learning queue: one pending record per spellId, committed in first-seen order. A record holds
+-- the class the learned entry will end up with, so a commit writes what per-event updates would have.
+local pendingRecords = {}
+local pendingOrder = {}
+local pendingHead, pendingCount, pendingSize = 1, 0, 0
+local recordPool = {}
+local droppedObservations = 0
 
 local MITIGATION_PCT = {
     DEF = 0.4,
@@ -75,11 +81,24 @@ local function safeMin(a, b)
     return b
 end
 
+local function learnedStore()
+    if not storeModule and NODHeal.GetModule then
+        storeModule = NODHeal:GetModule("LearnedStore")
+    end
+    return storeModule
+end
+
+-- Learned cooldowns come from LearnedStore, which expands packed entries on first access.
 local function ensureSV()
     _G.NODHealDB = _G.NODHealDB or {}
     local DB = _G.NODHealDB
     DB.learned = DB.learned or {}
-    DB.learned.cds = DB.learned.cds or {}
+    local store = learnedStore()
+    if store then
+        store.Open("cds")
+    else
+        DB.learned.cds = DB.learned.cds or {}
+    end
     DB.learned.block = DB.learned.block or {}
 
     NODHeal.Learned = NODHeal.Learned or {}
@@ -301,29 +320,98 @@ local function classFor(spellId)
     return nil
 end
 
+local function pendingLimit()
+    local limit = learnConfig().maxPending or 64
+    if limit < 1 then
+        return 1
+    end
+    return limit
+end
+
+local function releaseRecord(spellId)
+    local record = pendingRecords[spellId]
+    pendingRecords[spellId] = nil
+    if record then
+        record.class = nil
+        recordPool[#recordPool + 1] = record
+    end
+end
+
+local function popPending()
+    local spellId = pendingOrder[pendingHead]
+    pendingOrder[pendingHead] = nil
+    pendingHead = pendingHead % pendingSize + 1
+    pendingCount = pendingCount - 1
+    return spellId
+end
+
+local function clearPending()
+    while pendingCount > 0 do
+        releaseRecord(popPending())
+    end
+end
+
+local function pendingRecord(cds, spellId)
+    local record = pendingRecords[spellId]
+    if record then
+        return record
+    end
+    if pendingCount == 0 then
+        pendingHead, pendingSize = 1, pendingLimit()
+    elseif pendingCount >= pendingSize then
+        return nil
+    end
+
+    local count = #recordPool
+    record = recordPool[count] or {}
+    recordPool[count] = nil
+
+    local entry = cds[spellId]
+    record.fresh = type(entry) ~= "table"
+    record.seen = 0
+    if not record.fresh then
+        record.class = entry.class
+    end
+
+    pendingRecords[spellId] = record
+    pendingOrder[(pendingHead + pendingCount - 1) % pendingSize + 1] = spellId
+    pendingCount = pendingCount + 1
+    return record
+end
+
+local function applyObservation(record, cls)
+    if record.fresh and record.seen == 0 then
+        record.class = cls or "UNKNOWN"
+    elseif cls and cls ~= "UNKNOWN" then
+        record.class = cls
+    end
+    record.seen = record.seen + 1
+end
+
 local function drainQueue()
-    local cds = ensureSV()
     local cfgCap = learnCap()
     if cfgCap <= 0 then
-        pending = {}
+        clearPending()
         return
     end
     resetWindow()
-    while learnedCount < cfgCap and #pending > 0 do
+    if learnedCount >= cfgCap or pendingCount == 0 then
+        return
+    end
+    local cds = ensureSV()
+    while learnedCount < cfgCap and pendingCount > 0 do
         learnedCount = learnedCount + 1
-        local item = tremove(pending, 1)
-        local spellId = item.spellId
-        local cls = item.class
+        local spellId = popPending()
+        local record = pendingRecords[spellId]
         local entry = cds[spellId]
         if type(entry) ~= "table" then
-            entry = { class = cls or "UNKNOWN", lastSeen = GetTime() }
+            entry = {}
             cds[spellId] = entry
-        else
-            if cls and cls ~= "UNKNOWN" then
-                entry.class = cls
-            end
-            entry.lastSeen = GetTime()
         end
+        entry.class = record.class
+        local store = learnedStore()
+        entry.lastSeen = store and store.Now() or GetTime()
+        releaseRecord(spellId)
     end
 end
 
@@ -331,7 +419,12 @@ local function queueLearn(spellId, cls)
     if learnCap() <= 0 then
         return
     end
-    pending[#pending + 1] = { spellId = spellId, class = cls }
+    local record = pendingRecord(ensureSV(), spellId)
+    if not record then
+        droppedObservations = droppedObservations + 1
+        return
+    end
+    applyObservation(record, cls)
     drainQueue()
 end
 
@@ -399,6 +492,10 @@ end
 
 local function countLearned()
     local cds = ensureSV()
+    local store = learnedStore()
+    if store then
+        return store.Count("cds")
+    end
     local total = 0
     if type(cds) ~= "table" then
         return total
@@ -476,6 +573,8 @@ function M.DebugSnapshot()
         learned = learned,
         blocked = blocked,
         blockedSet = blockedSet,
+        pending = pendingCount,
+        dropped = droppedObservations,
     }
 end
 
@@ -496,8 +595,9 @@ function M.Classify(spellId)
     end
     local cds = ensureSV()
     local entry = cds[spellId]
-    if type(entry) == "table" and entry.lastSeen then
-        local days = (GetTime() - entry.lastSeen) / 86400
+    local store = learnedStore()
+    local days = store and type(entry) == "table" and store.AgeDays(entry.lastSeen)
+    if days then
         local cfg = learnConfig()
         local soft = cfg.agingSoftDays or 30
         local hard = cfg.agingHardDays or 90
@@ -510,12 +610,8 @@ function M.Classify(spellId)
     return cls, base
 end
 
-local function handleCombatLog()
-    drainQueue()
-    local _, subEvent, _, _, _, _, _, _, _, _, _, spellId = CombatLogGetCurrentEventInfo()
-    if subEvent ~= "SPELL_AURA_APPLIED" and subEvent ~= "SPELL_AURA_REFRESH" and subEvent ~= "SPELL_AURA_REMOVED" then
-        return
-    end
+local function handleCombatLog(record)
+    local spellId = record.spellID
     if type(spellId) ~= "number" or spellId <= 0 then
         return
     end
@@ -523,14 +619,17 @@ local function handleCombatLog()
     queueLearn(spellId, cls)
 end
 
+function M.Initialize(dispatcher)
+    if dispatcher and dispatcher.RegisterCombatLog then
+        dispatcher.RegisterCombatLog({ "SPELL_AURA_APPLIED", "SPELL_AURA_REFRESH", "SPELL_AURA_REMOVED" }, handleCombatLog)
+    end
+end
+
 local eventFrame = CreateFrame("Frame")
 eventFrame:RegisterEvent("PLAYER_ENTERING_WORLD")
-eventFrame:RegisterEvent("COMBAT_LOG_EVENT_UNFILTERED")
 eventFrame:SetScript("OnEvent", function(_, event)
     if event == "PLAYER_ENTERING_WORLD" then
         drainQueue()
-    elseif event == "COMBAT_LOG_EVENT_UNFILTERED" then
-        handleCombatLog()
     end
 end)
 
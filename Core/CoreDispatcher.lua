@@ -5,6 +5,7 @@ local InCombatLockdown = InCombatLockdown
 local type = type
 local pairs = pairs
 local format = string.format
+local strfind = string.find
 local concat = table.concat
 local tinsert = table.insert
 local tostring = tostring
@@ -13,6 +14,14 @@ local unpack = unpack or table.unpack
 local date = date
 local xpcall = xpcall
 local UnitExists = UnitExists
+local UnitCastingInfo = UnitCastingInfo
+local UnitChannelInfo = UnitChannelInfo
+local CombatLogGetCurrentEventInfo = CombatLogGetCurrentEventInfo
+local math_floor = math.floor
+local math_max = math.max
+local math_min = math.min
+local debugprofilestop = debugprofilestop
+local collectgarbage = collectgarbage
 
 local NODHeal = _G.NODHeal or {}
 _G.NODHeal = NODHeal
@@ -41,14 +50,17 @@ local function pushErr(msg)
   end
 end
 
+-- Shared error handler: a closure per call would make every dispatched handler allocate.
+local function onError(err)
+  pushErr(err)
+  return err
+end
+
 local function safeCall(fn, ...)
   if type(fn) ~= "function" then
     return false
   end
-  return xpcall(fn, function(err)
-    pushErr(err)
-    return err
-  end, ...)
+  return xpcall(fn, onError, ...)
 end
 
 local function debugLog(...)
@@ -89,6 +101,13 @@ local secureQueue = {}
 local secureQueueMap = {}
 local flushingSecureQueue = false
 
+-- Combat log routing: COMBAT_LOG_EVENT_UNFILTERED is decoded once into combatLogRecord and handed
+-- to the subscribers of its subevent; subevents without subscribers return after one table lookup.
+local combatLogRoutes = {}
+local combatLogRecord = {}
+local combatLogAttached = false
+local rosterIndex
+
 local function updateQueueTelemetry()
   local telemetry = NODHeal and NODHeal.Telemetry
   if telemetry and telemetry.UpdateQueueSize then
@@ -115,6 +134,72 @@ local function getModule(name)
   end
 end
 
+-- Opt-in profiler: one stats slot per "<owner>:<event>" label, created at registration so that
+-- profiling itself allocates nothing. Times are inclusive CPU milliseconds from debugprofilestop;
+-- gcKB sums positive collectgarbage("count") deltas across each call.
+local PROFILE_BUCKETS = { 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10 }
+local profileStats = {}
+local profileOrder = {}
+local profiling = false
+local profileOwner
+local profileStarted = 0
+local profileElapsed = 0
+
+local function profileSlot(label)
+  local stats = profileStats[label]
+  if stats then
+    return stats
+  end
+
+  stats = { label = label, calls = 0, totalMs = 0, maxMs = 0, gcKB = 0, hist = {} }
+  for index = 1, #PROFILE_BUCKETS + 1 do
+    stats.hist[index] = 0
+  end
+  profileStats[label] = stats
+  profileOrder[#profileOrder + 1] = stats
+  return stats
+end
+
+local function profileLabel(kind, options)
+  if type(options) == "table" and type(options.label) == "string" then
+    return options.label
+  end
+  if profileOwner then
+    return profileOwner .. ":" .. kind
+  end
+  return kind
+end
+
+local function recordProfile(stats, elapsed, gcDelta)
+  stats.calls = stats.calls + 1
+  stats.totalMs = stats.totalMs + elapsed
+  if elapsed > stats.maxMs then
+    stats.maxMs = elapsed
+  end
+  if gcDelta > 0 then
+    stats.gcKB = stats.gcKB + gcDelta
+  end
+
+  local hist = stats.hist
+  local bucket = #hist
+  for index = 1, #PROFILE_BUCKETS do
+    if elapsed <= PROFILE_BUCKETS[index] then
+      bucket = index
+      break
+    end
+  end
+  hist[bucket] = hist[bucket] + 1
+end
+
+local function profiledCall(stats, fn, ...)
+  local gcBefore = collectgarbage("count")
+  local started = debugprofilestop()
+  local ok = safeCall(fn, ...)
+  recordProfile(stats, debugprofilestop() - started, collectgarbage("count") - gcBefore)
+  return ok
+end
+
+
 local function ensureFrame()
   if dispatcherFrame then
     return dispatcherFrame
@@ -143,7 +228,46 @@ local function ensureFrame()
   return dispatcherFrame
 end
 
-local function addTickHandler(func)
+-- Tick scheduling: one base ticker every TICK_BASE seconds runs the tick handlers that are due.
+-- Each handler has a priority and a target interval; intervals stretch out of combat (idleFactor),
+-- high-priority ones shrink while a unit is dying or the player is casting (urgentFactor), and
+-- normal/low ones back off while ticks run over budgetMs. Fallbacks for NODHeal.Config.scheduler.
+local TICK_BASE = 0.1
+local TICK_DEFAULT_INTERVAL = 0.2
+local TICK_SLACK = TICK_BASE * 0.5
+local IDLE_FACTOR = 2.5
+local URGENT_FACTOR = 0.5
+local TICK_BUDGET_MS = 2
+local MAX_BACKOFF = 4
+local TICK_PRIORITIES = { high = 1, normal = 2, low = 3 }
+local URGENT_HOLD = 2
+local CAST_URGENT_FALLBACK = 3
+local PLAYER_CAST_EVENTS = {
+  "UNIT_SPELLCAST_START",
+  "UNIT_SPELLCAST_CHANNEL_START",
+  "UNIT_SPELLCAST_STOP",
+  "UNIT_SPELLCAST_CHANNEL_STOP",
+  "UNIT_SPELLCAST_INTERRUPTED",
+  "UNIT_SPELLCAST_FAILED",
+}
+
+local inCombat = false
+local urgentUntil = 0
+local castUntil = 0
+local backoff = 1
+local lastTickCostMs = 0
+
+local function schedulerSetting(key, fallback)
+  local cfg = NODHeal.Config
+  local scheduler = cfg and cfg.scheduler
+  local value = scheduler and scheduler[key]
+  if type(value) == "number" and value > 0 then
+    return value
+  end
+  return fallback
+end
+
+local function addTickHandler(func, options)
   if type(func) ~= "function" then
     return nil
   end
@@ -155,8 +279,32 @@ local function addTickHandler(func)
     end
   end
 
-  local slot = { callback = func }
-  tickHandlers[#tickHandlers + 1] = slot
+  local priority = TICK_PRIORITIES.normal
+  local interval = TICK_DEFAULT_INTERVAL
+  if type(options) == "table" then
+    priority = TICK_PRIORITIES[options.priority] or priority
+    if type(options.interval) == "number" and options.interval >= TICK_BASE then
+      interval = options.interval
+    end
+  end
+
+  -- Stagger first runs across base ticks so handlers sharing an interval do not land together.
+  local steps = math_max(1, math_floor(interval / TICK_BASE + 0.5))
+  local slot = {
+    callback = func,
+    priority = priority,
+    interval = interval,
+    nextRun = GetTime() + (#tickHandlers % steps) * TICK_BASE,
+    profile = profileSlot(profileLabel("tick", options)),
+  }
+
+  -- Keep the list ordered by priority; registration order within a priority.
+  local position = #tickHandlers + 1
+  while position > 1 and tickHandlers[position - 1].priority > priority do
+    tickHandlers[position] = tickHandlers[position - 1]
+    position = position - 1
+  end
+  tickHandlers[position] = slot
   return slot
 end
 
@@ -239,10 +387,46 @@ local function enqueueSecure(callback, ...)
 end
 
 local function runTickHandlers()
+  local now = GetTime()
+  local urgent = now < urgentUntil or now < castUntil
+  local idle = not urgent and not inCombat
+  local urgentFactor = schedulerSetting("urgentFactor", URGENT_FACTOR)
+  local idleFactor = schedulerSetting("idleFactor", IDLE_FACTOR)
+  local budget = schedulerSetting("budgetMs", TICK_BUDGET_MS)
+  local started = debugprofilestop and debugprofilestop()
+
   for index = 1, #tickHandlers do
     local entry = tickHandlers[index]
-    if entry and entry.callback then
-      safeCall(entry.callback)
+    if entry and entry.callback and entry.nextRun <= now + TICK_SLACK then
+      local high = entry.priority == TICK_PRIORITIES.high
+      -- Over budget: lower priorities stay due and run on the next base tick.
+      if high or not started or debugprofilestop() - started <= budget then
+        local scale = 1
+        if urgent and high then
+          scale = urgentFactor
+        elseif idle then
+          scale = idleFactor
+        end
+        if not high then
+          scale = scale * backoff
+        end
+        entry.nextRun = now + entry.interval * scale
+
+        if profiling then
+          profiledCall(entry.profile, entry.callback)
+        else
+          safeCall(entry.callback)
+        end
+      end
+    end
+  end
+
+  if started then
+    lastTickCostMs = debugprofilestop() - started
+    if lastTickCostMs > budget then
+      backoff = math_min(backoff * 2, MAX_BACKOFF)
+    elseif backoff > 1 then
+      backoff = math_max(1, backoff * 0.75)
     end
   end
 end
@@ -283,12 +467,166 @@ local function addHandler(event, func, options)
     callback = func,
     throttleMs = throttleMs,
     nextAllowed = 0,
+    profile = profileSlot(profileLabel(event, options)),
   }
 
   tinsert(handlers, entry)
   return entry
 end
 
+local function clearTable(tbl)
+  for key in pairs(tbl) do
+    tbl[key] = nil
+  end
+end
+
+-- Group membership comes from RosterIndex; without it roster-only routes deliver everything.
+local function isRosterGUID(guid)
+  if not rosterIndex then
+    rosterIndex = getModule("RosterIndex")
+    if not rosterIndex then
+      return guid ~= nil
+    end
+  end
+  return rosterIndex.IsRosterGUID(guid)
+end
+
+-- Argument layout after the 11 base parameters, derived from the subevent's prefix and suffix.
+local SPELL_PREFIXES = { "SPELL_PERIODIC_", "SPELL_BUILDING_", "SPELL_", "RANGE_" }
+local SPECIAL_LAYOUTS = {
+  DAMAGE_SHIELD = { spell = true, suffix = 15, kind = "damage" },
+  DAMAGE_SPLIT = { spell = true, suffix = 15, kind = "damage" },
+  DAMAGE_SHIELD_MISSED = { spell = true, suffix = 15 },
+}
+
+local function combatLogLayout(subEvent)
+  local special = SPECIAL_LAYOUTS[subEvent]
+  if special then
+    return special.spell, special.suffix, special.kind
+  end
+
+  local spell, suffix = false, nil
+  if strfind(subEvent, "^SWING_") then
+    suffix = 12
+  elseif strfind(subEvent, "^ENVIRONMENTAL_") then
+    suffix = 13
+  else
+    for index = 1, #SPELL_PREFIXES do
+      if strfind(subEvent, "^" .. SPELL_PREFIXES[index]) then
+        spell, suffix = true, 15
+        break
+      end
+    end
+  end
+
+  local kind
+  if suffix then
+    if strfind(subEvent, "_DAMAGE$") then
+      kind = "damage"
+    elseif strfind(subEvent, "_HEAL$") then
+      kind = "heal"
+    elseif strfind(subEvent, "_AURA_") then
+      kind = "aura"
+    end
+  end
+  return spell, suffix, kind
+end
+
+local function dispatchCombatLog()
+  local timestamp, subEvent, hideCaster, sourceGUID, sourceName, sourceFlags, sourceRaidFlags, destGUID, destName, destFlags, destRaidFlags, arg12, arg13, arg14, arg15, arg16, arg17 = CombatLogGetCurrentEventInfo()
+  local route = combatLogRoutes[subEvent]
+  if not route then
+    return
+  end
+
+  local inRoster
+  if route.rosterOnly then
+    inRoster = isRosterGUID(destGUID)
+    if not inRoster then
+      return
+    end
+  end
+
+  local record = combatLogRecord
+  record.timestamp = timestamp
+  record.subEvent = subEvent
+  record.hideCaster = hideCaster
+  record.sourceGUID = sourceGUID
+  record.sourceName = sourceName
+  record.sourceFlags = sourceFlags
+  record.sourceRaidFlags = sourceRaidFlags
+  record.destGUID = destGUID
+  record.destName = destName
+  record.destFlags = destFlags
+  record.destRaidFlags = destRaidFlags
+
+  if route.spell then
+    record.spellID, record.spellName, record.spellSchool = arg12, arg13, arg14
+  else
+    record.spellID, record.spellName, record.spellSchool = nil, nil, nil
+  end
+  record.environmentalType = route.suffix == 13 and arg12 or nil
+
+  local first, second, third
+  local suffix = route.suffix
+  if suffix == 15 then
+    first, second, third = arg15, arg16, arg17
+  elseif suffix == 12 then
+    first, second, third = arg12, arg13, arg14
+  elseif suffix == 13 then
+    first, second, third = arg13, arg14, arg15
+  end
+
+  local kind = route.kind
+  record.amount, record.overkill, record.overheal, record.absorbed, record.auraType = nil, nil, nil, nil, nil
+  if kind == "damage" then
+    record.amount, record.overkill = first, second
+  elseif kind == "heal" then
+    record.amount, record.overheal, record.absorbed = first, second, third
+  elseif kind == "aura" then
+    record.auraType, record.amount = first, second
+  end
+
+  local handlers = route.handlers
+  for index = 1, #handlers do
+    local entry = handlers[index]
+    local deliver = true
+    if entry.roster then
+      if inRoster == nil then
+        inRoster = isRosterGUID(destGUID)
+      end
+      deliver = inRoster
+    end
+    if deliver then
+      if profiling then
+        profiledCall(entry.profile, entry.callback, record)
+      else
+        safeCall(entry.callback, record)
+      end
+    end
+  end
+end
+
+local function addCombatLogRoute(subEvent, func, roster)
+  local route = combatLogRoutes[subEvent]
+  if not route then
+    local spell, suffix, kind = combatLogLayout(subEvent)
+    route = { handlers = {}, rosterOnly = true, spell = spell, suffix = suffix, kind = kind }
+    combatLogRoutes[subEvent] = route
+  end
+
+  local handlers = route.handlers
+  for index = 1, #handlers do
+    if handlers[index].callback == func then
+      return
+    end
+  end
+  handlers[#handlers + 1] = { callback = func, roster = roster, profile = profileSlot(profileLabel(subEvent)) }
+  if not roster then
+    route.rosterOnly = false
+  end
+end
+
 local function cancelTicker()
   local tick = NODHeal._tick
   if tick and tick.Cancel then
@@ -310,26 +648,51 @@ local function scheduleTicker()
     return
   end
 
-    local function tickerBody()
-      local aggregator = getModule("IncomingHealAggregator")
-      if aggregator and aggregator.CleanExpired then
-        safeCall(aggregator.CleanExpired, nil)
-      end
+  NODHeal._tick = C_Timer.NewTicker(TICK_BASE, runTickHandlers)
+end
 
-      local solver = getModule("PredictiveSolver")
-      if solver and solver.CalculateProjectedHealth and (not UnitExists or UnitExists("player")) then
-        safeCall(solver.CalculateProjectedHealth, "player")
-        local telemetry = NODHeal and NODHeal.Telemetry
-        if telemetry and telemetry.Increment then
-          telemetry:Increment("solverCalls")
-        end
-      end
+local function cleanExpiredTick()
+  local aggregator = getModule("IncomingHealAggregator")
+  if aggregator and aggregator.CleanExpired then
+    aggregator.CleanExpired(nil)
+  end
+end
 
-      runTickHandlers()
+local function projectPlayerTick()
+  local solver = getModule("PredictiveSolver")
+  if solver and solver.CalculateProjectedHealth and (not UnitExists or UnitExists("player")) then
+    solver.CalculateProjectedHealth("player")
+    local telemetry = NODHeal and NODHeal.Telemetry
+    if telemetry and telemetry.Increment then
+      telemetry:Increment("solverCalls")
     end
+  end
+end
 
-    NODHeal._tick = C_Timer.NewTicker(0.2, tickerBody)
+local function castEndTime(now)
+  local endMs
+  if UnitCastingInfo then
+    endMs = select(5, UnitCastingInfo("player"))
+  end
+  if not endMs and UnitChannelInfo then
+    endMs = select(5, UnitChannelInfo("player"))
+  end
+  if type(endMs) == "number" and endMs / 1000 > now then
+    return endMs / 1000
   end
+  return now + CAST_URGENT_FALLBACK
+end
+
+local function handlePlayerCast(event, unit)
+  if unit ~= "player" then
+    return
+  end
+  if event == "UNIT_SPELLCAST_START" or event == "UNIT_SPELLCAST_CHANNEL_START" then
+    castUntil = castEndTime(GetTime())
+  else
+    castUntil = 0
+  end
+end
 
 local function bootstrapHandlers()
   M.RegisterHandler("PLAYER_LEAVING_WORLD", function()
@@ -343,13 +706,24 @@ local function bootstrapHandlers()
   end)
 
   M.RegisterHandler("PLAYER_REGEN_ENABLED", function()
+    inCombat = false
     flushSecureQueue()
   end)
+  M.RegisterHandler("PLAYER_REGEN_DISABLED", function()
+    inCombat = true
+  end)
+  for index = 1, #PLAYER_CAST_EVENTS do
+    M.RegisterHandler(PLAYER_CAST_EVENTS[index], handlePlayerCast)
+  end
+
+  M.RegisterTick(projectPlayerTick, { label = "PredictiveSolver:tick" })
+  M.RegisterTick(cleanExpiredTick, { priority = "low", interval = 0.5, label = "IncomingHealAggregator:tick" })
 end
 
 function M.Initialize()
   ensureFrame()
   M.Reset()
+  inCombat = isInCombat()
 
   log("Dispatcher: Initialize")
   bootstrapHandlers()
@@ -365,17 +739,69 @@ function M.RegisterHandler(event, func, options)
   ensureFrame()
   addHandler(event, func, options)
 
-  if not registeredEvents[event] and dispatcherFrame.RegisterEvent then
+  -- NOD_* events are raised internally through M.Dispatch; the client rejects unknown event names.
+  if not registeredEvents[event] and dispatcherFrame.RegisterEvent and not strfind(event, "^NOD_") then
     dispatcherFrame:RegisterEvent(event)
     registeredEvents[event] = true
   end
 end
 
-function M.RegisterTick(func)
-  local entry = addTickHandler(func)
+-- Subscribe to decoded combat log events. `subEvents` is one subevent name or a list of them.
+-- The handler receives a record reused across events (read it, do not keep it) with the base
+-- parameters (timestamp, subEvent, sourceGUID, destGUID, ...), spellID/spellName/spellSchool for
+-- SPELL_*/RANGE_* events, and amount/overkill, amount/overheal/absorbed or auraType/amount for
+-- _DAMAGE, _HEAL and _AURA_* suffixes. `options.roster = true` limits it to events whose
+-- destination is in the player's group.
+function M.RegisterCombatLog(subEvents, func, options)
+  if not subEvents or type(func) ~= "function" or not CombatLogGetCurrentEventInfo then
+    return
+  end
+
+  local roster = type(options) == "table" and options.roster and true or false
+  if type(subEvents) == "table" then
+    for index = 1, #subEvents do
+      addCombatLogRoute(subEvents[index], func, roster)
+    end
+  else
+    addCombatLogRoute(subEvents, func, roster)
+  end
+
+  if not combatLogAttached then
+    combatLogAttached = true
+    M.RegisterHandler("COMBAT_LOG_EVENT_UNFILTERED", dispatchCombatLog, { label = "CoreDispatcher:COMBAT_LOG_EVENT_UNFILTERED" })
+  end
+end
+
+function M.IsRosterGUID(guid)
+  return isRosterGUID(guid)
+end
+
+-- `options.priority` is "high" (latency-sensitive: grid, projections), "normal" (default) or
+-- "low" (housekeeping); `options.interval` is the target period in seconds (default 0.2).
+function M.RegisterTick(func, options)
+  local entry = addTickHandler(func, options)
   return entry ~= nil
 end
 
+-- Runs high-priority tick handlers at the urgent rate for `seconds` (a unit is about to die).
+function M.RequestUrgentTicks(seconds)
+  local untilTime = GetTime() + (type(seconds) == "number" and seconds > 0 and seconds or URGENT_HOLD)
+  if untilTime > urgentUntil then
+    urgentUntil = untilTime
+  end
+end
+
+function M.GetSchedulerState()
+  local now = GetTime()
+  local urgent = now < urgentUntil or now < castUntil
+  return {
+    mode = urgent and "urgent" or (inCombat and "combat" or "idle"),
+    backoff = backoff,
+    lastTickCostMs = lastTickCostMs,
+    handlers = #tickHandlers,
+  }
+end
+
 function M.Dispatch(event, ...)
   if not event then
     return
@@ -395,8 +821,14 @@ function M.Dispatch(event, ...)
         local throttleSeconds = throttleMs / 1000
         if not handler.nextAllowed or handler.nextAllowed <= now then
           handler.nextAllowed = now + throttleSeconds
-          safeCall(handler.callback, event, ...)
+          if profiling then
+            profiledCall(handler.profile, handler.callback, event, ...)
+          else
+            safeCall(handler.callback, event, ...)
+          end
         end
+      elseif profiling then
+        profiledCall(handler.profile, handler.callback, event, ...)
       else
         safeCall(handler.callback, event, ...)
       end
@@ -433,6 +865,80 @@ function M.SetThrottle(event, throttleMs)
   end
 end
 
+-- Profiling survives Reset: re-registered handlers resolve to the same labels and slots.
+function M.SetProfiling(enabled)
+  enabled = enabled and debugprofilestop ~= nil and collectgarbage ~= nil or false
+  if enabled == profiling then
+    return profiling
+  end
+
+  local now = GetTime()
+  if enabled then
+    profileStarted = now
+  else
+    profileElapsed = profileElapsed + (now - profileStarted)
+  end
+  profiling = enabled
+  return profiling
+end
+
+function M.IsProfiling()
+  return profiling
+end
+
+function M.ResetProfile()
+  for index = 1, #profileOrder do
+    local stats = profileOrder[index]
+    stats.calls, stats.totalMs, stats.maxMs, stats.gcKB = 0, 0, 0, 0
+    local hist = stats.hist
+    for bucket = 1, #hist do
+      hist[bucket] = 0
+    end
+  end
+  profileElapsed = 0
+  profileStarted = GetTime()
+end
+
+-- Handlers registered while an owner is set are labelled "<owner>:<event>"; nil clears it.
+function M.SetProfileOwner(owner)
+  profileOwner = owner
+end
+
+-- Plain copy of the profile for reports and SavedVariables: `elapsed` seconds of profiling,
+-- the histogram upper `buckets` in ms, and one entry per label that was called.
+function M.GetProfile()
+  local elapsed = profileElapsed
+  if profiling then
+    elapsed = elapsed + (GetTime() - profileStarted)
+  end
+
+  local buckets = {}
+  for index = 1, #PROFILE_BUCKETS do
+    buckets[index] = PROFILE_BUCKETS[index]
+  end
+
+  local handlers = {}
+  for index = 1, #profileOrder do
+    local stats = profileOrder[index]
+    if stats.calls > 0 then
+      local hist = {}
+      for bucket = 1, #stats.hist do
+        hist[bucket] = stats.hist[bucket]
+      end
+      handlers[#handlers + 1] = {
+        label = stats.label,
+        calls = stats.calls,
+        totalMs = stats.totalMs,
+        maxMs = stats.maxMs,
+        gcKB = stats.gcKB,
+        hist = hist,
+      }
+    end
+  end
+
+  return { elapsed = elapsed, buckets = buckets, handlers = handlers }
+end
+
 function M.Reset()
   cancelTicker()
 
@@ -453,6 +959,9 @@ function M.Reset()
     tickHandlers[index] = nil
   end
 
+  clearTable(combatLogRoutes)
+  combatLogAttached = false
+
   secureQueue = {}
   secureQueueMap = {}
 
@@ -1,8 +1,7 @@
 -- Module: DamagePrediction
 -- Purpose: Maintain an EMA-based damage forecast per unit derived from combat log events.
--- API: COMBAT_LOG_EVENT_UNFILTERED, CombatLogGetCurrentEventInfo, UnitGUID, GetTime
+-- API: CoreDispatcher.RegisterCombatLog (damage subevents), RosterIndex.GetGUID, UnitGUID, GetTime
 
-local CombatLogGetCurrentEventInfo = CombatLogGetCurrentEventInfo
 local UnitGUID = UnitGUID
 local GetTime = GetTime
 local pairs = pairs
@@ -19,12 +18,44 @@ if not wipe then
   end
 end
 
+-- Fallbacks for NODHeal.Config.damage (see Config/Defaults.lua).
 local EMA_WINDOW = 3 -- seconds used to smooth DPS samples
 local STALE_WINDOW = 5 -- seconds before clearing stale EMA data
+local HIGH_SAMPLES, HIGH_AGE = 10, 1.5
+local MEDIUM_SAMPLES, MEDIUM_AGE = 3, 3
 local MIN_DELTA = 0.2
 local math_huge = math.huge
 
 local damageBuckets = {}
+local rosterRef
+-- Estimate() fills and returns this one table; callers read it before the next call.
+local estimate = {}
+
+local function fillEstimate(amount, rate, horizon, samples, confidence, age)
+  estimate.amount = amount
+  estimate.rate = rate
+  estimate.horizon = horizon
+  estimate.samples = samples
+  estimate.confidence = confidence
+  estimate.lastEventAge = age
+  return estimate
+end
+
+local function damageConfig()
+  local config = _G.NODHeal and _G.NODHeal.Config
+  return config and config.damage or {}
+end
+
+local function unitGUID(unit)
+  if not rosterRef then
+    local ns = _G.NODHeal
+    rosterRef = ns and ns.GetModule and ns:GetModule("RosterIndex")
+    if not rosterRef then
+      return UnitGUID(unit)
+    end
+  end
+  return rosterRef.GetGUID(unit)
+end
 
 local function clampPositive(value)
   if value and value > 0 then
@@ -56,7 +87,7 @@ local function pushSample(destGUID, amount, timestamp)
   end
 
   local sampleDPS = clampPositive(amount) / elapsed
-  local weight = elapsed / EMA_WINDOW
+  local weight = elapsed / (damageConfig().emaWindow or EMA_WINDOW)
   if weight > 1 then
     weight = 1
   elseif weight < 0.1 then
@@ -68,32 +99,29 @@ local function pushSample(destGUID, amount, timestamp)
   entry.samples = (entry.samples or 0) + 1
 end
 
-local function handleCombatLog()
-  local timestamp, eventType, _, _, _, _, _, destGUID, _, _, _, arg12, arg13, arg14, arg15 = CombatLogGetCurrentEventInfo()
-  if not destGUID then
-    return
-  end
-
-  local amount
-  if eventType == "SWING_DAMAGE" then
-    amount = arg12
-  elseif eventType == "ENVIRONMENTAL_DAMAGE" then
-    amount = arg13
-  elseif eventType == "RANGE_DAMAGE" or eventType == "SPELL_DAMAGE" or eventType == "SPELL_PERIODIC_DAMAGE" or eventType == "SPELL_BUILDING_DAMAGE" or eventType == "DAMAGE_SPLIT" then
-    amount = arg15
-  else
-    return
-  end
-
-  pushSample(destGUID, amount, timestamp)
+local DAMAGE_SUBEVENTS = {
+  "SWING_DAMAGE",
+  "ENVIRONMENTAL_DAMAGE",
+  "RANGE_DAMAGE",
+  "SPELL_DAMAGE",
+  "SPELL_PERIODIC_DAMAGE",
+  "SPELL_BUILDING_DAMAGE",
+  "DAMAGE_SPLIT",
+}
+
+local function handleCombatLog(record)
+  -- Stamp with GetTime(): CLEU timestamps are epoch seconds, but bucket ages are measured against GetTime().
+  pushSample(record.destGUID, record.amount)
 end
 
 local M = {}
 
 function M.Initialize(dispatcher)
   if dispatcher and dispatcher.RegisterHandler then
-    dispatcher:RegisterHandler("COMBAT_LOG_EVENT_UNFILTERED", handleCombatLog)
-    dispatcher:RegisterHandler("GROUP_ROSTER_UPDATE", function()
+    if dispatcher.RegisterCombatLog then
+      dispatcher.RegisterCombatLog(DAMAGE_SUBEVENTS, handleCombatLog, { roster = true })
+    end
+    dispatcher.RegisterHandler("GROUP_ROSTER_UPDATE", function()
       wipe(damageBuckets)
     end)
   end
@@ -103,15 +131,15 @@ function M.RecordCombatSample(targetGUID, amount, timestamp)
   pushSample(targetGUID, amount, timestamp)
 end
 
-local function evaluateBucket(guid, tLand)
+local function evaluateBucket(guid, tLand, now)
   local bucket = damageBuckets[guid]
   if not bucket then
     return nil
   end
 
-  local now = GetTime()
+  local config = damageConfig()
   local age = now - (bucket.lastTimestamp or 0)
-  if age > STALE_WINDOW then
+  if age > (config.staleWindow or STALE_WINDOW) then
     damageBuckets[guid] = nil
     return nil
   end
@@ -124,37 +152,32 @@ local function evaluateBucket(guid, tLand)
   local predicted = clampPositive(bucket.ema * horizon)
   local samples = bucket.samples or 0
   local confidence
-  if samples >= 10 and age <= 1.5 then
+  if samples >= (config.highSamples or HIGH_SAMPLES) and age <= (config.highAge or HIGH_AGE) then
     confidence = "high"
-  elseif samples >= 3 and age <= 3 then
+  elseif samples >= (config.mediumSamples or MEDIUM_SAMPLES) and age <= (config.mediumAge or MEDIUM_AGE) then
     confidence = "medium"
   else
     confidence = "low"
   end
 
-  return {
-    amount = predicted,
-    rate = bucket.ema or 0,
-    horizon = horizon,
-    samples = samples,
-    confidence = confidence,
-    lastEventAge = age,
-  }
+  return fillEstimate(predicted, bucket.ema or 0, horizon, samples, confidence, age)
 end
 
-function M.Estimate(unit, T_land)
+-- `now` is optional; batch callers pass one GetTime() for every unit.
+function M.Estimate(unit, T_land, now)
   if not unit then
-    return { amount = 0, rate = 0, horizon = 0, samples = 0, confidence = "low", lastEventAge = math_huge }
+    return fillEstimate(0, 0, 0, 0, "low", math_huge)
   end
 
-  local guid = UnitGUID(unit)
+  local guid = unitGUID(unit)
   if not guid then
-    return { amount = 0, rate = 0, horizon = 0, samples = 0, confidence = "low", lastEventAge = math_huge }
+    return fillEstimate(0, 0, 0, 0, "low", math_huge)
   end
 
-  local result = evaluateBucket(guid, T_land)
+  now = now or GetTime()
+  local result = evaluateBucket(guid, T_land, now)
   if not result then
-    return { amount = 0, rate = 0, horizon = (T_land and math.max(T_land - GetTime(), 0)) or 0, samples = 0, confidence = "low", lastEventAge = math_huge }
+    return fillEstimate(0, 0, (T_land and math.max(T_land - now, 0)) or 0, 0, "low", math_huge)
   end
 
   return result
@@ -2,9 +2,6 @@
 -- Purpose: Maintain authoritative death/ghost/feign states per unit using layered event sources.
 
 local GetTime = GetTime
-local IsInGroup = IsInGroup
-local IsInRaid = IsInRaid
-local GetNumGroupMembers = GetNumGroupMembers
 local UnitGUID = UnitGUID
 local UnitExists = UnitExists
 local UnitIsDeadOrGhost = UnitIsDeadOrGhost
@@ -12,10 +9,7 @@ local UnitIsGhost = UnitIsGhost
 local UnitIsConnected = UnitIsConnected
 local UnitIsFeignDeath = UnitIsFeignDeath
 local UnitHealth = UnitHealth
-local CombatLogGetCurrentEventInfo = CombatLogGetCurrentEventInfo
-local wipe = wipe
 local pairs = pairs
-local ipairs = ipairs
 local math_max = math.max
 
 local HEARTBEAT_INTERVAL = 0.7
@@ -30,10 +24,10 @@ local STATES = {
 }
 
 local dispatcherRef
-local rosterUnits = {}
+local rosterRef
 local stateByUnit = {}
-local guidToUnit = {}
 local pendingDeaths = {}
+local PLAYER_ONLY = { "player" }
 local listeners = {}
 
 local function namespace()
@@ -51,6 +45,44 @@ local function ensureDispatcher()
   return dispatcherRef
 end
 
+-- Unit tokens and GUIDs come from RosterIndex; without it only the player is tracked.
+local function ensureRoster()
+  if rosterRef then
+    return rosterRef
+  end
+  local ns = namespace()
+  if ns and ns.GetModule then
+    rosterRef = ns:GetModule("RosterIndex")
+  end
+  return rosterRef
+end
+
+local function rosterUnits()
+  local roster = ensureRoster()
+  return roster and roster.GetUnits() or PLAYER_ONLY
+end
+
+local function unitGUID(unit)
+  local roster = ensureRoster()
+  if roster then
+    return roster.GetGUID(unit)
+  end
+  return UnitGUID and UnitGUID(unit) or nil
+end
+
+local function guidUnit(guid)
+  local roster = ensureRoster()
+  return roster and roster.GetUnit(guid) or nil
+end
+
+local function isRosterUnit(unit)
+  local roster = ensureRoster()
+  if roster then
+    return roster.IsRosterUnit(unit)
+  end
+  return unit == "player"
+end
+
 local function ensureRecord(unit)
   local record = stateByUnit[unit]
   if not record then
@@ -129,7 +161,6 @@ local function associateGuid(unit, guid)
   if not unit or not guid then
     return
   end
-  guidToUnit[guid] = unit
   local record = ensureRecord(unit)
   record.guid = guid
   if pendingDeaths[guid] then
@@ -143,7 +174,6 @@ local function clearGuid(guid)
   if not guid then
     return
   end
-  guidToUnit[guid] = nil
   pendingDeaths[guid] = nil
 end
 
@@ -168,6 +198,9 @@ local function applyState(unit, modifier, source)
   record.lastSource = source or record.lastSource
 
   if newState ~= previous then
+    if newState == STATES.DYING and dispatcherRef and dispatcherRef.RequestUrgentTicks then
+      dispatcherRef.RequestUrgentTicks(record.dyingUntil - GetTime())
+    end
     notify(unit, newState, previous, record)
   end
 end
@@ -186,32 +219,13 @@ local function flagAlive(unit, reason)
   end, reason or "alive-check")
 end
 
-local function collectRoster(into)
-  wipe(into)
-  if IsInRaid and IsInRaid() then
-    local members = GetNumGroupMembers and GetNumGroupMembers() or 0
-    for index = 1, members do
-      into[#into + 1] = "raid" .. index
-    end
-  elseif IsInGroup and IsInGroup() then
-    local members = GetNumGroupMembers and GetNumGroupMembers() or 0
-    for index = 1, members - 1 do
-      into[#into + 1] = "party" .. index
-    end
-    into[#into + 1] = "player"
-  else
-    into[#into + 1] = "player"
-  end
-  return into
-end
-
 local function refreshUnit(unit, reason)
   if not unit then
     return
   end
 
   local exists = not UnitExists or UnitExists(unit)
-  local guid = UnitGUID and UnitGUID(unit) or nil
+  local guid = unitGUID(unit)
   if guid then
     associateGuid(unit, guid)
   end
@@ -256,15 +270,13 @@ local function refreshUnit(unit, reason)
 end
 
 local function rebuildRoster(reason)
-  local units = collectRoster(rosterUnits)
-  local seen = {}
-  for _, unit in ipairs(units) do
-    seen[unit] = true
-    refreshUnit(unit, reason or "roster")
+  local units = rosterUnits()
+  for index = 1, #units do
+    refreshUnit(units[index], reason or "roster")
   end
 
   for unit, record in pairs(stateByUnit) do
-    if not seen[unit] then
+    if not isRosterUnit(unit) then
       local guid = record.guid
       if guid then
         clearGuid(guid)
@@ -274,13 +286,11 @@ local function rebuildRoster(reason)
   end
 end
 
+-- Scheduled every HEARTBEAT_INTERVAL by the dispatcher (see M.Initialize).
 local function heartbeat()
-  local now = GetTime()
-  if not heartbeat._lastTick or now - heartbeat._lastTick >= HEARTBEAT_INTERVAL then
-    heartbeat._lastTick = now
-    for _, unit in ipairs(collectRoster(rosterUnits)) do
-      refreshUnit(unit, "heartbeat")
-    end
+  local units = rosterUnits()
+  for index = 1, #units do
+    refreshUnit(units[index], "heartbeat")
   end
 end
 
@@ -289,7 +299,7 @@ local function markGuidDead(guid, source)
     return
   end
   pendingDeaths[guid] = GetTime()
-  local unit = guidToUnit[guid]
+  local unit = guidUnit(guid)
   if unit then
     applyState(unit, function(record)
       setFlag(record, "cleuDead", true)
@@ -303,26 +313,19 @@ local function markGuidRevived(guid, source)
     return
   end
   pendingDeaths[guid] = nil
-  local unit = guidToUnit[guid]
+  local unit = guidUnit(guid)
   if unit then
     flagAlive(unit, source or "cleu-revive")
     refreshUnit(unit, "cleu-revive")
   end
 end
 
-local function handleCombatLog()
-  if not CombatLogGetCurrentEventInfo then
-    return
-  end
-  local _, subEvent, _, _, _, _, _, destGUID = CombatLogGetCurrentEventInfo()
-  if not subEvent or not destGUID then
-    return
-  end
-  if subEvent == "UNIT_DIED" or subEvent == "UNIT_DESTROYED" or subEvent == "UNIT_DISSIPATES" or subEvent == "SPELL_INSTAKILL" then
-    markGuidDead(destGUID, "cleu")
-  elseif subEvent == "SPELL_RESURRECT" or subEvent == "SPELL_RESURRECTED" then
-    markGuidRevived(destGUID, "cleu-res")
-  end
+local function handleDeathLog(record)
+  markGuidDead(record.destGUID, "cleu")
+end
+
+local function handleResurrectLog(record)
+  markGuidRevived(record.destGUID, "cleu-res")
 end
 
 local function handleUnitEvent(_, unit)
@@ -370,10 +373,13 @@ function M.Initialize(dispatcher)
   dispatcherRef.RegisterHandler("PLAYER_UNGHOST", function()
     refreshUnit("player", "player-ghost")
   end)
-  dispatcherRef.RegisterHandler("COMBAT_LOG_EVENT_UNFILTERED", handleCombatLog)
+  if dispatcherRef.RegisterCombatLog then
+    dispatcherRef.RegisterCombatLog({ "UNIT_DIED", "UNIT_DESTROYED", "UNIT_DISSIPATES", "SPELL_INSTAKILL" }, handleDeathLog, { roster = true })
+    dispatcherRef.RegisterCombatLog({ "SPELL_RESURRECT", "SPELL_RESURRECTED" }, handleResurrectLog, { roster = true })
+  end
 
   if dispatcherRef.RegisterTick then
-    dispatcherRef.RegisterTick(heartbeat)
+    dispatcherRef.RegisterTick(heartbeat, { priority = "normal", interval = HEARTBEAT_INTERVAL })
   end
 
   rebuildRoster("init")
@@ -123,6 +123,18 @@ function M.Estimate(spellID, statsSnapshot)
   }
 end
 
+-- Estimate(spellID, statsSnapshot).mean without building the result table.
+function M.EstimateMean(spellID, statsSnapshot)
+  if not spellID then
+    return 0
+  end
+  local mean = evaluateStats(spellID, statsSnapshot)
+  if mean < 0 then
+    return 0
+  end
+  return mean
+end
+
 function M.FetchFallback(spellID)
   if not fallbackDB or not spellID then
     return 0
@@ -2,7 +2,11 @@
 -- Purpose: Collect current HP state, death/offline flags, and absorbs per unit as baseline for solver calculations.
 -- API: UnitHealth, UnitHealthMax, UnitIsDeadOrGhost, UnitGetTotalAbsorbs
 
+-- snapshotCache holds the current snapshot per unit until a health/absorb event clears it; the
+-- table itself stays in snapshotTables and is refilled on the next Capture, so a snapshot is only
+-- valid until the unit's next event.
 local snapshotCache = {}
+local snapshotTables = {}
 local dispatcherRef
 local deathModule
 
@@ -75,16 +79,16 @@ function M.Initialize(dispatcher)
     return
   end
 
-  hub:RegisterHandler("UNIT_HEALTH", function(_, unit)
+  hub.RegisterHandler("UNIT_HEALTH", function(_, unit)
     resetUnit(unit)
   end)
-  hub:RegisterHandler("UNIT_MAXHEALTH", function(_, unit)
+  hub.RegisterHandler("UNIT_MAXHEALTH", function(_, unit)
     resetUnit(unit)
   end)
-  hub:RegisterHandler("UNIT_ABSORB_AMOUNT_CHANGED", function(_, unit)
+  hub.RegisterHandler("UNIT_ABSORB_AMOUNT_CHANGED", function(_, unit)
     resetUnit(unit)
   end)
-  hub:RegisterHandler("GROUP_ROSTER_UPDATE", function()
+  hub.RegisterHandler("GROUP_ROSTER_UPDATE", function()
     wipeCache()
   end)
 end
@@ -158,16 +162,19 @@ function M.Capture(unit)
   local isConnected = UnitIsConnected and UnitIsConnected(unit)
   local isOffline = isConnected == false
 
-  local snapshot = {
-    hp_now = hpNow,
-    hp_max = hpMax > 0 and hpMax or 1,
-    absorbs = absorbs,
-    isDead = isDead,
-    isOffline = isOffline,
-    state = state,
-    isGhost = isGhost,
-    isFeign = isFeign,
-  }
+  local snapshot = snapshotTables[unit]
+  if not snapshot then
+    snapshot = {}
+    snapshotTables[unit] = snapshot
+  end
+  snapshot.hp_now = hpNow
+  snapshot.hp_max = hpMax > 0 and hpMax or 1
+  snapshot.absorbs = absorbs
+  snapshot.isDead = isDead
+  snapshot.isOffline = isOffline
+  snapshot.state = state
+  snapshot.isGhost = isGhost
+  snapshot.isFeign = isFeign
 
   snapshotCache[unit] = snapshot
   return snapshot
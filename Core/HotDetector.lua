@@ -6,12 +6,10 @@ NODHeal.Core.HotDetector = M
 local math = math
 local GetTime = GetTime
 local UnitClass = UnitClass
-local CombatLogGetCurrentEventInfo = CombatLogGetCurrentEventInfo
 local CreateFrame = CreateFrame
 local pairs = pairs
 local type = type
 local tostring = tostring
-local tremove = table.remove
 
 -- small class seeds
 local CLASS_SEED = {
@@ -24,9 +22,18 @@ local CLASS_SEED = {
 
 local runtimeHots
 local runtimeBlock
-local pending = {}
+local storeModule
 local lastMinute, learnedCount = 0, 0
 
+-- Learning queue: one pending record per spellId, committed in first-seen order. A record holds
+-- the learned entry as it will look once all of its observations are applied, so a commit writes
+-- exactly what per-tick updates would have. Records are recycled through recordPool.
+local pendingRecords = {}
+local pendingOrder = {}
+local pendingHead, pendingCount, pendingSize = 1, 0, 0
+local recordPool = {}
+local droppedObservations = 0
+
 local function normalizeId(spellId)
     if type(spellId) == "number" then
         if spellId > 0 then
@@ -43,11 +50,24 @@ local function normalizeId(spellId)
     return nil
 end
 
+local function learnedStore()
+    if not storeModule and NODHeal.GetModule then
+        storeModule = NODHeal:GetModule("LearnedStore")
+    end
+    return storeModule
+end
+
+-- Learned HoTs come from LearnedStore, which expands packed entries on first access.
 local function ensureSV()
     _G.NODHealDB = _G.NODHealDB or {}
     local DB = _G.NODHealDB
     DB.learned = DB.learned or {}
-    DB.learned.hots = DB.learned.hots or {}
+    local store = learnedStore()
+    if store then
+        store.Open("hots")
+    else
+        DB.learned.hots = DB.learned.hots or {}
+    end
     DB.learned.block = DB.learned.block or {}
 
     NODHeal.Learned = NODHeal.Learned or {}
@@ -59,17 +79,6 @@ local function ensureSV()
     return runtimeHots
 end
 
-local function migrate()
-    local hots = ensureSV()
-    for key, value in pairs(hots) do
-        if type(key) == "number" and key < 0 then
-            hots[key] = nil
-        elseif type(value) == "table" and value.spellName and not value.learned then
-            value.learned = true
-        end
-    end
-end
-
 local function learnConfig()
     local cfg = NODHeal.Config and NODHeal.Config.learn
     return cfg or {}
@@ -120,49 +129,125 @@ local function resetWindow()
     end
 end
 
+local function pendingLimit()
+    local limit = learnConfig().maxPending or 64
+    if limit < 1 then
+        return 1
+    end
+    return limit
+end
+
+local function releaseRecord(spellId)
+    local record = pendingRecords[spellId]
+    pendingRecords[spellId] = nil
+    if record then
+        record.period = nil
+        record.lastTimestamp = nil
+        recordPool[#recordPool + 1] = record
+    end
+end
+
+local function popPending()
+    local spellId = pendingOrder[pendingHead]
+    pendingOrder[pendingHead] = nil
+    pendingHead = pendingHead % pendingSize + 1
+    pendingCount = pendingCount - 1
+    return spellId
+end
+
+local function clearPending()
+    while pendingCount > 0 do
+        releaseRecord(popPending())
+    end
+end
+
+local function pendingRecord(hots, spellId)
+    local record = pendingRecords[spellId]
+    if record then
+        return record
+    end
+    if pendingCount == 0 then
+        pendingHead, pendingSize = 1, pendingLimit()
+    elseif pendingCount >= pendingSize then
+        return nil
+    end
+
+    local count = #recordPool
+    record = recordPool[count] or {}
+    recordPool[count] = nil
+
+    local entry = hots[spellId]
+    if type(entry) == "table" then
+        record.fresh = false
+        record.seen = entry.seen or 0
+        record.avg_tick = entry.avg_tick
+        record.period = entry.period
+        record.lastTimestamp = entry.lastTimestamp
+    else
+        record.fresh = true
+        record.seen = 0
+        record.avg_tick = nil
+    end
+
+    pendingRecords[spellId] = record
+    pendingOrder[(pendingHead + pendingCount - 1) % pendingSize + 1] = spellId
+    pendingCount = pendingCount + 1
+    return record
+end
+
+-- Same arithmetic the learned entry used to receive per observation.
+local function applyObservation(record, amount, timestamp)
+    if record.fresh and record.seen == 0 then
+        record.seen = 1
+        record.avg_tick = amount or 0
+        record.lastTimestamp = timestamp
+        return
+    end
+
+    local seen = record.seen + 1
+    record.seen = seen
+    if amount and amount > 0 then
+        record.avg_tick = (((record.avg_tick or 0) * (seen - 1)) + amount) / seen
+    end
+    local last = record.lastTimestamp
+    if last and timestamp and timestamp > last then
+        local period = timestamp - last
+        local avg = record.period or period
+        record.period = ((avg * (seen - 1)) + period) / seen
+    end
+    record.lastTimestamp = timestamp
+end
+
+local function commitRecord(hots, spellId, record)
+    local entry = hots[spellId]
+    if type(entry) ~= "table" then
+        entry = { learned = true }
+        hots[spellId] = entry
+    end
+    entry.seen = record.seen
+    entry.avg_tick = record.avg_tick
+    entry.period = record.period
+    entry.lastTimestamp = record.lastTimestamp
+    local store = learnedStore()
+    entry.lastSeen = store and store.Now() or GetTime()
+end
+
 local function drainQueue()
-    local hots = ensureSV()
     local cfgCap = learnCap()
     if cfgCap <= 0 then
-        pending = {}
+        clearPending()
         return
     end
     resetWindow()
-    while learnedCount < cfgCap and #pending > 0 do
+    if learnedCount >= cfgCap or pendingCount == 0 then
+        return
+    end
+    local hots = ensureSV()
+    while learnedCount < cfgCap and pendingCount > 0 do
         learnedCount = learnedCount + 1
-        local item = tremove(pending, 1)
-        local spellId = item.spellId
-        local amount = item.amount
-        local timestamp = item.timestamp
-        local entry = hots[spellId]
-        if entry == true then
-            entry = { learned = true, avg_tick = amount or 0, seen = 1, lastSeen = GetTime(), lastTimestamp = timestamp }
-            hots[spellId] = entry
-        elseif type(entry) == "table" then
-            local seen = (entry.seen or 0) + 1
-            entry.seen = seen
-            if amount and amount > 0 then
-                local old = entry.avg_tick or 0
-                entry.avg_tick = ((old * (seen - 1)) + amount) / seen
-            end
-            if entry.lastTimestamp and timestamp and timestamp > entry.lastTimestamp then
-                local period = timestamp - entry.lastTimestamp
-                if period > 0 then
-                    local avg = entry.period or period
-                    entry.period = ((avg * (seen - 1)) + period) / seen
-                end
-            end
-            entry.lastTimestamp = timestamp
-            entry.lastSeen = GetTime()
-        else
-            hots[spellId] = {
-                learned = true,
-                avg_tick = amount or 0,
-                seen = 1,
-                lastSeen = GetTime(),
-                lastTimestamp = timestamp,
-            }
-        end
+        local spellId = popPending()
+        commitRecord(hots, spellId, pendingRecords[spellId])
+        releaseRecord(spellId)
     end
 end
 
@@ -170,7 +255,12 @@ local function queueLearn(spellId, amount, timestamp)
     if learnCap() <= 0 then
         return
     end
-    pending[#pending + 1] = { spellId = spellId, amount = amount, timestamp = timestamp }
+    local record = pendingRecord(ensureSV(), spellId)
+    if not record then
+        droppedObservations = droppedObservations + 1
+        return
+    end
+    applyObservation(record, amount, timestamp)
     drainQueue()
 end
 
@@ -185,9 +275,9 @@ local function confidenceFor(spellId, source)
     end
     local hots = ensureSV()
     local entry = hots[spellId]
-    local lastSeen = (type(entry) == "table" and entry.lastSeen) or 0
-    if lastSeen > 0 then
-        local days = (GetTime() - lastSeen) / 86400
+    local store = learnedStore()
+    local days = store and type(entry) == "table" and store.AgeDays(entry.lastSeen)
+    if days then
         local cfg = learnConfig()
         local soft = cfg.agingSoftDays or 30
         local hard = cfg.agingHardDays or 90
@@ -241,6 +331,10 @@ end
 
 local function countLearned()
     ensureSV()
+    local store = learnedStore()
+    if store then
+        return store.Count("hots")
+    end
     local hots = runtimeHots
     local total = 0
     if type(hots) ~= "table" then
@@ -304,6 +398,8 @@ function M.DebugSnapshot()
         learned = learned,
         blocked = blocked,
         blockedSet = blockedSet,
+        pending = pendingCount,
+        dropped = droppedObservations,
     }
 end
 
@@ -329,27 +425,25 @@ function M.EstimateHotValue(spellId, remain, stacks)
     return avg * ticks
 end
 
-local function handleCombatLog()
-    drainQueue()
-    local timestamp, subEvent, _, _, _, _, _, _, _, _, _, spellId, _, _, amount = CombatLogGetCurrentEventInfo()
-    if subEvent ~= "SPELL_PERIODIC_HEAL" then
-        return
-    end
+local function handleCombatLog(record)
+    local spellId = record.spellID
     if type(spellId) ~= "number" or spellId <= 0 then
         return
     end
-    queueLearn(spellId, amount, timestamp)
+    queueLearn(spellId, record.amount, record.timestamp)
+end
+
+function M.Initialize(dispatcher)
+    if dispatcher and dispatcher.RegisterCombatLog then
+        dispatcher.RegisterCombatLog("SPELL_PERIODIC_HEAL", handleCombatLog)
+    end
 end
 
 local eventFrame = CreateFrame("Frame")
 eventFrame:RegisterEvent("PLAYER_ENTERING_WORLD")
-eventFrame:RegisterEvent("COMBAT_LOG_EVENT_UNFILTERED")
 eventFrame:SetScript("OnEvent", function(_, event)
     if event == "PLAYER_ENTERING_WORLD" then
-        migrate()
         drainQueue()
-    elseif event == "COMBAT_LOG_EVENT_UNFILTERED" then
-        handleCombatLog()
     end
 end)
 
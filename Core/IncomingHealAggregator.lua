@@ -5,14 +5,12 @@
 -- See also: IncomingHeals (read-side aggregator for solver)
 -- Referenz: /DOCU/NOD_Datenpfad_LHC_API.md §Ereignisfluss
 
-local CombatLogGetCurrentEventInfo = CombatLogGetCurrentEventInfo
 local UnitGUID = UnitGUID
 local UnitExists = UnitExists
 local UnitIsFriend = UnitIsFriend
 local UnitIsUnit = UnitIsUnit
 local GetTime = GetTime
 local pairs = pairs
-local ipairs = ipairs
 local wipe = wipe
 local math_huge = math.huge
 local type = type
@@ -22,15 +20,17 @@ local tonumber = tonumber
 local tostring = tostring
 local select = select
 local strmatch = string.match
+local bit_band = bit and bit.band
 
 local dispatcherRef
 local aggregator = {}
 local castLandingModule
 local estimatorModule
+local rosterModule
 local healCommLib
 
-local HEAL_STORAGE = {} -- [targetGUID] = { { amount, landTime, sourceGUID, spellID } }
-local SCHEDULED_STORAGE = {} -- [targetGUID] = { list = {}, index = {} }
+local HEAL_STORAGE = {} -- [targetGUID] = timeline of { amount, landTime, sourceGUID, spellID }
+local SCHEDULED_STORAGE = {} -- [targetGUID] = timeline of scheduled entries (see newTimeline)
 local SCHEDULED_BY_KEY = {} -- [key] = entry
 local PENDING_CASTS = {} -- [castGUID] = { key = castKey }
 local CAST_LOOKUP = {} -- [castKey] = { success = boolean }
@@ -94,11 +94,34 @@ local function isFutureWindowEnabled()
   return true
 end
 
+local function ensureRosterModule()
+  if rosterModule ~= nil then
+    return rosterModule
+  end
+  local ns = namespace()
+  if ns and ns.GetModule then
+    rosterModule = ns:GetModule("RosterIndex")
+  end
+  return rosterModule
+end
+
+-- Member GUIDs and roster tokens resolve through RosterIndex with one table lookup each; only
+-- other unit tokens (target, focus, ...) reach UnitGUID.
 local function toGUID(unitOrGUID)
   if not unitOrGUID then
     return nil
   end
 
+  local roster = ensureRosterModule()
+  if roster then
+    if roster.IsRosterGUID(unitOrGUID) then
+      return unitOrGUID
+    end
+    if roster.IsRosterUnit(unitOrGUID) then
+      return roster.GetGUID(unitOrGUID)
+    end
+  end
+
   if UnitGUID and type(unitOrGUID) == "string" and (#unitOrGUID <= 18 or unitOrGUID:match("^[%a]+$")) then
     local guid = UnitGUID(unitOrGUID)
     if guid then
@@ -129,209 +152,299 @@ local function normalizeLandingTime(value)
   return value
 end
 
-local function ensureQueue(targetGUID)
-  local queue = HEAL_STORAGE[targetGUID]
-  if not queue then
-    queue = {}
-    HEAL_STORAGE[targetGUID] = queue
+local function lowbit(index)
+  if bit_band then
+    return bit_band(index, -index)
+  end
+  local low = 1
+  while index % (low + low) == 0 do
+    low = low + low
   end
-  return queue
+  return low
 end
 
-local function ensureScheduledBucket(targetGUID)
-  local bucket = SCHEDULED_STORAGE[targetGUID]
-  if not bucket then
-    bucket = { list = {}, index = {} }
-    SCHEDULED_STORAGE[targetGUID] = bucket
+-- Landing-time storage --------------------------------------------------------
+-- Every target GUID owns a timeline: entries ordered by landTime (ties keep arrival order) in
+-- slots head..tail, plus Fenwick trees over the slots for amounts and counts. "Heals landing by
+-- cutoff" is a binary search and two prefix sums; removing a keyed entry clears its slot
+-- (entry.slot) and updates the trees; expiry only advances head. Holes left by removals are
+-- skipped and squeezed out once they outnumber live entries.
+
+local COMPACT_MIN_SLOTS = 32
+
+local function newTimeline()
+  return { times = {}, entries = {}, sums = {}, counts = {}, head = 1, tail = 0, live = 0 }
+end
+
+local function ensureTimeline(store, targetGUID)
+  local timeline = store[targetGUID]
+  if not timeline then
+    timeline = newTimeline()
+    store[targetGUID] = timeline
   end
-  return bucket
+  return timeline
 end
 
-local function dispatch(eventName, ...)
-  if dispatcherRef and dispatcherRef.Dispatch then
-    dispatcherRef.Dispatch(eventName, ...)
+local function treePrefix(tree, slot)
+  local total = 0
+  while slot > 0 do
+    total = total + tree[slot]
+    slot = slot - lowbit(slot)
   end
+  return total
 end
 
-local function pruneQueue(queue, now)
-  if not queue then
-    return 0, 0
+local function treeAdd(tree, tail, slot, delta)
+  while slot <= tail do
+    tree[slot] = tree[slot] + delta
+    slot = slot + lowbit(slot)
   end
+end
 
-  local write = 1
-  local removed = 0
-  local size = #queue
-  for index = 1, size do
-    local entry = queue[index]
-    local landTime = entry and entry.landTime
-    if landTime and (landTime + STALE_PADDING + EXPIRY_GRACE) >= now then
-      queue[write] = entry
-      write = write + 1
-    else
-      removed = removed + 1
+-- tree[slot] covers (slot - lowbit(slot), slot]; valid when slot is the new tail.
+local function treeAppend(tree, slot, value)
+  tree[slot] = value + treePrefix(tree, slot - 1) - treePrefix(tree, slot - lowbit(slot))
+end
+
+local function rebuildTrees(timeline)
+  local entries, sums, counts = timeline.entries, timeline.sums, timeline.counts
+  local tail = timeline.tail
+  for slot = 1, tail do
+    local entry = entries[slot]
+    sums[slot] = entry and entry.amount or 0
+    counts[slot] = entry and 1 or 0
+  end
+  for slot = 1, tail do
+    local parent = slot + lowbit(slot)
+    if parent <= tail then
+      sums[parent] = sums[parent] + sums[slot]
+      counts[parent] = counts[parent] + counts[slot]
     end
   end
+end
 
-  for index = write, size do
-    queue[index] = nil
+-- First slot in [low, high] whose landTime is later than `value`, or high + 1.
+local function upperBound(times, low, high, value)
+  high = high + 1
+  while low < high do
+    local middle = math_floor((low + high) / 2)
+    if times[middle] > value then
+      high = middle
+    else
+      low = middle + 1
+    end
   end
+  return low
+end
 
-  return write - 1, removed
+local function resetTimeline(timeline)
+  timeline.head = 1
+  timeline.tail = 0
+  timeline.live = 0
 end
 
-local function removeScheduledEntry(entry)
-  if not entry or not entry.targetGUID then
-    return false
+local function compactTimeline(timeline)
+  local times, entries, sums, counts = timeline.times, timeline.entries, timeline.sums, timeline.counts
+  local write = 0
+  for slot = timeline.head, timeline.tail do
+    local entry = entries[slot]
+    if entry then
+      write = write + 1
+      times[write] = times[slot]
+      entries[write] = entry
+      entry.slot = write
+    end
   end
-
-  local bucket = SCHEDULED_STORAGE[entry.targetGUID]
-  if not bucket then
-    return false
+  for slot = write + 1, timeline.tail do
+    times[slot] = nil
+    entries[slot] = nil
+    sums[slot] = nil
+    counts[slot] = nil
   end
+  timeline.head = 1
+  timeline.tail = write
+  rebuildTrees(timeline)
+end
 
-  local list = bucket.list
-  local write = 1
-  local size = #list
-  for index = 1, size do
-    local candidate = list[index]
-    if candidate ~= entry then
-      list[write] = candidate
-      write = write + 1
-    end
+-- Drop holes at both ends; compact when the dead prefix or the holes outweigh the live entries.
+local function settleTimeline(timeline)
+  local entries = timeline.entries
+  local head, tail = timeline.head, timeline.tail
+  while head <= tail and not entries[head] do
+    head = head + 1
+  end
+  while tail >= head and not entries[tail] do
+    tail = tail - 1
+  end
+  timeline.head = head
+  timeline.tail = tail
+  if timeline.live == 0 then
+    resetTimeline(timeline)
+  elseif tail > COMPACT_MIN_SLOTS and (head - 1 >= timeline.live or (tail - head + 1) >= 2 * timeline.live) then
+    compactTimeline(timeline)
   end
+end
 
-  for index = write, size do
-    list[index] = nil
+local function timelineInsert(timeline, entry)
+  local landTime = entry.landTime
+  local times, entries = timeline.times, timeline.entries
+  local head, tail = timeline.head, timeline.tail
+  timeline.live = timeline.live + 1
+
+  if tail < head or times[tail] <= landTime then
+    tail = tail + 1
+    times[tail] = landTime
+    entries[tail] = entry
+    entry.slot = tail
+    timeline.tail = tail
+    treeAppend(timeline.sums, tail, entry.amount)
+    treeAppend(timeline.counts, tail, 1)
+    return
   end
 
-  if entry.key then
-    if bucket.index[entry.key] == entry then
-      bucket.index[entry.key] = nil
-    end
-    if SCHEDULED_BY_KEY[entry.key] == entry then
-      SCHEDULED_BY_KEY[entry.key] = nil
+  -- Out of order (a short cast scheduled behind a longer one, a delayed LHC heal): shift later slots up.
+  local slot = upperBound(times, head, tail, landTime)
+  for index = tail, slot, -1 do
+    local moved = entries[index]
+    times[index + 1] = times[index]
+    entries[index + 1] = moved
+    if moved then
+      moved.slot = index + 1
     end
   end
+  times[slot] = landTime
+  entries[slot] = entry
+  entry.slot = slot
+  timeline.tail = tail + 1
+  rebuildTrees(timeline)
+end
 
-  if #list == 0 then
-    SCHEDULED_STORAGE[entry.targetGUID] = nil
+local function timelineRemove(timeline, entry)
+  local slot = entry.slot
+  if not timeline or not slot or timeline.entries[slot] ~= entry then
+    return false
   end
-
+  timeline.entries[slot] = nil
+  entry.slot = nil
+  treeAdd(timeline.sums, timeline.tail, slot, -entry.amount)
+  treeAdd(timeline.counts, timeline.tail, slot, -1)
+  timeline.live = timeline.live - 1
+  settleTimeline(timeline)
   return true
 end
 
-local function pruneScheduled(bucket, now)
-  if not bucket then
-    return 0
-  end
-
-  local list = bucket.list
+-- Expire entries with landTime + padding < now; `release` sees each expired entry.
+local function timelineExpire(timeline, now, padding, release)
+  local times, entries = timeline.times, timeline.entries
+  local head, tail = timeline.head, timeline.tail
   local removed = 0
-  local write = 1
-  local size = #list
-  for index = 1, size do
-    local entry = list[index]
-    local keep = false
-    if entry and entry.landTime then
-      if (entry.landTime + FUTURE_PADDING) >= now then
-        keep = true
-      end
-    end
-    if keep then
-      list[write] = entry
-      write = write + 1
-    else
+  while head <= tail and (times[head] + padding) < now do
+    local entry = entries[head]
+    if entry then
+      entries[head] = nil
+      entry.slot = nil
       removed = removed + 1
-      if entry and entry.key then
-        if bucket.index[entry.key] == entry then
-          bucket.index[entry.key] = nil
-        end
-        if SCHEDULED_BY_KEY[entry.key] == entry then
-          SCHEDULED_BY_KEY[entry.key] = nil
-        end
+      if release then
+        release(entry)
       end
     end
+    head = head + 1
   end
+  if removed > 0 then
+    timeline.head = head
+    timeline.live = timeline.live - removed
+    settleTimeline(timeline)
+  end
+  return removed
+end
 
-  for index = write, size do
-    list[index] = nil
+local function timelineSum(timeline, cutoff)
+  local head = timeline.head
+  local last = upperBound(timeline.times, head, timeline.tail, cutoff) - 1
+  if last < head then
+    return 0, 0
   end
+  local sums, counts = timeline.sums, timeline.counts
+  return treePrefix(sums, last) - treePrefix(sums, head - 1), treePrefix(counts, last) - treePrefix(counts, head - 1)
+end
 
-  if #list == 0 then
-    return removed
+local function timelineEach(timeline, cutoff, collector)
+  local times, entries = timeline.times, timeline.entries
+  for slot = timeline.head, timeline.tail do
+    if times[slot] > cutoff then
+      return
+    end
+    local entry = entries[slot]
+    if entry then
+      collector(entry)
+    end
   end
+end
 
-  return removed
+local function dispatch(eventName, ...)
+  if dispatcherRef and dispatcherRef.Dispatch then
+    dispatcherRef.Dispatch(eventName, ...)
+  end
 end
 
-local function purgeScheduled(now, targetGUID)
-  local timestamp = now or GetTime()
+local function releaseScheduled(entry)
+  if entry.key and SCHEDULED_BY_KEY[entry.key] == entry then
+    SCHEDULED_BY_KEY[entry.key] = nil
+  end
+end
+
+local function removeScheduledEntry(entry)
+  if not entry or not entry.targetGUID then
+    return false
+  end
+
+  local timeline = SCHEDULED_STORAGE[entry.targetGUID]
+  if not timelineRemove(timeline, entry) then
+    return false
+  end
+  releaseScheduled(entry)
+  dispatch("NOD_INCOMING_SCHEDULE_CHANGED", entry.targetGUID, entry)
+  return true
+end
+
+local function purgeTimelines(store, now, padding, targetGUID, release)
   if targetGUID then
-    local bucket = SCHEDULED_STORAGE[targetGUID]
-    if not bucket then
+    local timeline = store[targetGUID]
+    if not timeline then
       return 0
     end
-    local removed = pruneScheduled(bucket, timestamp)
-    if #bucket.list == 0 then
-      SCHEDULED_STORAGE[targetGUID] = nil
-    end
-    return removed
+    return timelineExpire(timeline, now, padding, release)
   end
 
   local total = 0
-  for guid, bucket in pairs(SCHEDULED_STORAGE) do
-    local removed = pruneScheduled(bucket, timestamp)
-    if #bucket.list == 0 then
-      SCHEDULED_STORAGE[guid] = nil
+  for guid, timeline in pairs(store) do
+    total = total + timelineExpire(timeline, now, padding, release)
+    if timeline.live == 0 then
+      store[guid] = nil
     end
-    total = total + removed
   end
   return total
 end
 
+local function purgeScheduled(now, targetGUID)
+  return purgeTimelines(SCHEDULED_STORAGE, now or GetTime(), FUTURE_PADDING, targetGUID, releaseScheduled)
+end
+
 local function purgeExpired(now, targetGUID)
   now = now or GetTime()
-
-  if targetGUID then
-    local queue = HEAL_STORAGE[targetGUID]
-    if not queue then
-      return 0
-    end
-    local remaining, removed = pruneQueue(queue, now)
-    if remaining == 0 then
-      HEAL_STORAGE[targetGUID] = nil
-    end
-    return removed
-  end
-
-  local totalRemoved = 0
-  for guid, queue in pairs(HEAL_STORAGE) do
-    local remaining, removed = pruneQueue(queue, now)
-    if remaining == 0 then
-      HEAL_STORAGE[guid] = nil
-    end
-    totalRemoved = totalRemoved + removed
+  local removed = purgeTimelines(HEAL_STORAGE, now, STALE_PADDING + EXPIRY_GRACE, targetGUID)
+  if not targetGUID then
+    lastPrune = now
   end
-  lastPrune = now
-  return totalRemoved
+  return removed
 end
 
 local function summarize(targetGUID, cutoff)
-  local queue = HEAL_STORAGE[targetGUID]
-  if not queue then
+  local timeline = HEAL_STORAGE[targetGUID]
+  if not timeline then
     return 0, 0
   end
-
-  local total = 0
-  local count = 0
-  for index = 1, #queue do
-    local entry = queue[index]
-    if entry and entry.landTime and entry.landTime <= cutoff then
-      total = total + (entry.amount or 0)
-      count = count + 1
-    end
-  end
-  return total, count
+  return timelineSum(timeline, cutoff)
 end
 
 local function tickDispatcher()
@@ -357,35 +470,37 @@ local function obtainDispatcher()
   return dispatcherRef
 end
 
-local function handleCombatLog()
-  if not CombatLogGetCurrentEventInfo then
+local function handleHealLog(record)
+  local destGUID = record.destGUID
+  if not destGUID then
     return
   end
 
-  local timestamp, eventType, _, sourceGUID, _, _, _, destGUID, _, _, _, spellID, _, _, amount, overheal = CombatLogGetCurrentEventInfo()
+  aggregator.AddHeal({
+    targetGUID = destGUID,
+    amount = record.amount or 0,
+    landTime = record.timestamp or GetTime(),
+    sourceGUID = record.sourceGUID,
+    spellID = record.spellID,
+    overheal = record.overheal or 0,
+    source = record.subEvent,
+  })
+
+  tickDispatcher()
+end
+
+local function handleCastSuccessLog(record)
+  local destGUID = record.destGUID
   if not destGUID then
     return
   end
 
-  if eventType == "SPELL_HEAL" or eventType == "SPELL_PERIODIC_HEAL" then
-    local now = timestamp or GetTime()
-    aggregator.AddHeal({
-      targetGUID = destGUID,
-      amount = amount or 0,
-      landTime = now,
-      sourceGUID = sourceGUID,
-      spellID = spellID,
-      overheal = overheal or 0,
-      source = eventType,
-    })
-  elseif eventType == "SPELL_CAST_SUCCESS" then
-    dispatch("NOD_INCOMING_CAST_SUCCESS", {
-      sourceGUID = sourceGUID,
-      targetGUID = destGUID,
-      spellID = spellID,
-      timestamp = timestamp or GetTime(),
-    })
-  end
+  dispatch("NOD_INCOMING_CAST_SUCCESS", {
+    sourceGUID = record.sourceGUID,
+    targetGUID = destGUID,
+    spellID = record.spellID,
+    timestamp = record.timestamp or GetTime(),
+  })
 
   tickDispatcher()
 end
@@ -425,6 +540,11 @@ local function addScheduled(payload)
   if key then
     local existing = SCHEDULED_BY_KEY[key]
     if existing then
+      -- Re-slot under the new landing time (and target, if it moved).
+      timelineRemove(SCHEDULED_STORAGE[existing.targetGUID], existing)
+      if existing.targetGUID ~= targetGUID then
+        dispatch("NOD_INCOMING_SCHEDULE_CHANGED", existing.targetGUID, existing)
+      end
       existing.amount = amount
       existing.landTime = landing
       existing.sourceGUID = payload.sourceGUID
@@ -434,11 +554,12 @@ local function addScheduled(payload)
       existing.casterUnit = payload.casterUnit or existing.casterUnit
       existing.castGUID = payload.castGUID or existing.castGUID
       existing.targetGUID = targetGUID
+      timelineInsert(ensureTimeline(SCHEDULED_STORAGE, targetGUID), existing)
+      dispatch("NOD_INCOMING_SCHEDULE_CHANGED", targetGUID, existing)
       return existing
     end
   end
 
-  local bucket = ensureScheduledBucket(targetGUID)
   local entry = {
     amount = amount,
     landTime = landing,
@@ -452,13 +573,12 @@ local function addScheduled(payload)
     targetGUID = targetGUID,
   }
 
-  local list = bucket.list
-  list[#list + 1] = entry
+  timelineInsert(ensureTimeline(SCHEDULED_STORAGE, targetGUID), entry)
 
   if key then
-    bucket.index[key] = entry
     SCHEDULED_BY_KEY[key] = entry
   end
+  dispatch("NOD_INCOMING_SCHEDULE_CHANGED", targetGUID, entry)
 
   log(format(
     "Agg: schedule target=%s +%d@%.2f source=%s spell=%s key=%s",
@@ -773,9 +893,7 @@ function aggregator.AddHeal(payload)
     source = payload.source,
   }
 
-  ensureQueue(targetGUID)
-  local queue = HEAL_STORAGE[targetGUID]
-  queue[#queue + 1] = entry
+  timelineInsert(ensureTimeline(HEAL_STORAGE, targetGUID), entry)
 
   log(format("LHC: queue target=%s +%d@%.2f from caster=%s spell=%s", tostring(targetGUID), amount, landing, tostring(payload.sourceGUID), tostring(payload.spellID)))
 
@@ -797,27 +915,22 @@ function aggregator.RemoveHeal(descriptor)
 
   for targetGUID in pairs(targets) do
     local guid = toGUID(targetGUID)
-    local queue = HEAL_STORAGE[guid]
-    if queue then
-      local write = 1
+    local timeline = HEAL_STORAGE[guid]
+    if timeline then
       local removed = 0
-      for index = 1, #queue do
-        local entry = queue[index]
+      local entries = timeline.entries
+      for slot = timeline.tail, timeline.head, -1 do
+        local entry = entries[slot]
         local match = entry and entry.sourceGUID == casterGUID
         if match and spellID and entry.spellID ~= spellID then
           match = false
         end
         if match then
+          timelineRemove(timeline, entry)
           removed = removed + 1
-        else
-          queue[write] = entry
-          write = write + 1
         end
       end
-      for index = write, #queue do
-        queue[index] = nil
-      end
-      if write == 1 then
+      if timeline.live == 0 then
         HEAL_STORAGE[guid] = nil
       end
       if removed > 0 then
@@ -827,30 +940,39 @@ function aggregator.RemoveHeal(descriptor)
   end
 end
 
+function aggregator.AddScheduled(payload)
+  return addScheduled(payload)
+end
+
+function aggregator.RemoveScheduled(key)
+  removeScheduledByKey(key)
+end
+
+-- `horizon` is seconds from `now`, or an absolute landing time when past 1e6; nil means no limit.
+local function cutoffFor(horizon, now)
+  if not horizon then
+    return math_huge
+  end
+  if horizon > 1000000 then
+    return horizon
+  end
+  return now + horizon
+end
+
 function aggregator.GetIncoming(unit, horizon)
   local guid = toGUID(unit)
   if not guid then
     return 0
   end
 
-  purgeExpired()
+  purgeExpired(nil, guid)
 
-  local queue = HEAL_STORAGE[guid]
-  if not queue or #queue == 0 then
+  local timeline = HEAL_STORAGE[guid]
+  if not timeline or timeline.live == 0 then
     return 0
   end
 
-  local now = GetTime()
-  local cutoff
-  if horizon then
-    if horizon > 1000000 then
-      cutoff = horizon
-    else
-      cutoff = now + horizon
-    end
-  else
-    cutoff = math_huge
-  end
+  local cutoff = cutoffFor(horizon, GetTime())
 
   local total, count = summarize(guid, cutoff)
   log(format("Agg: sum target=%s = %d@≤%.2f (%d entries)", tostring(guid), total, cutoff, count))
@@ -863,30 +985,16 @@ function aggregator.Iterate(unit, horizon, collector)
     return
   end
 
-  purgeExpired()
+  purgeExpired(nil, guid)
 
-  local queue = HEAL_STORAGE[guid]
-  if not queue then
+  local timeline = HEAL_STORAGE[guid]
+  if not timeline then
     return
   end
 
-  local now = GetTime()
-  local cutoff
-  if horizon then
-    if horizon > 1000000 then
-      cutoff = horizon
-    else
-      cutoff = now + horizon
-    end
-  else
-    cutoff = math_huge
-  end
+  local cutoff = cutoffFor(horizon, GetTime())
 
-  for _, entry in ipairs(queue) do
-    if entry and entry.landTime and entry.landTime <= cutoff then
-      collector(entry)
-    end
-  end
+  timelineEach(timeline, cutoff, collector)
 end
 
 function aggregator.IterateScheduled(unit, horizon, collector)
@@ -895,30 +1003,44 @@ function aggregator.IterateScheduled(unit, horizon, collector)
     return
   end
 
-  purgeScheduled()
+  purgeScheduled(nil, guid)
 
-  local bucket = SCHEDULED_STORAGE[guid]
-  if not bucket or not bucket.list then
+  local timeline = SCHEDULED_STORAGE[guid]
+  if not timeline then
     return
   end
 
-  local now = GetTime()
-  local cutoff
-  if horizon then
-    if horizon > 1000000 then
-      cutoff = horizon
-    else
-      cutoff = now + horizon
-    end
-  else
-    cutoff = math_huge
+  local cutoff = cutoffFor(horizon, GetTime())
+
+  timelineEach(timeline, cutoff, collector)
+end
+
+-- Landed and scheduled heal totals for `unit` up to each horizon, read from the timeline prefix
+-- sums without visiting entries; scheduled heals are only summed when `scheduledHorizon` is given.
+-- `now` lets batch callers share one GetTime().
+function aggregator.SumIncoming(unit, horizon, scheduledHorizon, now)
+  local guid = toGUID(unit)
+  if not guid then
+    return 0, 0
   end
+  now = now or GetTime()
 
-  for _, entry in ipairs(bucket.list) do
-    if entry and entry.landTime and entry.landTime <= cutoff then
-      collector(entry)
+  local landed = 0
+  purgeExpired(now, guid)
+  local timeline = HEAL_STORAGE[guid]
+  if timeline and timeline.live > 0 then
+    landed = timelineSum(timeline, cutoffFor(horizon, now))
+  end
+
+  local scheduled = 0
+  if scheduledHorizon then
+    purgeScheduled(now, guid)
+    timeline = SCHEDULED_STORAGE[guid]
+    if timeline and timeline.live > 0 then
+      scheduled = timelineSum(timeline, cutoffFor(scheduledHorizon, now))
     end
   end
+  return landed, scheduled
 end
 
 function aggregator.CleanExpired(now, unit)
@@ -969,23 +1091,14 @@ function aggregator:GetIncomingForGUID(guid, horizon)
     return 0
   end
 
-  purgeExpired()
+  purgeExpired(nil, guid)
 
-  local queue = HEAL_STORAGE[guid]
-  if not queue or #queue == 0 then
+  local timeline = HEAL_STORAGE[guid]
+  if not timeline or timeline.live == 0 then
     return 0
   end
 
-  local cutoff = resolveCutoff(horizon)
-  local total = 0
-  for index = 1, #queue do
-    local entry = queue[index]
-    if entry and entry.landTime and entry.landTime <= cutoff then
-      total = total + (entry.amount or 0)
-    end
-  end
-
-  return total
+  return (timelineSum(timeline, resolveCutoff(horizon)))
 end
 
 function aggregator.FetchFallback(unit)
@@ -1001,7 +1114,12 @@ function aggregator.Initialize(dispatcher)
 
   local hub = dispatcherRef
   if hub and hub.RegisterHandler then
-    hub.RegisterHandler("COMBAT_LOG_EVENT_UNFILTERED", handleCombatLog)
+    if hub.RegisterCombatLog then
+      -- Not roster-filtered: the overlay projects pets, target/focus and NPC frames too, and
+      -- scheduled heals are recorded for those GUIDs as well.
+      hub.RegisterCombatLog({ "SPELL_HEAL", "SPELL_PERIODIC_HEAL" }, handleHealLog)
+      hub.RegisterCombatLog("SPELL_CAST_SUCCESS", handleCastSuccessLog)
+    end
     hub.RegisterHandler("UNIT_SPELLCAST_START", handleSpellcastEvent)
     hub.RegisterHandler("UNIT_SPELLCAST_CHANNEL_START", handleSpellcastEvent)
     hub.RegisterHandler("UNIT_SPELLCAST_SUCCEEDED", handleSpellcastEvent)
@@ -1041,7 +1159,15 @@ function aggregator.Initialize(dispatcher)
 end
 
 function aggregator.DebugDump()
-  return HEAL_STORAGE
+  local dump = {}
+  for guid, timeline in pairs(HEAL_STORAGE) do
+    local list = {}
+    timelineEach(timeline, math_huge, function(entry)
+      list[#list + 1] = entry
+    end)
+    dump[guid] = list
+  end
+  return dump
 end
 
 local module = _G.NODHeal:RegisterModule("IncomingHealAggregator", aggregator)
@@ -11,6 +11,7 @@ local UnitGetIncomingHeals = UnitGetIncomingHeals
 local aggregatorRef
 local dispatcherRef
 local deathModule
+local rosterModule
 
 local M = {}
 
@@ -77,6 +78,17 @@ local function ensureDeathModule()
   return deathModule
 end
 
+local function ensureRosterModule()
+  if rosterModule then
+    return rosterModule
+  end
+  local ns = namespace()
+  if ns and ns.GetModule then
+    rosterModule = ns:GetModule("RosterIndex")
+  end
+  return rosterModule
+end
+
 local function normalizeLandingTime(value)
   if value == nil then
     return nil
@@ -102,7 +114,13 @@ local function resolveGuid(unit)
     return nil
   end
 
-  if UnitGUID then
+  local roster = ensureRosterModule()
+  if roster then
+    local guid = roster.GetGUID(unit)
+    if guid then
+      return guid
+    end
+  elseif UnitGUID then
     local guid = UnitGUID(unit)
     if guid then
       return guid
@@ -171,6 +189,48 @@ local function collectScheduled(unit, horizon)
   return total, contributions
 end
 
+-- Horizon for landed heals (seconds from `now`, nil for no limit) and for scheduled casts (nil when
+-- NODHeal.Config.heals.futureWindow is off).
+local function resolveHorizons(tLand, now)
+  local healsCfg = getHealsConfig()
+  local includeFuture = healsCfg.futureWindow ~= false
+  local futureWindow = healsCfg.windowSec
+  if type(futureWindow) ~= "number" then
+    futureWindow = nil
+  elseif futureWindow < 0 then
+    futureWindow = 0
+  end
+
+  local landing = normalizeLandingTime(tLand)
+  local horizon
+  if landing then
+    horizon = (landing - now) + landingEpsilon
+    if horizon < 0 then
+      horizon = 0
+    end
+  elseif includeFuture and futureWindow and futureWindow > 0 then
+    horizon = futureWindow
+  end
+
+  local scheduleHorizon
+  if includeFuture then
+    scheduleHorizon = horizon
+    if not scheduleHorizon and futureWindow and futureWindow > 0 then
+      scheduleHorizon = futureWindow
+    end
+  end
+  return horizon, scheduleHorizon
+end
+
+local function combinedConfidence(landed, scheduled)
+  if landed > 0 then
+    return "high"
+  elseif scheduled > 0 then
+    return "medium"
+  end
+  return "low"
+end
+
 function M.Initialize(dispatcher)
   dispatcherRef = dispatcher or ensureDispatcher()
   ensureAggregator()
@@ -201,42 +261,16 @@ function M.CollectUntil(unit, tLand)
     }
   end
 
-  local healsCfg = getHealsConfig()
-  local includeFuture = healsCfg.futureWindow ~= false
-  local futureWindow = healsCfg.windowSec
-  if type(futureWindow) ~= "number" then
-    futureWindow = nil
-  elseif futureWindow < 0 then
-    futureWindow = 0
-  end
-
-  local landing = normalizeLandingTime(tLand)
-  local now = GetTime()
-  local horizon
-  if landing then
-    horizon = (landing - now) + landingEpsilon
-    if horizon < 0 then
-      horizon = 0
-    end
-  elseif includeFuture and futureWindow and futureWindow > 0 then
-    horizon = futureWindow
-  end
-
+  local horizon, scheduleHorizon = resolveHorizons(tLand, GetTime())
   local total, contributions = collectFromAggregator(guid, horizon)
 
   local scheduledTotal = 0
   local scheduledContrib = {}
-  if includeFuture then
-    local scheduleHorizon = horizon
-    if not scheduleHorizon and futureWindow and futureWindow > 0 then
-      scheduleHorizon = futureWindow
-    end
-    if scheduleHorizon then
-      scheduledTotal, scheduledContrib = collectScheduled(guid, scheduleHorizon)
-      for key, amount in pairs(scheduledContrib) do
-        if amount > 0 then
-          contributions[key] = (contributions[key] or 0) + amount
-        end
+  if scheduleHorizon then
+    scheduledTotal, scheduledContrib = collectScheduled(guid, scheduleHorizon)
+    for key, amount in pairs(scheduledContrib) do
+      if amount > 0 then
+        contributions[key] = (contributions[key] or 0) + amount
       end
     end
   end
@@ -244,17 +278,9 @@ function M.CollectUntil(unit, tLand)
   local combined = total + scheduledTotal
 
   if combined > 0 then
-    local confidence
-    if total > 0 then
-      confidence = "high"
-    elseif scheduledTotal > 0 then
-      confidence = "medium"
-    else
-      confidence = "low"
-    end
     return {
       amount = combined,
-      confidence = confidence,
+      confidence = combinedConfidence(total, scheduledTotal),
       sources = contributions,
     }
   end
@@ -267,6 +293,39 @@ function M.CollectUntil(unit, tLand)
   return fallback
 end
 
+-- CollectUntil's amount and confidence without the per-source breakdown, summed from the
+-- aggregator's prefix sums without allocating. `now` lets batch callers share one GetTime().
+function M.SumUntil(unit, tLand, now)
+  local death = ensureDeathModule()
+  if death and death.IsHealImmune and death.IsHealImmune(unit) then
+    return 0, "low"
+  end
+
+  local guid = resolveGuid(unit)
+  if not guid then
+    return 0, "low"
+  end
+
+  now = now or GetTime()
+  local landed, scheduled = 0, 0
+  local aggregator = ensureAggregator()
+  if aggregator and aggregator.SumIncoming then
+    local horizon, scheduleHorizon = resolveHorizons(tLand, now)
+    landed, scheduled = aggregator.SumIncoming(guid, horizon, scheduleHorizon, now)
+  end
+
+  local combined = landed + scheduled
+  if combined > 0 then
+    return combined, combinedConfidence(landed, scheduled)
+  end
+
+  local amount = UnitGetIncomingHeals and unit and UnitGetIncomingHeals(unit) or 0
+  if amount > 0 then
+    return amount, "medium"
+  end
+  return 0, "low"
+end
+
 function M.FetchFallback(unit)
   local death = ensureDeathModule()
   if death and death.IsHealImmune and death.IsHealImmune(unit) then
@@ -10,6 +10,8 @@ local ipairs = ipairs
 local pairs = pairs
 local select = select
 local date = date
+local time = time
+local sort = table.sort
 
 local SLASH_NODHEAL1 = "/nod"
 
@@ -228,8 +230,7 @@ function Telemetry:Attach(dispatcher)
     local function tick()
         self:OnTick()
     end
-    if dispatcher and dispatcher.RegisterTick then
-        dispatcher:RegisterTick(tick)
+    if dispatcher and dispatcher.RegisterTick and dispatcher.RegisterTick(tick, { priority = "low", interval = 1 }) then
         return
     end
     if C_Timer and C_Timer.NewTicker then
@@ -240,50 +241,14 @@ function Telemetry:Attach(dispatcher)
     end
 end
 
-local function wipeTable(tbl)
-    if type(tbl) ~= "table" then
-        return
-    end
-    for key in pairs(tbl) do
-        tbl[key] = nil
-    end
-end
-
-local function copyEntry(source)
-    if type(source) ~= "table" then
-        return source
-    end
-    local target = {}
-    for key, value in pairs(source) do
-        target[key] = value
-    end
-    return target
-end
-
+-- Learned HoTs and cooldowns are saved packed; see LearnedStore.
 local function saveLearned()
-    local db = _G.NODHealDB
-    if type(db) ~= "table" then
+    if type(_G.NODHealDB) ~= "table" then
         return
     end
-
-    db.learned = db.learned or {}
-    local target = db.learned.hots
-    if type(target) ~= "table" then
-        target = {}
-        db.learned.hots = target
-    end
-
-    wipeTable(target)
-
-    local learned = NODHeal.Learned and NODHeal.Learned.hots
-    if type(learned) ~= "table" then
-        return
-    end
-
-    for spellId, entry in pairs(learned) do
-        if entry ~= nil then
-            target[spellId] = copyEntry(entry)
-        end
+    local store = NODHeal.GetModule and NODHeal:GetModule("LearnedStore")
+    if store and store.Save then
+        store.Save()
     end
 end
 
@@ -369,6 +334,109 @@ local function dumpErrors()
     end
 end
 
+local PROFILE_REPORT_LIMIT = 10
+
+local function byTotalMs(left, right)
+    return left.totalMs > right.totalMs
+end
+
+local function printProfile(profile)
+    local handlers = profile.handlers
+    if #handlers == 0 then
+        log("Profiler: no samples (start with /nod prof on)", true)
+        return
+    end
+    sort(handlers, byTotalMs)
+    local elapsed = profile.elapsed > 0 and profile.elapsed or 1
+    log(format("Profiler: %.1fs sampled, top %d by CPU time", profile.elapsed, math.min(#handlers, PROFILE_REPORT_LIMIT)), true)
+    for index = 1, math.min(#handlers, PROFILE_REPORT_LIMIT) do
+        local entry = handlers[index]
+        print(format(
+            "  %-44s %7d calls %8.2f ms (%.2f ms/s) avg %.3f max %.2f ms gc %.1f KB",
+            entry.label,
+            entry.calls,
+            entry.totalMs,
+            entry.totalMs / elapsed,
+            entry.totalMs / entry.calls,
+            entry.maxMs,
+            entry.gcKB
+        ))
+    end
+end
+
+-- Sessions land in NODHealDB.profiling.sessions (newest last, at most profiler.maxSessions) for
+-- scripts/profile_report.py.
+local function saveProfile(note)
+    local dispatcher = fetchModule("CoreDispatcher")
+    local db = _G.NODHealDB
+    if not (dispatcher and dispatcher.GetProfile) or type(db) ~= "table" then
+        return false
+    end
+    local profile = dispatcher.GetProfile()
+    if #profile.handlers == 0 then
+        return false
+    end
+
+    db.profiling = db.profiling or {}
+    local sessions = db.profiling.sessions
+    if type(sessions) ~= "table" then
+        sessions = {}
+        db.profiling.sessions = sessions
+    end
+    profile.savedAt = time and time() or 0
+    if note and note ~= "" then
+        profile.note = note
+    end
+    sessions[#sessions + 1] = profile
+
+    local profilerCfg = getConfig().profiler or {}
+    local limit = profilerCfg.maxSessions or 5
+    while #sessions > limit do
+        table.remove(sessions, 1)
+    end
+    return true
+end
+
+local function handleProfileCommand(restLower, rest)
+    local dispatcher = fetchModule("CoreDispatcher")
+    if not (dispatcher and dispatcher.SetProfiling) then
+        log("Profiler unavailable", true)
+        return
+    end
+
+    local action, argument = strmatch(restLower, "^(%S*)%s*(.*)$")
+    if action == "on" then
+        if dispatcher.SetProfiling(true) then
+            log("Profiler: on", true)
+        else
+            log("Profiler: debugprofilestop unavailable", true)
+        end
+    elseif action == "off" then
+        dispatcher.SetProfiling(false)
+        log("Profiler: off", true)
+    elseif action == "reset" then
+        dispatcher.ResetProfile()
+        log("Profiler: reset", true)
+    elseif action == "save" then
+        local note = strmatch(rest, "^%S+%s*(.*)$")
+        if saveProfile(note) then
+            log("Profiler: session saved to SavedVariables (written on logout or /reload)", true)
+        else
+            log("Profiler: nothing to save", true)
+        end
+    elseif action == "persist" then
+        local profilerCfg = getConfig().profiler
+        if profilerCfg and (argument == "on" or argument == "off") then
+            profilerCfg.persist = argument == "on"
+        end
+        log("Profiler: save on logout " .. ((profilerCfg and profilerCfg.persist) and "enabled" or "disabled"), true)
+    elseif action == "" or action == "report" then
+        printProfile(dispatcher.GetProfile())
+    else
+        log("Profiler: usage /nod prof [report|on|off|reset|save [note]|persist on|off]", true)
+    end
+end
+
 local function handleSlashCommand(message)
     local command, rest = strmatch(message or "", "^(%S+)%s*(.*)$")
     command = command and strlower(command) or ""
@@ -422,6 +490,11 @@ local function handleSlashCommand(message)
         return
     end
 
+    if command == "prof" then
+        handleProfileCommand(restLower, rest)
+        return
+    end
+
     if command == "qa" then
         local qaModule = fetchModule("QA") or NODHeal.QA
         if qaModule and qaModule.Run then
@@ -432,38 +505,84 @@ local function handleSlashCommand(message)
         return
     end
 
-    log("Unknown command. Usage: /nod debug|errors|options|bind|sort|qa", true)
+    log("Unknown command. Usage: /nod debug|errors|options|bind|sort|prof|qa", true)
+end
+
+-- Labels the dispatcher handlers registered next for the profiler ("<owner>:<event>").
+local function setProfileOwner(dispatcher, owner)
+    if dispatcher and dispatcher.SetProfileOwner then
+        dispatcher.SetProfileOwner(owner)
+    end
 end
 
 local function bootstrapDispatcher()
     local dispatcher = fetchModule("CoreDispatcher")
     if dispatcher and dispatcher.Initialize then
+        setProfileOwner(dispatcher, "CoreDispatcher")
         dispatcher.Initialize()
     end
 
+    -- Before every other module: its roster handlers must run first so the others read the new roster.
+    local roster = fetchModule("RosterIndex")
+    if roster and roster.Initialize then
+        setProfileOwner(dispatcher, "RosterIndex")
+        roster.Initialize(dispatcher)
+    end
+
     if Telemetry and Telemetry.Attach then
+        setProfileOwner(dispatcher, "Telemetry")
         Telemetry:Attach(dispatcher)
     end
 
     local death = fetchModule("DeathAuthority")
     if death and death.Initialize then
+        setProfileOwner(dispatcher, "DeathAuthority")
         death.Initialize(dispatcher)
     end
 
+    -- Solver inputs: cache invalidation for snapshots/auras and the damage EMA feed.
+    -- AuraCache first: its UNIT_AURA handler must run before the consumers reading it.
+    for _, name in ipairs({ "HealthSnapshot", "AuraCache", "AuraTickPredictor", "DamagePrediction" }) do
+        local module = fetchModule(name)
+        if module and module.Initialize then
+            setProfileOwner(dispatcher, name)
+            module.Initialize(dispatcher)
+        end
+    end
+
+    -- Learners: fed from the dispatcher's decoded combat log.
+    for _, name in ipairs({ "HotDetector", "CooldownClassifier" }) do
+        local learner = NODHeal.Core[name]
+        if learner and learner.Initialize then
+            setProfileOwner(dispatcher, name)
+            learner.Initialize(dispatcher)
+        end
+    end
+
     local aggregator = fetchModule("IncomingHealAggregator")
     if aggregator and aggregator.Initialize then
+        setProfileOwner(dispatcher, "IncomingHealAggregator")
         aggregator.Initialize(dispatcher)
     end
 
     local incoming = fetchModule("IncomingHeals")
     if incoming and incoming.Initialize then
+        setProfileOwner(dispatcher, "IncomingHeals")
         incoming.Initialize(dispatcher)
     end
 
+    local solver = fetchModule("PredictiveSolver")
+    if solver and solver.Attach then
+        setProfileOwner(dispatcher, "PredictiveSolver")
+        solver.Attach(dispatcher)
+    end
+
     local ui = fetchModule("UI")
     if ui and ui.Initialize then
+        setProfileOwner(dispatcher, "UI")
         ui:Initialize()
     end
+    setProfileOwner(dispatcher, nil)
     stampDataSource()
 end
 
@@ -497,6 +616,10 @@ local function handleEvent(_, event, name)
 
     if event == "PLAYER_LOGOUT" then
         saveLearned()
+        local profilerCfg = getConfig().profiler
+        if profilerCfg and profilerCfg.persist then
+            saveProfile("logout")
+        end
     end
 end
 
@@ -0,0 +1,254 @@
+-- Module: LearnedStore
+-- Purpose: Keep NODHealDB.learned.hots/cds packed into flat arrays between sessions and expand entries on first access.
+-- API: NODHealDB.learned.packed, time
+
+local pairs = pairs
+local type = type
+local tonumber = tonumber
+local rawget = rawget
+local rawset = rawset
+local setmetatable = setmetatable
+local math_floor = math.floor
+local time = time
+
+-- Saved form (also written by scripts/compact_learned.py):
+--   learned.packed = { version = 1, hots = { fields = { ... }, data = { spellId, value, ..., spellId, ... } }, cds = ... }
+-- Each record is the spellId followed by one value per field (false for nil). Readers use the
+-- stored field list, so records written with an older layout still expand.
+local FORMAT_VERSION = 1
+local LAYOUTS = {
+  hots = { "seen", "avg_tick", "period", "lastTimestamp", "lastSeen" },
+  cds = { "class", "lastSeen" },
+}
+-- Packed numbers are rounded to these steps (1/n); the learners never read more precision.
+local ROUNDING = { avg_tick = 100, period = 1000, lastTimestamp = 1000 }
+-- lastSeen before this is a GetTime() uptime stamp from an older version, not wall-clock time.
+local EPOCH_MIN = 1000000000
+local SECONDS_PER_DAY = 86400
+-- Older versions marked a known HoT as `hots[spellId] = true`; it is saved as this record.
+local LEGACY_RECORDS = { hots = { seen = 1 } }
+
+local bindings = {} -- [kind] = { live, source, index, remaining }
+
+local function learnedDB()
+  _G.NODHealDB = _G.NODHealDB or {}
+  local DB = _G.NODHealDB
+  DB.learned = DB.learned or {}
+  return DB.learned
+end
+
+local function packedSource(learned, kind)
+  local packed = learned.packed
+  if type(packed) ~= "table" or packed.version ~= FORMAT_VERSION then
+    return nil
+  end
+  local source = packed[kind]
+  if type(source) == "table" and type(source.fields) == "table" and type(source.data) == "table" then
+    return source
+  end
+  return nil
+end
+
+-- spellId -> offset of its record in source.data, for records not yet expanded. Built once, on
+-- the first miss, in a single pass over the numbers; no entry tables are created here.
+local function buildIndex(binding)
+  local index, remaining = {}, 0
+  local source = binding.source
+  if source then
+    local data, live = source.data, binding.live
+    for offset = 1, #data, #source.fields + 1 do
+      local spellId = data[offset]
+      if type(spellId) == "number" and spellId > 0 and not index[spellId] and rawget(live, spellId) == nil then
+        index[spellId] = offset
+        remaining = remaining + 1
+      end
+    end
+  end
+  binding.index = index
+  binding.remaining = remaining
+  return index
+end
+
+local function expand(binding, spellId)
+  if type(spellId) ~= "number" then
+    return nil
+  end
+  local index = binding.index or buildIndex(binding)
+  local offset = index[spellId]
+  if not offset then
+    return nil
+  end
+  index[spellId] = nil
+  binding.remaining = binding.remaining - 1
+
+  local source = binding.source
+  local data, fields = source.data, source.fields
+  local entry = {}
+  for position = 1, #fields do
+    local value = data[offset + position]
+    if value ~= false then
+      entry[fields[position]] = value
+    end
+  end
+  rawset(binding.live, spellId, entry)
+  return entry
+end
+
+local function round(field, value)
+  local steps = ROUNDING[field]
+  if steps and type(value) == "number" then
+    return math_floor(value * steps + 0.5) / steps
+  end
+  return value
+end
+
+local function appendEntry(data, spellId, layout, entry)
+  local count = #data + 1
+  data[count] = spellId
+  for position = 1, #layout do
+    local field = layout[position]
+    local value = entry[field]
+    if value == nil then
+      value = false
+    end
+    data[count + position] = round(field, value)
+  end
+end
+
+-- Copies a record that was never expanded, mapping its stored field order onto `layout`.
+local function appendPacked(data, spellId, layout, sourceData, offset, positions)
+  local count = #data + 1
+  data[count] = spellId
+  for position = 1, #layout do
+    local field = layout[position]
+    local from = positions[field]
+    local value = false
+    if from then
+      value = sourceData[offset + from] or false
+    end
+    data[count + position] = round(field, value)
+  end
+end
+
+-- Positive integer spellId for a saved key (numeric strings such as "774" included), else nil.
+local function spellKey(key)
+  local spellId = tonumber(key)
+  if spellId and spellId > 0 and spellId == math_floor(spellId) then
+    return spellId
+  end
+  return nil
+end
+
+-- Appends the live entries whose keys are (numeric == true) or are not (false) numbers.
+local function appendLive(data, written, live, kind, layout, numeric)
+  for key, entry in pairs(live) do
+    local spellId = (type(key) == "number") == numeric and spellKey(key)
+    if entry == true then
+      entry = LEGACY_RECORDS[kind]
+    end
+    if spellId and not written[spellId] and type(entry) == "table" then
+      appendEntry(data, spellId, layout, entry)
+      written[spellId] = true
+    end
+  end
+end
+
+local function fieldPositions(fields)
+  local positions = {}
+  for position = 1, #fields do
+    positions[fields[position]] = position
+  end
+  return positions
+end
+
+local M = {}
+
+-- Live table for `kind` ("hots" or "cds"): entries learned or read this session are plain
+-- fields, packed ones are expanded by the metatable the first time they are indexed. pairs()
+-- sees expanded entries only; use Count() for the total.
+function M.Open(kind)
+  local learned = learnedDB()
+  local live = learned[kind]
+  if type(live) ~= "table" then
+    live = {}
+    learned[kind] = live
+  end
+
+  local binding = bindings[kind]
+  if binding and binding.live == live then
+    return live
+  end
+  binding = { live = live, source = packedSource(learned, kind) }
+  bindings[kind] = binding
+  if binding.source then
+    setmetatable(live, {
+      __index = function(_, spellId)
+        return expand(binding, spellId)
+      end,
+    })
+  end
+  return live
+end
+
+function M.Count(kind)
+  local live = M.Open(kind)
+  local binding = bindings[kind]
+  if binding.source and not binding.index then
+    buildIndex(binding)
+  end
+  local total = binding.remaining or 0
+  for _, entry in pairs(live) do
+    if entry ~= nil then
+      total = total + 1
+    end
+  end
+  return total
+end
+
+-- Packs every kind into learned.packed and drops the expanded tables; run at PLAYER_LOGOUT.
+-- Records never indexed this session are copied through without being expanded. Keys are
+-- normalized with tonumber (a number key wins over its string form) and legacy `true` entries
+-- become LEGACY_RECORDS, the same rules scripts/compact_learned.py applies.
+function M.Save()
+  local learned = learnedDB()
+  local packed = { version = FORMAT_VERSION }
+  for kind, layout in pairs(LAYOUTS) do
+    local live = M.Open(kind)
+    local binding = bindings[kind]
+    local data, written = {}, {}
+    appendLive(data, written, live, kind, layout, true)
+    appendLive(data, written, live, kind, layout, false)
+
+    local source = binding.source
+    if source then
+      local index = binding.index or buildIndex(binding)
+      local positions = fieldPositions(source.fields)
+      local sourceData = source.data
+      for spellId, offset in pairs(index) do
+        if not written[spellId] then
+          appendPacked(data, spellId, layout, sourceData, offset, positions)
+        end
+      end
+    end
+
+    packed[kind] = { fields = layout, data = data }
+    learned[kind] = nil
+    bindings[kind] = nil
+  end
+  learned.packed = packed
+end
+
+-- Wall-clock stamp for lastSeen.
+function M.Now()
+  return time and time() or 0
+end
+
+-- Days since a lastSeen stamp, or nil when it is missing or an uptime stamp from an older version.
+function M.AgeDays(lastSeen)
+  if type(lastSeen) ~= "number" or lastSeen < EPOCH_MIN then
+    return nil
+  end
+  return (M.Now() - lastSeen) / SECONDS_PER_DAY
+end
+
+return _G.NODHeal:RegisterModule("LearnedStore", M)
@@ -3,8 +3,16 @@
 -- API: Depends on upstream modules (HealthSnapshot, IncomingHeals, DamagePrediction, HealValueEstimator)
 
 local math_max = math.max
+local math_floor = math.floor
 local pairs = pairs
+local type = type
 local GetTime = GetTime
+local UnitGUID = UnitGUID
+
+-- Fallbacks for NODHeal.Config.solver (see Config/Defaults.lua).
+local CACHE_WINDOW = 0.2
+local LAND_QUANTUM = 0.05
+local CACHE_SLOTS = 4
 
 local moduleRefs = {}
 local aliasMap = {
@@ -99,111 +107,246 @@ function M.Initialize(deps)
   end
 end
 
-local function fetchSnapshot(unit)
-  local module = resolveModule("HealthSnapshot")
-  if module and module.Capture then
-    return module.Capture(unit)
-  end
-  return nil
+-- Module lookups and GetTime() are resolved once per projection pass (one unit for
+-- CalculateProjectedHealth, the whole list for CalculateProjectedHealthBatch).
+local pass = {}
+
+local function beginPass()
+  pass.snapshot = resolveModule("HealthSnapshot")
+  pass.damage = resolveModule("DamagePrediction")
+  pass.incoming = resolveModule("IncomingHeals")
+  pass.ticks = resolveModule("AuraTickPredictor")
+  pass.estimator = resolveModule("HealValueEstimator")
+  pass.death = resolveModule("DeathAuthority")
+  pass.now = GetTime()
+  return pass
 end
 
-local function resolveDeathAuthority()
-  local module = resolveModule("DeathAuthority")
-  if module then
-    return module
-  end
-  return nil
-end
-
-local function evaluateDamage(unit, tLand)
-  local module = resolveModule("DamagePrediction")
+local function evaluateDamage(module, unit, tLand, now)
   if module and module.Estimate then
-    local estimate = module.Estimate(unit, tLand)
+    local estimate = module.Estimate(unit, tLand, now)
     if type(estimate) == "table" then
-      estimate.amount = math_max(estimate.amount or 0, 0)
-      return estimate.amount, estimate
+      return math_max(estimate.amount or 0, 0), estimate.confidence or "low"
     elseif type(estimate) == "number" then
-      return math_max(estimate, 0), { amount = math_max(estimate, 0) }
+      return math_max(estimate, 0), "low"
     end
   end
-  return 0, { amount = 0, confidence = "low", samples = 0 }
+  return 0, "low"
 end
 
-local function evaluateIncoming(unit, tLand)
-  local module = resolveModule("IncomingHeals")
+local function evaluateIncoming(module, unit, tLand, now)
+  -- SumUntil gives CollectUntil's amount and confidence without building the source breakdown.
+  if module and module.SumUntil then
+    return module.SumUntil(unit, tLand, now)
+  end
+
   if module and module.CollectUntil then
     local data = module.CollectUntil(unit, tLand)
     if type(data) == "table" then
-      local amount = math_max(data.amount or 0, 0)
-      return amount, data.confidence or "low", data
+      return math_max(data.amount or 0, 0), data.confidence or "low"
     end
     if type(data) == "number" then
       local amount = math_max(data, 0)
-      return amount, amount > 0 and "medium" or "low", nil
+      return amount, amount > 0 and "medium" or "low"
     end
   end
 
   if module and module.FetchFallback then
     local amount = module.FetchFallback(unit, tLand)
     if type(amount) == "number" and amount > 0 then
-      return amount, "medium", nil
+      return amount, "medium"
     end
   end
-  return 0, "low", nil
+  return 0, "low"
 end
 
-local function evaluateHoTs(unit, spellID, tLand)
-  local module = resolveModule("AuraTickPredictor")
-  if not module then
-    return 0, nil
+local function evaluateHoTs(module, unit, spellID, tLand)
+  if not module or not spellID then
+    return 0
   end
 
-  if module.CollectHoTs and spellID and type(spellID) == "table" then
+  -- The projection only needs the total, so prefer the allocation-free summaries.
+  if module.SummarizeHoTs and type(spellID) == "table" then
+    local _, total = module.SummarizeHoTs(unit, spellID, tLand)
+    return math_max(total or 0, 0)
+  elseif module.SummarizeHoT then
+    local _, total = module.SummarizeHoT(unit, spellID, tLand)
+    return math_max(total or 0, 0)
+  elseif module.CollectHoTs and type(spellID) == "table" then
     local data = module.CollectHoTs(unit, spellID, tLand)
-    local total = 0
-    if type(data) == "table" then
-      total = math_max(data.total or 0, 0)
-    end
-    return total, data
-  elseif module.GetHoTTicks and spellID then
+    return type(data) == "table" and math_max(data.total or 0, 0) or 0
+  elseif module.GetHoTTicks then
     local schedule = module.GetHoTTicks(unit, spellID, tLand)
-    local total = 0
-    if type(schedule) == "table" then
-      total = math_max(schedule.total or 0, 0)
-    end
-    return total, schedule
+    return type(schedule) == "table" and math_max(schedule.total or 0, 0) or 0
   end
 
-  return 0, nil
+  return 0
 end
 
-local function evaluateHealValue(spellID, stats)
-  local module = resolveModule("HealValueEstimator")
-  if module and module.Estimate then
-    local estimate = module.Estimate(spellID, stats)
+local function evaluateHealValue(module, spellID)
+  if not module or not spellID then
+    return 0
+  end
+  if module.EstimateMean then
+    return math_max(module.EstimateMean(spellID, nil) or 0, 0)
+  end
+  if module.Estimate then
+    local estimate = module.Estimate(spellID, nil)
     if type(estimate) == "table" then
-      local mean = math_max(estimate.mean or 0, 0)
-      return mean, estimate
+      return math_max(estimate.mean or 0, 0)
     elseif type(estimate) == "number" then
-      return math_max(estimate, 0), { mean = math_max(estimate, 0) }
+      return math_max(estimate, 0)
     end
   end
-  return 0, { mean = 0 }
+  return 0
 end
 
-local function fetchLatencyMeta()
+local function fillLatencyMeta(meta, tLand)
+  local latency, queue = 0, 0
   local module = resolveModule("LatencyTools")
-  if not module then
-    return { latency = 0, queue = 0 }
+  if module then
+    latency = module.GetLatency and module.GetLatency() or 0
+    queue = module.GetSpellQueueWindow and module.GetSpellQueueWindow() or 0
+    if latency < 0 then latency = 0 end
+    if queue < 0 then queue = 0 end
+  end
+
+  meta.latency = latency
+  meta.queue = queue
+  meta.tLand = tLand
+  return meta
+end
+
+local function fillComponents(components, dmg, incHeals, hots, healValue, absorbs)
+  components.dmg = dmg
+  components.incHeals = incHeals
+  components.hots = hots
+  components.healValue = healValue
+  components.absorbs = absorbs
+  return components
+end
+
+local function solverConfig()
+  local config = _G.NODHeal and _G.NODHeal.Config
+  return config and config.solver or {}
+end
+
+-- Projection cache --------------------------------------------------------------
+-- Grid, Overlay and the dispatcher tick ask for the same projection several times per tick.
+-- Results are kept per unit GUID for cacheWindow seconds in up to CACHE_SLOTS slots keyed by
+-- spellID and tLand rounded to landQuantum, and dropped when the unit's health, absorbs or auras
+-- change or the aggregator records/schedules a heal for it. Only numeric (or nil) spellIDs are
+-- cached; HoT filter tables bypass the cache. Cached results are reused tables: read them right
+-- away, do not keep or modify them.
+
+local projectionCache = {} -- [guid] = { [i] = { spellID, landKey, stamp, dying, result } }
+
+local function unitGUID(unit)
+  local roster = resolveModule("RosterIndex")
+  if roster then
+    return roster.GetGUID(unit)
+  end
+  return UnitGUID and UnitGUID(unit) or nil
+end
+
+local function invalidateGUID(guid)
+  local slots = guid and projectionCache[guid]
+  if slots then
+    for index = 1, #slots do
+      slots[index].stamp = nil
+    end
+  end
+end
+
+local function invalidateUnit(_, unit)
+  if unit then
+    invalidateGUID(unitGUID(unit))
   end
+end
+
+local function invalidateAll()
+  for guid in pairs(projectionCache) do
+    projectionCache[guid] = nil
+  end
+end
+
+-- Keeps DeathAuthority's DYING flag for a unit projected to die at tLand. FlagDying durations
+-- are short, so cache hits for such a unit flag it again.
+local function flagDying(death, unit, tLand, now)
+  local duration
+  if type(tLand) == "number" then
+    duration = tLand - (now or 0)
+  end
+  if not duration or duration < 0 then
+    duration = 0.8
+  end
+  if duration < 0.2 then
+    duration = 0.2
+  elseif duration > 1.0 then
+    duration = 1.0
+  end
+  death.FlagDying(unit, duration, "solver")
+end
 
-  local latency = module.GetLatency and module.GetLatency() or 0
-  local queue = module.GetSpellQueueWindow and module.GetSpellQueueWindow() or 0
+-- Returns the cached result on a hit; otherwise the slot to refill (nil when caching is off).
+local function lookupProjection(unit, spellID, tLand, now)
+  local config = solverConfig()
+  local window = config.cacheWindow or CACHE_WINDOW
+  if window <= 0 or (spellID ~= nil and type(spellID) ~= "number") then
+    return nil, nil
+  end
+  local guid = unitGUID(unit)
+  if not guid then
+    return nil, nil
+  end
 
-  if latency < 0 then latency = 0 end
-  if queue < 0 then queue = 0 end
+  local landKey = false
+  if type(tLand) == "number" then
+    landKey = math_floor(tLand / (config.landQuantum or LAND_QUANTUM) + 0.5)
+  end
+
+  now = now or GetTime()
+  local slots = projectionCache[guid]
+  if not slots then
+    slots = {}
+    projectionCache[guid] = slots
+  end
+
+  local reuse
+  for index = 1, #slots do
+    local slot = slots[index]
+    local stamp = slot.stamp
+    if stamp and (now - stamp) < window then
+      if slot.spellID == spellID and slot.landKey == landKey then
+        local death = slot.dying and resolveModule("DeathAuthority")
+        if death and death.FlagDying then
+          flagDying(death, unit, tLand, now)
+        end
+        return slot.result, nil
+      end
+    elseif not reuse then
+      reuse = slot
+    end
+  end
 
-  return { latency = latency, queue = queue }
+  if not reuse then
+    if #slots < CACHE_SLOTS then
+      reuse = { result = { components = {}, meta = {} } }
+      slots[#slots + 1] = reuse
+    else
+      reuse = slots[1]
+      for index = 2, #slots do
+        if slots[index].stamp < reuse.stamp then
+          reuse = slots[index]
+        end
+      end
+    end
+  end
+
+  reuse.spellID = spellID
+  reuse.landKey = landKey
+  reuse.stamp = nil
+  return nil, reuse
 end
 
 local function normalizeArgs(unit, arg2, arg3)
@@ -217,31 +360,41 @@ local function normalizeArgs(unit, arg2, arg3)
   return unit, arg2, arg3
 end
 
-function M.CalculateProjectedHealth(unit, arg2, arg3)
-  local spellID, tLand
-  unit, spellID, tLand = normalizeArgs(unit, arg2, arg3)
-
-  if not unit then
-    return nil
+local function fillResult(result, snapshot, projectedHP, components, meta, confidence, overhealValue)
+  local hpNow = snapshot.hp_now or 0
+  local hpMax = snapshot.hp_max or 1
+  if hpMax <= 0 then
+    hpMax = 1
   end
 
-  local snapshot = fetchSnapshot(unit)
-  if not snapshot then
-    return nil
+  local projected = projectedHP or hpNow
+  projected = clamp(projected, 0, hpMax)
+
+  local absorbs = snapshot.absorbs or 0
+  if absorbs < 0 then
+    absorbs = 0
   end
 
-  local death = resolveDeathAuthority()
-  if death and death.IsHealImmune and death.IsHealImmune(unit) then
-    local meta = fetchLatencyMeta()
-    meta.tLand = tLand
-    local components = {
-      dmg = 0,
-      incHeals = 0,
-      hots = 0,
-      healValue = 0,
-      absorbs = snapshot.absorbs or 0,
-    }
-    return M.ComposeResult(snapshot, 0, components, meta, "low", 0)
+  result.hp_now = hpNow
+  result.hp_max = hpMax
+  result.hp_proj = projected
+  result.overheal = math_max(overhealValue or 0, 0)
+  result.confidence = confidence or "low"
+  result.components = components or fillComponents({}, 0, 0, 0, 0, absorbs)
+  result.meta = meta or {}
+  result.projectedHealth = projected
+  return result
+end
+
+-- Evaluates one unit into `unitState` (reused; read before the next call). Returns false when
+-- there is no health snapshot for the unit.
+local unitState = {}
+
+local function evaluateUnit(ctx, unit, spellID, tLand)
+  local snapshotModule = ctx.snapshot
+  local snapshot = snapshotModule and snapshotModule.Capture and snapshotModule.Capture(unit)
+  if not snapshot then
+    return false
   end
 
   local hpNow = snapshot.hp_now or 0
@@ -249,104 +402,201 @@ function M.CalculateProjectedHealth(unit, arg2, arg3)
   if hpMax <= 0 then
     hpMax = 1
   end
-
-  local damageAmount, damageData = evaluateDamage(unit, tLand)
-  local incomingAmount, incomingConfidence = evaluateIncoming(unit, tLand)
-  local hotAmount = evaluateHoTs(unit, spellID, tLand)
-  local healAmount, healData = evaluateHealValue(spellID, nil)
-
-  local rawProjected = hpNow - damageAmount + incomingAmount + hotAmount + healAmount
-  local projected = clamp(rawProjected, 0, hpMax)
-
   local absorbs = snapshot.absorbs or 0
   if absorbs < 0 then
     absorbs = 0
   end
 
-  local overheal = math_max(rawProjected - hpMax, 0)
+  local state = unitState
+  state.hpNow = hpNow
+  state.hpMax = hpMax
+  state.absorbs = absorbs
 
-  local damageConfidence = (damageData and damageData.confidence) or "low"
-  local healConfidence
-  if healData and healData.mean and healData.mean > 0 then
-    healConfidence = "medium"
-  else
-    healConfidence = "low"
+  local death = ctx.death
+  if death and death.IsHealImmune and death.IsHealImmune(unit) then
+    state.projected = 0
+    state.overheal = 0
+    state.confidence = "low"
+    state.dmg, state.incHeals, state.hots, state.healValue = 0, 0, 0, 0
+    state.immune = true
+    state.dying = false
+    return true
   end
 
-  local combinedConfidence = accumulateConfidence(incomingConfidence, damageConfidence, healConfidence)
+  local now = ctx.now
+  local damageAmount, damageConfidence = evaluateDamage(ctx.damage, unit, tLand, now)
+  local incomingAmount, incomingConfidence = evaluateIncoming(ctx.incoming, unit, tLand, now)
+  local hotAmount = evaluateHoTs(ctx.ticks, unit, spellID, tLand)
+  local healAmount = evaluateHealValue(ctx.estimator, spellID)
 
-  local components = {
-    dmg = damageAmount,
-    incHeals = incomingAmount,
-    hots = hotAmount,
-    healValue = healAmount,
-    absorbs = absorbs,
-  }
+  local rawProjected = hpNow - damageAmount + incomingAmount + hotAmount + healAmount
+  local healConfidence = healAmount > 0 and "medium" or "low"
 
-  local meta = fetchLatencyMeta()
-  meta.tLand = tLand
+  state.projected = clamp(rawProjected, 0, hpMax)
+  state.overheal = math_max(rawProjected - hpMax, 0)
+  state.confidence = accumulateConfidence(incomingConfidence, damageConfidence, healConfidence)
+  state.dmg, state.incHeals, state.hots, state.healValue = damageAmount, incomingAmount, hotAmount, healAmount
+  state.immune = false
+  state.dying = false
 
   if death and death.FlagDying and rawProjected <= 0 and hpNow > 0 and damageAmount > 0 then
-    local now = GetTime() or 0
-    local duration
-    if type(tLand) == "number" then
-      duration = tLand - now
-    end
-    if not duration or duration < 0 then
-      duration = 0.8
-    end
-    if duration < 0.2 then
-      duration = 0.2
-    elseif duration > 1.0 then
-      duration = 1.0
-    end
-    death.FlagDying(unit, duration, "solver")
+    state.dying = true
+    flagDying(death, unit, tLand, now)
   end
+  return true
+end
 
-  local result = M.ComposeResult(snapshot, projected, components, meta, combinedConfidence, overheal)
-  if result then
-    result.source = result.source or "Mixed"
-  end
+-- Copies `unitState` into `result`, reusing its components/meta tables when present.
+local function fillFromState(result, tLand)
+  local state = unitState
+  local components = fillComponents(result.components or {}, state.dmg, state.incHeals, state.hots,
+    state.healValue, state.absorbs)
+  local meta = fillLatencyMeta(result.meta or {}, tLand)
+
+  result.hp_now = state.hpNow
+  result.hp_max = state.hpMax
+  result.hp_proj = state.projected
+  result.overheal = state.overheal
+  result.confidence = state.confidence
+  result.components = components
+  result.meta = meta
+  result.projectedHealth = state.projected
+  result.source = not state.immune and "Mixed" or nil
   return result
 end
 
-function M.ComposeResult(snapshot, projectedHP, components, meta, confidence, overhealValue)
-  if not snapshot then
+-- Stores the `unitState` just evaluated in a cache slot from lookupProjection.
+local function storeProjection(slot, tLand, now)
+  fillFromState(slot.result, tLand)
+  slot.dying = unitState.dying
+  slot.stamp = now
+end
+
+function M.CalculateProjectedHealth(unit, arg2, arg3)
+  local spellID, tLand
+  unit, spellID, tLand = normalizeArgs(unit, arg2, arg3)
+
+  if not unit then
     return nil
   end
 
-  local hpNow = snapshot.hp_now or 0
-  local hpMax = snapshot.hp_max or 1
-  if hpMax <= 0 then
-    hpMax = 1
+  local ctx = beginPass()
+  local cached, slot = lookupProjection(unit, spellID, tLand, ctx.now)
+  if cached then
+    return cached
   end
 
-  local projected = projectedHP or hpNow
-  projected = clamp(projected, 0, hpMax)
+  if not evaluateUnit(ctx, unit, spellID, tLand) then
+    return nil
+  end
+  if slot then
+    storeProjection(slot, tLand, ctx.now)
+    return slot.result
+  end
+  return fillFromState({}, tLand)
+end
 
-  local absorbs = snapshot.absorbs or 0
-  if absorbs < 0 then
-    absorbs = 0
+-- Projects units[1..count] (count defaults to #units) in one pass: module lookups and GetTime()
+-- are shared and nothing is allocated per unit. `tLand` is one landing time for every unit or a
+-- table indexed like `units`; `spellIDs`, when given, is indexed like `units`. Results are written at the unit's index into the
+-- caller's arrays out.projected, out.overheal and out.confidence, plus out.hpNow and out.hpMax when
+-- present; units without a health snapshot get false. Like CalculateProjectedHealth it reads and
+-- fills the projection cache, so units the grid and the overlay both show are projected once per
+-- cache window. Returns the number of units projected.
+function M.CalculateProjectedHealthBatch(units, tLand, out, count, spellIDs)
+  if type(units) ~= "table" or type(out) ~= "table" or (spellIDs ~= nil and type(spellIDs) ~= "table") then
+    return 0
   end
+  local projectedOut, overhealOut, confidenceOut = out.projected, out.overheal, out.confidence
+  local hpNowOut, hpMaxOut = out.hpNow, out.hpMax
+  local landPerUnit = type(tLand) == "table"
+
+  local ctx = beginPass()
+  local state = unitState
+  local projectedCount = 0
+  for index = 1, count or #units do
+    local unit = units[index]
+    local landing = tLand
+    if landPerUnit then
+      landing = tLand[index]
+    end
+    local spellID = spellIDs and spellIDs[index]
 
-  local overheal = math_max(overhealValue or 0, 0)
-
-  return {
-    hp_now = hpNow,
-    hp_max = hpMax,
-    hp_proj = projected,
-    overheal = overheal,
-    confidence = confidence or "low",
-    components = components or {
-      dmg = 0,
-      incHeals = 0,
-      hots = 0,
-      healValue = 0,
-      absorbs = absorbs,
-    },
-    meta = meta or {},
-    projectedHealth = projected,
-  }
+    local cached, slot
+    if unit then
+      cached, slot = lookupProjection(unit, spellID, landing, ctx.now)
+    end
+    if cached then
+      projectedCount = projectedCount + 1
+      projectedOut[index] = cached.hp_proj
+      overhealOut[index] = cached.overheal
+      confidenceOut[index] = cached.confidence
+      if hpNowOut then
+        hpNowOut[index] = cached.hp_now
+      end
+      if hpMaxOut then
+        hpMaxOut[index] = cached.hp_max
+      end
+    elseif unit and evaluateUnit(ctx, unit, spellID, landing) then
+      if slot then
+        storeProjection(slot, landing, ctx.now)
+      end
+      projectedCount = projectedCount + 1
+      projectedOut[index] = state.projected
+      overhealOut[index] = state.overheal
+      confidenceOut[index] = state.confidence
+      if hpNowOut then
+        hpNowOut[index] = state.hpNow
+      end
+      if hpMaxOut then
+        hpMaxOut[index] = state.hpMax
+      end
+    else
+      projectedOut[index] = false
+      overhealOut[index] = false
+      confidenceOut[index] = false
+      if hpNowOut then
+        hpNowOut[index] = false
+      end
+      if hpMaxOut then
+        hpMaxOut[index] = false
+      end
+    end
+  end
+  return projectedCount
+end
+
+function M.InvalidateCache(unit)
+  if unit then
+    invalidateUnit(nil, unit)
+  else
+    invalidateAll()
+  end
+end
+
+function M.Attach(dispatcher)
+  if not dispatcher or not dispatcher.RegisterHandler then
+    return
+  end
+  dispatcher.RegisterHandler("UNIT_HEALTH", invalidateUnit)
+  dispatcher.RegisterHandler("UNIT_MAXHEALTH", invalidateUnit)
+  dispatcher.RegisterHandler("UNIT_ABSORB_AMOUNT_CHANGED", invalidateUnit)
+  dispatcher.RegisterHandler("UNIT_AURA", invalidateUnit)
+  dispatcher.RegisterHandler("NOD_INCOMING_HEAL_RECORDED", function(_, targetGUID)
+    invalidateGUID(targetGUID)
+  end)
+  dispatcher.RegisterHandler("NOD_INCOMING_SCHEDULE_CHANGED", function(_, targetGUID)
+    invalidateGUID(targetGUID)
+  end)
+  dispatcher.RegisterHandler("GROUP_ROSTER_UPDATE", invalidateAll)
+  dispatcher.RegisterHandler("PLAYER_REGEN_ENABLED", invalidateAll)
+end
+
+function M.ComposeResult(snapshot, projectedHP, components, meta, confidence, overhealValue)
+  if not snapshot then
+    return nil
+  end
+  return fillResult({}, snapshot, projectedHP, components, meta, confidence, overhealValue)
 end
 
 local module = _G.NODHeal:RegisterModule("PredictiveSolver", M)
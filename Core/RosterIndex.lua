@@ -0,0 +1,266 @@
+-- Module: RosterIndex
+-- Purpose: One roster snapshot per GROUP_ROSTER_UPDATE shared by Core and UI: unit<->GUID lookups, membership for combat log filtering and pre-sorted views.
+-- API: IsInRaid, IsInGroup, GetNumGroupMembers, GetRaidRosterInfo, UnitExists, UnitGUID, UnitName, UnitGroupRolesAssigned
+
+local IsInRaid = IsInRaid
+local IsInGroup = IsInGroup
+local GetNumGroupMembers = GetNumGroupMembers
+local GetRaidRosterInfo = GetRaidRosterInfo
+local UnitExists = UnitExists
+local UnitGUID = UnitGUID
+local UnitName = UnitName
+local UnitGroupRolesAssigned = UnitGroupRolesAssigned
+local pairs = pairs
+local sort = table.sort
+
+local MAX_PARTY = 4
+local MAX_RAID = 40
+
+local ROLE_ORDER = {
+  TANK = 1,
+  HEALER = 2,
+  DAMAGER = 3,
+  NONE = 4,
+}
+
+-- Unit tokens are built once; the roster is rebuilt on every GROUP_ROSTER_UPDATE burst.
+local PARTY_TOKENS = {}
+for index = 1, MAX_PARTY do
+  PARTY_TOKENS[index] = "party" .. index
+end
+local RAID_TOKENS = {}
+for index = 1, MAX_RAID do
+  RAID_TOKENS[index] = "raid" .. index
+end
+
+-- Rebuilt lazily on the first read after an invalidating event, so a burst of roster events
+-- costs one rebuild. All tables are cleared in place and handed out as read-only views.
+local units = {} -- roster tokens in raid/party index order ("player" last in a party)
+local unitToGUID = {} -- roster tokens plus "player"
+local guidToUnit = {} -- the roster token (raidN in a raid) for each member GUID
+local order = {}
+local names = {}
+local roleWeights = {}
+local groupWeights = {}
+local dirty = true
+local rebuilds = 0
+
+local views = { group = {}, role = {}, alpha = {} }
+local viewDirty = { group = true, role = true, alpha = true }
+
+local function clearMap(map)
+  for key in pairs(map) do
+    map[key] = nil
+  end
+end
+
+local function roleWeight(unit)
+  if not UnitGroupRolesAssigned then
+    return ROLE_ORDER.NONE
+  end
+  return ROLE_ORDER[UnitGroupRolesAssigned(unit) or "NONE"] or ROLE_ORDER.NONE
+end
+
+-- Raid members sort by subgroup then raid index, party members before the player.
+local function raidGroupWeight(raidIndex)
+  local subgroup = 0
+  if GetRaidRosterInfo then
+    local _, _, groupId = GetRaidRosterInfo(raidIndex)
+    subgroup = groupId or subgroup
+  end
+  if subgroup > 0 then
+    return subgroup * 100 + raidIndex
+  end
+  return 500 + raidIndex
+end
+
+local function addUnit(unit, groupWeight)
+  if UnitExists and not UnitExists(unit) then
+    return
+  end
+  local count = #units + 1
+  units[count] = unit
+  order[unit] = count
+  names[unit] = UnitName and UnitName(unit) or ""
+  roleWeights[unit] = roleWeight(unit)
+  groupWeights[unit] = groupWeight
+  local guid = UnitGUID and UnitGUID(unit)
+  if guid then
+    unitToGUID[unit] = guid
+    guidToUnit[guid] = unit
+  end
+end
+
+local function rebuild()
+  dirty = false
+  rebuilds = rebuilds + 1
+  for index = #units, 1, -1 do
+    units[index] = nil
+  end
+  clearMap(unitToGUID)
+  clearMap(guidToUnit)
+  clearMap(order)
+  clearMap(names)
+  clearMap(roleWeights)
+  clearMap(groupWeights)
+  for mode in pairs(viewDirty) do
+    viewDirty[mode] = true
+  end
+
+  local members = GetNumGroupMembers and GetNumGroupMembers() or 0
+  if IsInRaid and IsInRaid() then
+    for index = 1, members < MAX_RAID and members or MAX_RAID do
+      addUnit(RAID_TOKENS[index], raidGroupWeight(index))
+    end
+  else
+    if IsInGroup and IsInGroup() then
+      for index = 1, members - 1 < MAX_PARTY and members - 1 or MAX_PARTY do
+        addUnit(PARTY_TOKENS[index], 1000 + index)
+      end
+    end
+    addUnit("player", 1010)
+  end
+
+  -- In a raid the player is one of the raidN tokens; keep "player" resolvable as well.
+  if not unitToGUID.player and UnitGUID then
+    unitToGUID.player = UnitGUID("player")
+  end
+end
+
+local function ensureCurrent()
+  if dirty then
+    rebuild()
+  end
+end
+
+local function byName(a, b)
+  local nameA, nameB = names[a], names[b]
+  if nameA ~= nameB then
+    return nameA < nameB
+  end
+  return order[a] < order[b]
+end
+
+local function byRole(a, b)
+  local weightA, weightB = roleWeights[a], roleWeights[b]
+  if weightA ~= weightB then
+    return weightA < weightB
+  end
+  return byName(a, b)
+end
+
+local function byGroup(a, b)
+  local weightA, weightB = groupWeights[a], groupWeights[b]
+  if weightA ~= weightB then
+    return weightA < weightB
+  end
+  return byName(a, b)
+end
+
+local COMPARATORS = { group = byGroup, role = byRole, alpha = byName }
+
+local function markDirty()
+  dirty = true
+end
+
+local function handleNameUpdate(_, unit)
+  if unit and order[unit] then
+    dirty = true
+  end
+end
+
+local M = {}
+
+function M.Initialize(dispatcher)
+  dirty = true
+  if dispatcher and dispatcher.RegisterHandler then
+    -- Initialized right after the dispatcher, so these run before every other module's
+    -- GROUP_ROSTER_UPDATE handler and those read the new roster.
+    dispatcher.RegisterHandler("GROUP_ROSTER_UPDATE", markDirty)
+    dispatcher.RegisterHandler("PLAYER_ENTERING_WORLD", markDirty)
+    dispatcher.RegisterHandler("PLAYER_ROLES_ASSIGNED", markDirty)
+    dispatcher.RegisterHandler("UNIT_NAME_UPDATE", handleNameUpdate)
+  end
+end
+
+-- Forces a rebuild on the next read; for callers that see roster events outside the dispatcher.
+function M.MarkDirty()
+  dirty = true
+end
+
+-- Roster unit tokens in raid/party index order. Shared list: read it, do not modify or keep it.
+function M.GetUnits()
+  ensureCurrent()
+  return units
+end
+
+-- Roster units sorted for display: "group" (subgroup, then name), "role" (tank, healer, damager,
+-- then name) or "alpha". Views are sorted once per roster change and shared like GetUnits().
+function M.GetSorted(mode)
+  ensureCurrent()
+  local comparator = COMPARATORS[mode]
+  if not comparator then
+    mode, comparator = "group", byGroup
+  end
+  local view = views[mode]
+  if viewDirty[mode] then
+    for index = #view, 1, -1 do
+      view[index] = nil
+    end
+    for index = 1, #units do
+      view[index] = units[index]
+    end
+    sort(view, comparator)
+    viewDirty[mode] = false
+  end
+  return view
+end
+
+-- GUID of a roster token (or "player"); other tokens (target, focus, ...) fall back to UnitGUID.
+function M.GetGUID(unit)
+  if not unit then
+    return nil
+  end
+  ensureCurrent()
+  local guid = unitToGUID[unit]
+  if guid then
+    return guid
+  end
+  return UnitGUID and UnitGUID(unit) or nil
+end
+
+-- Roster token for a member GUID, nil for anyone outside the group.
+function M.GetUnit(guid)
+  if not guid then
+    return nil
+  end
+  ensureCurrent()
+  return guidToUnit[guid]
+end
+
+function M.IsRosterGUID(guid)
+  if not guid then
+    return false
+  end
+  ensureCurrent()
+  return guidToUnit[guid] ~= nil
+end
+
+function M.IsRosterUnit(unit)
+  if not unit then
+    return false
+  end
+  ensureCurrent()
+  return unitToGUID[unit] ~= nil or order[unit] ~= nil
+end
+
+function M.DebugStats()
+  ensureCurrent()
+  local guids = 0
+  for _ in pairs(guidToUnit) do
+    guids = guids + 1
+  end
+  return { units = #units, guids = guids, rebuilds = rebuilds }
+end
+
+return _G.NODHeal:RegisterModule("RosterIndex", M)
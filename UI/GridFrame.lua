@@ -17,27 +17,20 @@ local UnitExists = UnitExists
 local UnitHealth = UnitHealth
 local UnitHealthMax = UnitHealthMax
 local UnitName = UnitName
-local UnitGroupRolesAssigned = UnitGroupRolesAssigned
-local UnitInRaid = UnitInRaid
-local UnitInParty = UnitInParty
-local GetRaidRosterInfo = GetRaidRosterInfo
 local UnitGetIncomingHeals = UnitGetIncomingHeals
 local UnitHasIncomingResurrection = UnitHasIncomingResurrection
 local UnitIsDeadOrGhost = UnitIsDeadOrGhost
 local UnitIsGhost = UnitIsGhost
-local GetNumGroupMembers = GetNumGroupMembers
-local IsInGroup = IsInGroup
-local IsInRaid = IsInRaid
 local UnitIsUnit = UnitIsUnit
+local UnitGUID = UnitGUID
 local GetTime = GetTime
+local debugprofilestop = debugprofilestop
 local RAID_CLASS_COLORS = RAID_CLASS_COLORS
 local C_Timer = C_Timer
 local math = math
 local ipairs = ipairs
 local pairs = pairs
 local type = type
-local UnitAura = UnitAura
-local UnitDebuff = UnitDebuff
 local UnitCastingInfo = UnitCastingInfo
 local UnitChannelInfo = UnitChannelInfo
 local tinsert = table.insert
@@ -49,6 +42,8 @@ local trackedFrames = {}
 
 local solverModule
 local landingModule
+local auraCacheModule
+local rosterModule
 local desyncModule
 
 local dispatcherCache
@@ -58,11 +53,36 @@ local fallbackSecureFrame
 local fallbackQueue
 
 local GRID_TICK_INTERVAL = 0.2
+local GRID_TICK_BUDGET_MS = 1.5
+local GRID_BATCH_CHUNK = 8
+local SETTLE_EPSILON = 0.002
 local AURA_REFRESH_MIN_INTERVAL = 0.15
 local MIN_REFRESH_DELAY = 0.05
 local REBUILD_DEBOUNCE = 0.2
+local EMPTY_LIST = {}
 local rebuildTimerActive = false
 
+-- Dirty-unit scheduler: events mark frames dirty, sharedTick refreshes dirty frames (plus casting
+-- and dying ones) lowest health first within the tick budget, and frames whose data is current
+-- only advance their bar animation.
+local dirtyFrames = {}
+local frameByUnit = {}
+local frameByGUID = {}
+local tickQueue = {}
+local tickSerial = 0
+-- sharedTick projects queued frames GRID_BATCH_CHUNK at a time with CalculateProjectedHealthBatch
+-- into these arrays (indexed from the chunk's first frame); updateUnitFrame reads its frame's slot.
+local batchUnits = {}
+local batchLand = {}
+local batchSpell = {}
+local batchOut = { projected = {}, overheal = {}, confidence = {}, hpNow = {}, hpMax = {} }
+
+local function wipeTable(tbl)
+    for key in pairs(tbl) do
+        tbl[key] = nil
+    end
+end
+
 local function collectVisibleMajor()
     local visible = {}
     for _, frame in ipairs(trackedFrames) do
@@ -364,6 +384,86 @@ local function computeLandingForUnit(unit)
     return landing, spellID
 end
 
+local function getAuraCache()
+    if auraCacheModule and auraCacheModule.GetUnit then
+        return auraCacheModule
+    end
+    local ns = NODHeal
+    if ns and ns.GetModule then
+        local module = ns:GetModule("AuraCache")
+        if module and module.GetUnit then
+            auraCacheModule = module
+            return auraCacheModule
+        end
+    end
+    return nil
+end
+
+-- Per-frame scratch lists: entries are reused across refreshes instead of rebuilt per UNIT_AURA.
+local function frameScratch(frame, key)
+    local scratch = frame[key]
+    if not scratch then
+        scratch = { entries = {}, list = {} }
+        frame[key] = scratch
+    end
+    return scratch
+end
+
+local function acquireEntry(scratch, index)
+    local entry = scratch.entries[index]
+    if not entry then
+        entry = {}
+        scratch.entries[index] = entry
+    end
+    return entry
+end
+
+-- Stable insertion sort on precomputed `score` (own casts first when `ownFirst`); lists are short.
+local function sortByScore(list, count, ownFirst)
+    for i = 2, count do
+        local entry = list[i]
+        local j = i - 1
+        while j >= 1 do
+            local other = list[j]
+            local before
+            if ownFirst and entry.own ~= other.own then
+                before = entry.own
+            else
+                before = entry.score > other.score
+            end
+            if not before then
+                break
+            end
+            list[j + 1] = other
+            j = j - 1
+        end
+        list[j + 1] = entry
+    end
+end
+
+local function getRosterIndex()
+    if rosterModule and rosterModule.GetSorted then
+        return rosterModule
+    end
+    local ns = NODHeal
+    if ns and ns.GetModule then
+        local module = ns:GetModule("RosterIndex")
+        if module and module.GetSorted then
+            rosterModule = module
+            return rosterModule
+        end
+    end
+    return nil
+end
+
+local function unitGUID(unit)
+    local roster = getRosterIndex()
+    if roster then
+        return roster.GetGUID(unit)
+    end
+    return UnitGUID and UnitGUID(unit)
+end
+
 local function getDeathModule()
     if DeathAuthority and DeathAuthority.GetState then
         return DeathAuthority
@@ -586,59 +686,50 @@ local function scoreHot(entry)
     return (expected * confidence) + selfBonus + stackBonus
 end
 
-local function collectHotAuras(unit)
+local function collectHotAuras(frame, unit)
     local iconsCfg = (cfg and cfg.icons) or {}
-    local own, other = {}, {}
-    local now = GetTime()
-    for i = 1, 40 do
-        local name, icon, count, _, duration, expirationTime, unitCaster, _, _, spellId = UnitAura(unit, i, "HELPFUL")
-        if not name then
-            break
-        end
-        if icon and isHotSpell(spellId) then
-            local remain = (expirationTime or 0) - now
-            local stacks = count or 0
-            local confidence = getHotConfidence(spellId)
-            if confidence > 0 then
-                local expected = estimateHotValue(spellId, remain, stacks)
-                local entry = {
-                    icon = icon,
-                    remain = remain,
-                    spellId = spellId,
-                    own = unitCaster and (UnitIsUnit(unitCaster, "player") or UnitIsUnit(unitCaster, "pet")),
-                    stacks = stacks,
-                    confidence = confidence,
-                    expected = expected,
-                    duration = duration or 0,
-                    expiration = expirationTime or 0,
-                }
-                if entry.own then
-                    tinsert(own, entry)
-                else
-                    tinsert(other, entry)
+    local scratch = frameScratch(frame, "_nod_hotScratch")
+    local list = scratch.list
+    local count = 0
+    local cache = getAuraCache()
+    local snapshot = cache and cache.GetUnit(unit)
+    if snapshot then
+        local now = GetTime()
+        local helpful = snapshot.helpful
+        for i = 1, #helpful do
+            local aura = helpful[i]
+            local spellId = aura.spellId
+            if aura.icon and isHotSpell(spellId) then
+                local remain = aura.expirationTime - now
+                local stacks = aura.applications
+                local confidence = getHotConfidence(spellId)
+                if confidence > 0 then
+                    count = count + 1
+                    local entry = acquireEntry(scratch, count)
+                    entry.icon = aura.icon
+                    entry.remain = remain
+                    entry.spellId = spellId
+                    entry.own = aura.own
+                    entry.stacks = stacks
+                    entry.confidence = confidence
+                    entry.expected = estimateHotValue(spellId, remain, stacks)
+                    entry.duration = aura.duration
+                    entry.expiration = aura.expirationTime
+                    entry.score = scoreHot(entry)
+                    list[count] = entry
                 end
             end
         end
     end
-    table.sort(own, function(a, b)
-        return scoreHot(a) > scoreHot(b)
-    end)
-    table.sort(other, function(a, b)
-        return scoreHot(a) > scoreHot(b)
-    end)
-    local res = {}
+    sortByScore(list, count, true)
     local maxN = safeGet(iconsCfg, "hotMax", 12)
-    for _, e in ipairs(own) do
-        if #res < maxN then
-            tinsert(res, e)
-        end
+    if count > maxN then
+        count = maxN
     end
-    for _, e in ipairs(other) do
-        if #res < maxN then
-            tinsert(res, e)
-        end
+    for i = #list, count + 1, -1 do
+        list[i] = nil
     end
-    return res
+    return list
 end
 
 local function layoutHotIcons(frame, list)
@@ -710,6 +801,19 @@ local function layoutHotIcons(frame, list)
     frame.hotCont:SetSize(width, height)
 end
 
+-- Equal-priority tie-break: an icon beats none, then the earliest applied (lowest auraInstanceID).
+-- AuraCache appends incrementally added auras, so list position is not the aura index order.
+local function preferDebuff(aura, best)
+    if not best.icon then
+        return aura.icon ~= nil
+    end
+    if not aura.icon then
+        return false
+    end
+    local instance, bestInstance = aura.auraInstanceID, best.auraInstanceID
+    return instance ~= nil and bestInstance ~= nil and instance < bestInstance
+end
+
 local function pickDebuffIcon(unit)
     if not unit then
         return nil
@@ -717,23 +821,22 @@ local function pickDebuffIcon(unit)
 
     local iconsCfg = (cfg and cfg.icons) or {}
     local priorityList = iconsCfg.debuffPrio
-    local bestTexture
+    local best
     local bestPriority
 
-    for index = 1, 40 do
-        local name, iconTexture, _, dispelType, _, _, _, _, _, spellId = UnitDebuff(unit, index)
-        if not name then
-            break
-        end
-
-        local priority = getDebuffPriority(priorityList, name, spellId)
-        if not bestPriority or priority > bestPriority or (priority == bestPriority and not bestTexture) then
+    local cache = getAuraCache()
+    local snapshot = cache and cache.GetUnit(unit)
+    local harmful = snapshot and snapshot.harmful or EMPTY_LIST
+    for index = 1, #harmful do
+        local aura = harmful[index]
+        local priority = getDebuffPriority(priorityList, aura.name, aura.spellId)
+        if not best or priority > bestPriority or (priority == bestPriority and preferDebuff(aura, best)) then
             bestPriority = priority
-            bestTexture = iconTexture
+            best = aura
         end
     end
 
-    return bestTexture
+    return best and best.icon
 end
 
 local function scoreMajor(entry)
@@ -776,46 +879,47 @@ local function collectMajorAuras(frame, unit)
         return {}
     end
     getConfig()
-    local list = {}
+    local scratch = frameScratch(frame, "_nod_majorScratch")
+    local list = scratch.list
+    local count = 0
+    local cache = getAuraCache()
+    local snapshot = cache and cache.GetUnit(unit)
+    local helpful = snapshot and snapshot.helpful or EMPTY_LIST
     local now = GetTime()
-    for i = 1, 40 do
-        local name, icon, count, _, duration, expirationTime, caster, _, _, spellId = UnitAura(unit, i, "HELPFUL")
-        if not name then
-            break
-        end
-        local class, confidence = CooldownClassifier.Classify and CooldownClassifier.Classify(spellId)
+    for i = 1, #helpful do
+        local aura = helpful[i]
+        local class, confidence = CooldownClassifier.Classify(aura.spellId)
         if class and confidence and confidence > 0 then
-            local remain = (expirationTime or 0) - now
+            local remain = aura.expirationTime - now
             if remain > 0 then
-                local entry = {
-                    name = name,
-                    spellId = spellId,
-                    icon = icon,
-                    class = class,
-                    confidence = confidence,
-                    remain = remain,
-                    duration = duration or 0,
-                    expiration = expirationTime or 0,
-                    stacks = count or 0,
-                    caster = caster,
-                    estimated = 0,
-                }
+                count = count + 1
+                local entry = acquireEntry(scratch, count)
+                entry.name = aura.name
+                entry.spellId = aura.spellId
+                entry.icon = aura.icon
+                entry.class = class
+                entry.confidence = confidence
+                entry.remain = remain
+                entry.duration = aura.duration
+                entry.expiration = aura.expirationTime
+                entry.stacks = aura.applications
+                entry.caster = aura.sourceUnit
+                entry.estimated = 0
                 if CooldownClassifier.EstimateMitigation then
                     local estimate = CooldownClassifier.EstimateMitigation(unit, entry)
                     if estimate and estimate > 0 then
                         entry.estimated = estimate
                     end
                 end
-                list[#list + 1] = entry
+                entry.score = scoreMajor(entry)
+                list[count] = entry
             end
         end
     end
-    for _, entry in ipairs(list) do
-        entry.score = scoreMajor(entry)
+    for i = #list, count + 1, -1 do
+        list[i] = nil
     end
-    table.sort(list, function(a, b)
-        return (a.score or 0) > (b.score or 0)
-    end)
+    sortByScore(list, count, false)
     return list
 end
 
@@ -987,7 +1091,7 @@ local function updateAuraIcons(frame)
     end
 
     if enabled and safeGet(iconsCfg, "hotEnabled", true) and frame.hotTex then
-        local list = collectHotAuras(frame.unit)
+        local list = collectHotAuras(frame, frame.unit)
         layoutHotIcons(frame, list)
     elseif frame.hotTex then
         for i = 1, 12 do
@@ -1110,125 +1214,20 @@ local function isConfigEnabled(key, defaultValue)
     return value and true or false
 end
 
-local function getUnits()
-    local list = {}
-
-    if IsInRaid() then
-        for i = 1, GetNumGroupMembers() do
-            local unit = "raid" .. i
-            if UnitExists(unit) then
-                table.insert(list, unit)
-            end
-        end
-    elseif IsInGroup() then
-        for i = 1, GetNumGroupMembers() - 1 do
-            local unit = "party" .. i
-            if UnitExists(unit) then
-                table.insert(list, unit)
-            end
-        end
-        table.insert(list, "player")
-    else
-        table.insert(list, "player")
-    end
-
-    return list
-end
-
-local ROLE_ORDER = {
-    TANK = 1,
-    HEALER = 2,
-    DAMAGER = 3,
-    NONE = 4,
-}
-
-local function getRoleWeight(unit)
-    if not UnitGroupRolesAssigned then
-        return ROLE_ORDER.NONE
-    end
-    local role = UnitGroupRolesAssigned(unit)
-    return ROLE_ORDER[role or "NONE"] or ROLE_ORDER.NONE
-end
-
-local function getGroupWeight(unit)
-    if not unit then
-        return 9000
-    end
-
-    if UnitInRaid then
-        local raidIndex = UnitInRaid(unit)
-        if raidIndex then
-            local subgroup = 0
-            if GetRaidRosterInfo then
-                local _, _, groupId = GetRaidRosterInfo(raidIndex)
-                subgroup = groupId or subgroup
-            end
-            if subgroup and subgroup > 0 then
-                return subgroup * 100 + raidIndex
-            end
-            return 500 + raidIndex
-        end
-    end
-
-    if UnitInParty then
-        local partyIndex = UnitInParty(unit)
-        if partyIndex then
-            return 1000 + partyIndex
-        end
-    end
-
-    if unit == "player" then
-        return 1010
-    end
-
-    return 9000
-end
-
-local function sortUnits(roster)
-    local list = {}
-    if type(roster) == "table" then
-        for index = 1, #roster do
-            list[index] = roster[index]
-        end
-    end
+local PLAYER_ONLY = { "player" }
 
+-- Display order comes pre-sorted from RosterIndex, which sorts once per roster change.
+local function getSortedUnits()
     local config = cfg or getConfig()
     local mode = (config and config.sortMode) or "group"
     if mode == "class" then
         mode = "role"
     end
-
-    if mode == "alpha" then
-        table.sort(list, function(a, b)
-            local nameA = UnitName(a) or ""
-            local nameB = UnitName(b) or ""
-            return nameA < nameB
-        end)
-    elseif mode == "role" then
-        table.sort(list, function(a, b)
-            local weightA = getRoleWeight(a)
-            local weightB = getRoleWeight(b)
-            if weightA == weightB then
-                local nameA = UnitName(a) or ""
-                local nameB = UnitName(b) or ""
-                return nameA < nameB
-            end
-            return weightA < weightB
-        end)
-    else
-        table.sort(list, function(a, b)
-            local groupA = getGroupWeight(a)
-            local groupB = getGroupWeight(b)
-            if groupA == groupB then
-                local nameA = UnitName(a) or ""
-                local nameB = UnitName(b) or ""
-                return nameA < nameB
-            end
-            return groupA < groupB
-        end)
+    local roster = getRosterIndex()
+    if roster then
+        return roster.GetSorted(mode)
     end
-
-    return list
+    return PLAYER_ONLY
 end
 
 local function addFeedback(message)
@@ -1426,10 +1425,92 @@ local function createUnitFrame(parent, unit, index)
     return frame
 end
 
-local function updateUnitFrame(frame, elapsed)
+-- Moves the bar a quarter of the way to the last computed target and sizes the overlays.
+-- Returns true once the bar has reached its target.
+local function paintBars(frame)
+    local healable = frame._nod_healable
+    local cur = frame._nod_cur or 0
+    local max = frame._nod_max or 1
+    local incomingGain = frame._nod_incoming or 0
+    local overheal = frame._nod_overheal or 0
+    local targetPct = frame._nod_targetPct or 0
+    local settled = true
+
+    if healable then
+        frame._lastPct = frame._lastPct or (cur / max)
+        local diff = targetPct - frame._lastPct
+        if diff > SETTLE_EPSILON or diff < -SETTLE_EPSILON then
+            frame._lastPct = frame._lastPct + diff * 0.25
+            settled = false
+        else
+            frame._lastPct = targetPct
+        end
+        if frame._lastPct < 0 then
+            frame._lastPct = 0
+        elseif frame._lastPct > 1 then
+            frame._lastPct = 1
+        end
+    else
+        frame._lastPct = 0
+    end
+
+    local frameWidth = frame:GetWidth() - 2
+    if frameWidth < 0 then
+        frameWidth = 0
+    end
+
+    frame.health:SetWidth(frameWidth * (frame._lastPct or 0))
+    frame.health:SetHeight(FRAME_HEIGHT - 2)
+
+    if healable and isConfigEnabled("showIncoming", true) then
+        local incPct = math.min((cur + incomingGain) / max, 1)
+        local incWidth = frameWidth * incPct
+        local healthWidth = frame.health:GetWidth()
+        local overlayWidth = incWidth - healthWidth
+        if overlayWidth > 0 then
+            frame.incoming:SetHeight(FRAME_HEIGHT - 2)
+            frame.incoming:SetWidth(overlayWidth)
+            frame.incoming:SetColorTexture(0, 1, 0.3, 0.4)
+            frame.incoming:Show()
+        else
+            frame.incoming:SetWidth(0)
+            frame.incoming:Hide()
+        end
+    else
+        frame.incoming:SetWidth(0)
+        frame.incoming:Hide()
+    end
+
+    if healable and isConfigEnabled("showOverheal", true) and overheal > 0 then
+        local overWidth = frameWidth * (overheal / max)
+        if overWidth < 0 then
+            overWidth = 0
+        end
+
+        if not frame.overheal then
+            frame.overheal = frame:CreateTexture(nil, "OVERLAY")
+            frame.overheal:SetPoint("LEFT", frame, "LEFT", frame:GetWidth(), 0)
+            frame.overheal:SetHeight(FRAME_HEIGHT - 2)
+        end
+
+        frame.overheal:SetColorTexture(0.8, 1, 0.8, 0.3)
+        frame.overheal:SetWidth(overWidth)
+        frame.overheal:Show()
+    elseif frame.overheal then
+        frame.overheal:Hide()
+    end
+
+    frame._nod_animating = not settled
+    return settled
+end
+
+-- `batchIndex` is the frame's slot in the batch arrays when sharedTick already projected it.
+local function updateUnitFrame(frame, elapsed, batchIndex)
     if not frame or type(frame.unit) ~= "string" or not UnitExists(frame.unit) then
         if frame then
             frame._lastPct = nil
+            frame._nod_busy = nil
+            frame._nod_animating = nil
             if frame.hotTex then
                 for i = 1, 12 do
                     local tex = frame.hotTex[i]
@@ -1505,12 +1586,28 @@ local function updateUnitFrame(frame, elapsed)
     local incomingGain = 0
     local overheal = 0
 
-    local solverResult
-    if healable and not isFrozen then
+    local hasProjection = false
+    local resultNow, resultMax, resultProjected, resultOverheal
+    local casting = false
+    if healable and not isFrozen and batchIndex then
+        local telemetry = NODHeal and NODHeal.Telemetry
+        if telemetry and telemetry.Increment then
+            telemetry:Increment("solverCalls")
+        end
+        casting = batchLand[batchIndex] ~= nil
+        resultProjected = batchOut.projected[batchIndex]
+        if resultProjected then
+            hasProjection = true
+            resultNow = batchOut.hpNow[batchIndex]
+            resultMax = batchOut.hpMax[batchIndex]
+            resultOverheal = batchOut.overheal[batchIndex]
+        end
+    elseif healable and not isFrozen then
         local solver = getSolverModule()
         if solver and solver.CalculateProjectedHealth then
             local opts
             local tLand, spellID = computeLandingForUnit(frame.unit)
+            casting = tLand ~= nil
             if tLand or spellID then
                 opts = {}
                 if tLand then
@@ -1533,18 +1630,20 @@ local function updateUnitFrame(frame, elapsed)
             end
 
             if ok and type(result) == "table" then
-                solverResult = result
+                hasProjection = true
+                resultNow = result.hp_now
+                resultMax = result.hp_max
+                resultProjected = result.projectedHealth or result.hp_proj
+                resultOverheal = result.overheal
             end
         end
     end
 
-    if solverResult then
-        local resultMax = solverResult.hp_max
+    if hasProjection then
         if type(resultMax) == "number" and resultMax > 0 then
             max = resultMax
         end
 
-        local resultNow = solverResult.hp_now
         if type(resultNow) == "number" then
             cur = resultNow
             if cur < 0 then
@@ -1554,14 +1653,21 @@ local function updateUnitFrame(frame, elapsed)
             end
         end
 
-        projectedHP = solverResult.projectedHealth or solverResult.hp_proj or cur
+        projectedHP = resultProjected or cur
+        if projectedHP <= 0 and cur > 0 then
+            -- Predicted to die before the heal lands: tick the grid and solver at the urgent rate.
+            local dispatcher = getDispatcher()
+            if dispatcher and dispatcher.RequestUrgentTicks then
+                dispatcher.RequestUrgentTicks()
+            end
+        end
         if projectedHP < cur then
             projectedHP = cur
         elseif projectedHP > max then
             projectedHP = max
         end
 
-        overheal = math.max(solverResult.overheal or 0, 0)
+        overheal = math.max(resultOverheal or 0, 0)
         incomingGain = math.max(projectedHP - cur, 0)
     else
         if healable and UnitGetIncomingHeals then
@@ -1582,18 +1688,14 @@ local function updateUnitFrame(frame, elapsed)
     local pct = max > 0 and (cur / max) or 0
     local targetPct = max > 0 and (targetHP / max) or 0
 
-    if healable then
-        frame._lastPct = frame._lastPct or pct
-        local diff = targetPct - frame._lastPct
-        frame._lastPct = frame._lastPct + diff * 0.25
-        if frame._lastPct < 0 then
-            frame._lastPct = 0
-        elseif frame._lastPct > 1 then
-            frame._lastPct = 1
-        end
-    else
-        frame._lastPct = 0
-    end
+    frame._nod_healable = healable
+    frame._nod_cur = cur
+    frame._nod_max = max
+    frame._nod_incoming = incomingGain
+    frame._nod_overheal = overheal
+    frame._nod_targetPct = targetPct
+    -- In-flight casts and dying units change without an event; keep refreshing them every tick.
+    frame._nod_busy = casting or state == "DYING"
 
     local r, g, b
     if healable then
@@ -1616,52 +1718,7 @@ local function updateUnitFrame(frame, elapsed)
     end
 
     frame.health:SetColorTexture(r, g, b)
-
-    local frameWidth = frame:GetWidth() - 2
-    if frameWidth < 0 then
-        frameWidth = 0
-    end
-
-    frame.health:SetWidth(frameWidth * (frame._lastPct or 0))
-    frame.health:SetHeight(FRAME_HEIGHT - 2)
-
-    if healable and isConfigEnabled("showIncoming", true) then
-        local incPct = math.min((cur + incomingGain) / max, 1)
-        local incWidth = frameWidth * incPct
-        local healthWidth = frame.health:GetWidth()
-        local overlayWidth = incWidth - healthWidth
-        if overlayWidth > 0 then
-            frame.incoming:SetHeight(FRAME_HEIGHT - 2)
-            frame.incoming:SetWidth(overlayWidth)
-            frame.incoming:SetColorTexture(0, 1, 0.3, 0.4)
-            frame.incoming:Show()
-        else
-            frame.incoming:SetWidth(0)
-            frame.incoming:Hide()
-        end
-    else
-        frame.incoming:SetWidth(0)
-        frame.incoming:Hide()
-    end
-
-    if healable and isConfigEnabled("showOverheal", true) and overheal > 0 then
-        local overWidth = frameWidth * (overheal / max)
-        if overWidth < 0 then
-            overWidth = 0
-        end
-
-        if not frame.overheal then
-            frame.overheal = frame:CreateTexture(nil, "OVERLAY")
-            frame.overheal:SetPoint("LEFT", frame, "LEFT", frame:GetWidth(), 0)
-            frame.overheal:SetHeight(FRAME_HEIGHT - 2)
-        end
-
-        frame.overheal:SetColorTexture(0.8, 1, 0.8, 0.3)
-        frame.overheal:SetWidth(overWidth)
-        frame.overheal:Show()
-    elseif frame.overheal then
-        frame.overheal:Hide()
-    end
+    paintBars(frame)
 
     frame.name:SetText(UnitName(frame.unit) or "???")
 
@@ -1719,8 +1776,7 @@ local function performRebuild(host)
     end
 
     cfg = getConfig()
-    local roster = getUnits()
-    local sortedUnits = sortUnits(roster)
+    local sortedUnits = getSortedUnits()
     addFeedback("Rebuilding Grid Layout (Sorted)")
 
     local cols = cfg.columns
@@ -1773,6 +1829,10 @@ local function performRebuild(host)
         host:RegisterForDrag("LeftButton")
     end
 
+    wipeTable(frameByUnit)
+    wipeTable(frameByGUID)
+    wipeTable(dirtyFrames)
+
     local total = #sortedUnits
     if total == 0 then
         for _, frame in ipairs(unitFrames) do
@@ -1801,6 +1861,11 @@ local function performRebuild(host)
         end
 
     frame.unit = unit
+        frameByUnit[unit] = frame
+        local guid = unitGUID(unit)
+        if guid then
+            frameByGUID[guid] = frame
+        end
         if NODHeal and NODHeal.ClickCast and NODHeal.ClickCast.SetFrameUnit then
             NODHeal.ClickCast:SetFrameUnit(frame, unit)
         end
@@ -1874,20 +1939,113 @@ local function rebuildGrid()
     performRebuild(host)
 end
 
-local function updateAllFrames()
-    for index = 1, #unitFrames do
-        local frame = unitFrames[index]
-        if frame then
-            updateUnitFrame(frame)
+local function markUnitDirty(unit)
+    if type(unit) ~= "string" then
+        for index = 1, #unitFrames do
+            local frame = unitFrames[index]
+            if frame and frame.unit then
+                dirtyFrames[frame] = true
+            end
         end
+        return
+    end
+    local frame = frameByUnit[unit]
+    if frame then
+        dirtyFrames[frame] = true
+    end
+end
+
+local function markGUIDDirty(_, guid)
+    local frame = guid and frameByGUID[guid]
+    if frame then
+        dirtyFrames[frame] = true
+    end
+end
+
+local function tickBudgetMs()
+    local budget = getConfig().gridTickBudgetMs
+    if type(budget) == "number" then
+        return budget
+    end
+    return GRID_TICK_BUDGET_MS
+end
+
+local function healthFraction(frame)
+    local unit = frame.unit
+    local max = UnitHealthMax(unit) or 0
+    if max <= 0 then
+        return 1
     end
+    return (UnitHealth(unit) or 0) / max
+end
+
+-- Projects queue[first..last] in one solver pass; false leaves each frame to project itself.
+local function projectQueue(queue, first, last)
+    local solver = getSolverModule()
+    if not solver or not solver.CalculateProjectedHealthBatch then
+        return false
+    end
+    local count = last - first + 1
+    for index = 1, count do
+        local unit = queue[first + index - 1].unit
+        batchUnits[index] = unit
+        batchLand[index], batchSpell[index] = computeLandingForUnit(unit)
+    end
+    for index = count + 1, #batchUnits do
+        batchUnits[index] = nil
+        batchLand[index] = nil
+        batchSpell[index] = nil
+    end
+    return (pcall(solver.CalculateProjectedHealthBatch, batchUnits, batchLand, batchOut, count, batchSpell))
 end
 
 local function sharedTick()
+    tickSerial = tickSerial + 1
+    local queue = tickQueue
+    local count = 0
     for index = 1, #unitFrames do
         local frame = unitFrames[index]
-        if frame then
-            updateUnitFrame(frame, GRID_TICK_INTERVAL)
+        if frame and frame.unit and (dirtyFrames[frame] or frame._nod_busy) then
+            -- Insertion by health fraction: lowest HP is refreshed first.
+            local fraction = healthFraction(frame)
+            frame._nod_sortKey = fraction
+            local slot = count + 1
+            while slot > 1 and queue[slot - 1]._nod_sortKey > fraction do
+                queue[slot] = queue[slot - 1]
+                slot = slot - 1
+            end
+            queue[slot] = frame
+            count = count + 1
+        end
+    end
+
+    local budget = tickBudgetMs()
+    local started = debugprofilestop and budget > 0 and debugprofilestop()
+    local batched, chunkFirst, chunkLast = false, 1, 0
+    for index = 1, count do
+        local frame = queue[index]
+        queue[index] = nil
+        -- Frames past the budget stay dirty for the next tick; the first one always runs. Chunks
+        -- are projected as the loop reaches them, so the budget also bounds solver work.
+        if not started or index == 1 or debugprofilestop() - started < budget then
+            if index > chunkLast then
+                chunkFirst = index
+                chunkLast = index + GRID_BATCH_CHUNK - 1
+                if chunkLast > count then
+                    chunkLast = count
+                end
+                batched = projectQueue(queue, chunkFirst, chunkLast)
+            end
+            dirtyFrames[frame] = nil
+            frame._nod_tick = tickSerial
+            updateUnitFrame(frame, GRID_TICK_INTERVAL, batched and index - chunkFirst + 1 or nil)
+        end
+    end
+
+    for index = 1, #unitFrames do
+        local frame = unitFrames[index]
+        if frame and frame._nod_animating and frame._nod_tick ~= tickSerial and frame.unit then
+            paintBars(frame)
         end
     end
 end
@@ -1898,8 +2056,12 @@ local function startTicker()
     end
 
     local dispatcher = getDispatcher()
+    if dispatcher and dispatcher.RegisterHandler then
+        dispatcher.RegisterHandler("NOD_INCOMING_HEAL_RECORDED", markGUIDDirty)
+        dispatcher.RegisterHandler("NOD_INCOMING_SCHEDULE_CHANGED", markGUIDDirty)
+    end
     if dispatcher and dispatcher.RegisterTick then
-        if dispatcher.RegisterTick(sharedTick) then
+        if dispatcher.RegisterTick(sharedTick, { priority = "high", interval = GRID_TICK_INTERVAL }) then
             M._tickerRegistered = true
             return
         end
@@ -1981,6 +2143,34 @@ local function requestRebuild()
     end
 end
 
+local CAST_EVENTS = {
+    "UNIT_SPELLCAST_START",
+    "UNIT_SPELLCAST_STOP",
+    "UNIT_SPELLCAST_FAILED",
+    "UNIT_SPELLCAST_INTERRUPTED",
+    "UNIT_SPELLCAST_DELAYED",
+    "UNIT_SPELLCAST_CHANNEL_START",
+    "UNIT_SPELLCAST_CHANNEL_UPDATE",
+    "UNIT_SPELLCAST_CHANNEL_STOP",
+}
+local CAST_EVENT_SET = {}
+for _, castEvent in ipairs(CAST_EVENTS) do
+    CAST_EVENT_SET[castEvent] = true
+end
+
+-- Unit events besides casts that change what a frame shows: health, max health, absorbs and
+-- UnitGetIncomingHeals (other healers' casts).
+local HEALTH_EVENTS = {
+    "UNIT_HEALTH",
+    "UNIT_MAXHEALTH",
+    "UNIT_ABSORB_AMOUNT_CHANGED",
+    "UNIT_HEAL_PREDICTION",
+}
+local HEALTH_EVENT_SET = {}
+for _, healthEvent in ipairs(HEALTH_EVENTS) do
+    HEALTH_EVENT_SET[healthEvent] = true
+end
+
 local function initialize()
     rebuildGrid()
     M.UpdateAllIconLayout()
@@ -1988,19 +2178,7 @@ local function initialize()
     if not M._deathListenerRegistered then
         local mod = getDeathModule()
         if mod and mod.RegisterListener then
-            mod.RegisterListener(function(unit)
-                if unit == nil then
-                    for _, frame in ipairs(unitFrames) do
-                        updateUnitFrame(frame)
-                    end
-                    return
-                end
-                for _, frame in ipairs(unitFrames) do
-                    if frame.unit == unit then
-                        updateUnitFrame(frame)
-                    end
-                end
-            end)
+            mod.RegisterListener(markUnitDirty)
             M._deathListenerRegistered = true
         end
     end
@@ -2008,40 +2186,63 @@ local function initialize()
         startTicker()
         return
     end
+    local function handleUnitAura(unit)
+        markUnitDirty(unit)
+        if not unit or type(unit) ~= "string" then
+            for _, frame in ipairs(trackedFrames) do
+                requestAuraRefresh(frame)
+            end
+        else
+            for _, frame in ipairs(unitFrames) do
+                if frame.unit == unit then
+                    requestAuraRefresh(frame)
+                end
+            end
+        end
+    end
     local ev = CreateFrame("Frame")
+    -- Through the dispatcher, UNIT_AURA reaches the grid after AuraCache has applied it.
+    local dispatcher = getDispatcher()
+    local auraViaDispatcher = dispatcher and dispatcher.RegisterHandler and true or false
+    if auraViaDispatcher then
+        dispatcher.RegisterHandler("UNIT_AURA", function(_, unit)
+            handleUnitAura(unit)
+        end)
+    end
     ev:RegisterEvent("GROUP_ROSTER_UPDATE")
-    ev:RegisterEvent("UNIT_HEALTH")
+    for _, healthEvent in ipairs(HEALTH_EVENTS) do
+        ev:RegisterEvent(healthEvent)
+    end
     ev:RegisterEvent("UNIT_CONNECTION")
     ev:RegisterEvent("PLAYER_ENTERING_WORLD")
     ev:RegisterEvent("PLAYER_REGEN_ENABLED")
     ev:RegisterEvent("PLAYER_ROLES_ASSIGNED")
-    ev:RegisterEvent("UNIT_AURA")
+    if not auraViaDispatcher then
+        ev:RegisterEvent("UNIT_AURA")
+    end
     ev:RegisterEvent("PLAYER_TARGET_CHANGED")
-    ev:SetScript("OnEvent", function(_, event, unit)
-        if event == "UNIT_HEALTH" then
-            if not unit or type(unit) ~= "string" then
-                updateAllFrames()
-            else
-                for _, frame in ipairs(unitFrames) do
-                    if frame.unit == unit then
-                        updateUnitFrame(frame)
-                    end
-                end
-            end
+    for _, castEvent in ipairs(CAST_EVENTS) do
+        ev:RegisterEvent(castEvent)
+    end
+    ev:SetScript("OnEvent", function(_, event, unit, info)
+        if HEALTH_EVENT_SET[event] or CAST_EVENT_SET[event] then
+            markUnitDirty(unit)
         elseif event == "UNIT_AURA" then
-            if not unit or type(unit) ~= "string" then
-                for _, frame in ipairs(trackedFrames) do
-                    requestAuraRefresh(frame)
-                end
-            else
-                for _, frame in ipairs(unitFrames) do
-                    if frame.unit == unit then
-                        requestAuraRefresh(frame)
-                    end
-                end
+            -- No dispatcher means AuraCache was never initialized; keep it current from here.
+            local cache = getAuraCache()
+            if cache and cache.Invalidate then
+                cache.Invalidate(unit, info)
+            end
+            handleUnitAura(unit)
+        elseif event == "PLAYER_ENTERING_WORLD" or event == "GROUP_ROSTER_UPDATE" or event == "PLAYER_ROLES_ASSIGNED" then
+            -- This frame may see the event before the dispatcher does; never lay out a stale roster.
+            local roster = getRosterIndex()
+            if roster then
+                roster.MarkDirty()
+            end
+            if event ~= "PLAYER_ROLES_ASSIGNED" then
+                refreshAllIconState()
             end
-        elseif event == "PLAYER_ENTERING_WORLD" or event == "GROUP_ROSTER_UPDATE" then
-            refreshAllIconState()
             requestRebuild()
         elseif event == "PLAYER_TARGET_CHANGED" then
             refreshAllIconState()
@@ -31,6 +31,14 @@ local solverModule
 local landingModule
 local desyncModule
 
+-- refreshAll projects every shown frame with one CalculateProjectedHealthBatch call; the
+-- CompactUnitFrame_UpdateHealth hooks it triggers read their frame's slot instead of the solver.
+local batchUnits = {}
+local batchLand = {}
+local batchSpell = {}
+local batchOut = { projected = {}, overheal = {}, confidence = {}, hpNow = {}, hpMax = {} }
+local batchSlot = {} -- [frame] = index while refreshAll runs
+
 local function getSolverModule()
     if solverModule and solverModule.CalculateProjectedHealth then
         return solverModule
@@ -209,7 +217,14 @@ local function fetchIncoming(unit, guid, horizon)
     return incoming or 0
 end
 
-local function computeSolverProjection(unit)
+local function countSolverCall()
+    local telemetry = NODHeal and NODHeal.Telemetry
+    if telemetry and telemetry.Increment then
+        telemetry:Increment("solverCalls")
+    end
+end
+
+local function fetchProjection(unit)
     local solver = getSolverModule()
     if not solver or not solver.CalculateProjectedHealth then
         return nil
@@ -227,10 +242,7 @@ local function computeSolverProjection(unit)
         end
     end
 
-    local telemetry = NODHeal and NODHeal.Telemetry
-    if telemetry and telemetry.Increment then
-        telemetry:Increment("solverCalls")
-    end
+    countSolverCall()
     local ok, result
     if opts then
         ok, result = pcall(solver.CalculateProjectedHealth, unit, opts)
@@ -241,13 +253,30 @@ local function computeSolverProjection(unit)
     if not ok or type(result) ~= "table" then
         return nil
     end
+    return result.hp_now, result.hp_max, result.projectedHealth or result.hp_proj, result.overheal
+end
+
+-- `slot` is the frame's index in the batch arrays while refreshAll runs.
+local function computeSolverProjection(unit, slot)
+    local hpNow, hpMax, projected, overheal
+    if slot then
+        countSolverCall()
+        projected = batchOut.projected[slot]
+        if not projected then
+            return nil
+        end
+        hpNow, hpMax, overheal = batchOut.hpNow[slot], batchOut.hpMax[slot], batchOut.overheal[slot]
+    else
+        hpNow, hpMax, projected, overheal = fetchProjection(unit)
+        if not projected then
+            return nil
+        end
+    end
 
-    local hpNow = result.hp_now
     if type(hpNow) ~= "number" then
         hpNow = UnitHealth and UnitHealth(unit) or 0
     end
 
-    local hpMax = result.hp_max
     if type(hpMax) ~= "number" or hpMax <= 0 then
         hpMax = UnitHealthMax and UnitHealthMax(unit) or 1
     end
@@ -262,7 +291,6 @@ local function computeSolverProjection(unit)
         hpNow = hpMax
     end
 
-    local projected = result.projectedHealth or result.hp_proj or hpNow
     if projected < hpNow then
         projected = hpNow
     elseif projected > hpMax then
@@ -270,7 +298,7 @@ local function computeSolverProjection(unit)
     end
 
     local gain = projected - hpNow
-    local overheal = math.max(result.overheal or 0, 0)
+    overheal = math.max(overheal or 0, 0)
 
     if gain <= 0 and overheal <= 0 then
         return nil
@@ -302,7 +330,41 @@ local function showProjection(frame, hb, cur, incoming, max)
     tex:Show()
 end
 
+-- Fills batchSlot for the shown overlay frames from one solver pass; frames left out project
+-- themselves in the hook.
+local function projectShownFrames()
+    local solver = getSolverModule()
+    if not solver or not solver.CalculateProjectedHealthBatch then
+        return
+    end
+
+    local count = 0
+    for frame in pairs(UI.barByFrame) do
+        local unit = frame and frame.unit
+        if unit and frame:IsShown() and UnitExists(unit) then
+            count = count + 1
+            batchUnits[count] = unit
+            batchLand[count], batchSpell[count] = computeLandingForUnit(unit)
+            batchSlot[frame] = count
+        end
+    end
+    for index = count + 1, #batchUnits do
+        batchUnits[index] = nil
+        batchLand[index] = nil
+        batchSpell[index] = nil
+    end
+
+    if count == 0 or not pcall(solver.CalculateProjectedHealthBatch, batchUnits, batchLand, batchOut, count, batchSpell) then
+        for frame in pairs(batchSlot) do
+            batchSlot[frame] = nil
+        end
+    end
+end
+
 local function refreshAll()
+    if isOverlayEnabled() then
+        projectShownFrames()
+    end
     for frame in pairs(UI.barByFrame) do
         if frame and frame.unit then
             if isOverlayEnabled() and frame:IsShown() then
@@ -315,6 +377,9 @@ local function refreshAll()
             end
         end
     end
+    for frame in pairs(batchSlot) do
+        batchSlot[frame] = nil
+    end
 end
 
 secureHook("CompactUnitFrame_UpdateHealth", function(frame)
@@ -350,7 +415,7 @@ secureHook("CompactUnitFrame_UpdateHealth", function(frame)
         return
     end
 
-    local solverCur, solverGain, solverMax = computeSolverProjection(frame.unit)
+    local solverCur, solverGain, solverMax = computeSolverProjection(frame.unit, batchSlot[frame])
     local gain = 0
 
     if solverCur then
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Minimal chunked columnar file format for replay output (stdlib only).
+
+Layout: ``MAGIC``, then zlib-compressed little-endian column chunks grouped in
+row groups, then a JSON footer (schema, chunk offsets, metadata), its byte
+length as a little-endian u64, and ``MAGIC`` again. Readers seek to the
+footer, so writers can stream row groups without knowing the row count.
+"""
+from __future__ import annotations
+
+import array
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+MAGIC = b'NODCOL1\x00'
+FORMAT_VERSION = 1
+ROW_GROUP_ROWS = 1 << 16
+_TRAILER = struct.Struct('<Q')
+_SWAP = sys.byteorder != 'little'
+
+Schema = Sequence[Tuple[str, str]]
+
+
+def _encode(values: array.array) -> bytes:
+    if _SWAP:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return zlib.compress(values.tobytes(), 1)
+
+
+def _decode(typecode: str, payload: bytes) -> array.array:
+    values = array.array(typecode)
+    values.frombytes(zlib.decompress(payload))
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+class ColumnWriter:
+    """Append rows column-wise; every ``ROW_GROUP_ROWS`` rows become one compressed row group.
+
+    ``schema`` pairs column names with :mod:`array` typecodes (``'d'``, ``'f'``, ``'i'``, ``'H'``, ...).
+    """
+
+    def __init__(self, path: Path, schema: Schema, row_group_rows: int = ROW_GROUP_ROWS) -> None:
+        self.path = Path(path)
+        self.schema = list(schema)
+        self.row_group_rows = row_group_rows
+        self._buffers = {name: array.array(typecode) for name, typecode in self.schema}
+        self._groups: List[dict] = []
+        self._rows = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: Optional[BinaryIO] = open(self.path, 'wb')
+        self._handle.write(MAGIC)
+
+    def __enter__(self) -> 'ColumnWriter':
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._handle:
+            self._handle.close()
+            self._handle = None
+
+    @property
+    def rows(self) -> int:
+        return self._rows + len(self._buffers[self.schema[0][0]])
+
+    def extend(self, columns: Mapping[str, Iterable[float]]) -> None:
+        """Append equally long sequences, one per schema column."""
+        for name, _ in self.schema:
+            self._buffers[name].extend(columns[name])
+        if len(self._buffers[self.schema[0][0]]) >= self.row_group_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        count = len(self._buffers[self.schema[0][0]])
+        if not count:
+            return
+        assert self._handle is not None
+        chunks = []
+        for name, typecode in self.schema:
+            values = self._buffers[name]
+            if len(values) != count:
+                raise ValueError(f'column {name!r} has {len(values)} rows, expected {count}')
+            payload = _encode(values)
+            chunks.append([self._handle.tell(), len(payload)])
+            self._handle.write(payload)
+            self._buffers[name] = array.array(typecode)
+        self._groups.append({'rows': count, 'chunks': chunks})
+        self._rows += count
+
+    def close(self, meta: Optional[dict] = None) -> None:
+        if self._handle is None:
+            return
+        self._flush()
+        footer = json.dumps({
+            'version': FORMAT_VERSION,
+            'columns': [[name, typecode] for name, typecode in self.schema],
+            'row_groups': self._groups,
+            'rows': self._rows,
+            'meta': meta or {},
+        }, separators=(',', ':')).encode('utf-8')
+        self._handle.write(footer)
+        self._handle.write(_TRAILER.pack(len(footer)))
+        self._handle.write(MAGIC)
+        self._handle.close()
+        self._handle = None
+
+
+def is_columnar(path: Path) -> bool:
+    """True when ``path`` starts with ``MAGIC``, whatever its name."""
+    with open(path, 'rb') as handle:
+        return handle.read(len(MAGIC)) == MAGIC
+
+
+def read_footer(handle: BinaryIO) -> dict:
+    handle.seek(0)
+    if handle.read(len(MAGIC)) != MAGIC:
+        raise ValueError('not a columnar replay file')
+    handle.seek(-(len(MAGIC) + _TRAILER.size), 2)
+    (length,) = _TRAILER.unpack(handle.read(_TRAILER.size))
+    if handle.read(len(MAGIC)) != MAGIC:
+        raise ValueError('truncated columnar replay file (no footer)')
+    handle.seek(-(len(MAGIC) + _TRAILER.size + length), 2)
+    return json.loads(handle.read(length).decode('utf-8'))
+
+
+def read_columns(path: Path, names: Optional[Sequence[str]] = None) -> Tuple[Dict[str, array.array], dict]:
+    """Load whole columns (all of them, or just ``names``) plus the footer metadata."""
+    with open(path, 'rb') as handle:
+        footer = read_footer(handle)
+        schema = [(name, typecode) for name, typecode in footer['columns']]
+        wanted = [(position, name, typecode) for position, (name, typecode) in enumerate(schema)
+                  if names is None or name in names]
+        missing = set(names or ()) - {name for _, name, _ in wanted}
+        if missing:
+            raise KeyError(f'unknown columns: {", ".join(sorted(missing))}')
+        columns = {name: array.array(typecode) for _, name, typecode in wanted}
+        for group in footer['row_groups']:
+            for position, name, typecode in wanted:
+                offset, size = group['chunks'][position]
+                handle.seek(offset)
+                columns[name].extend(_decode(typecode, handle.read(size)))
+    return columns, footer['meta']
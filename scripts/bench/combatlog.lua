@@ -0,0 +1,276 @@
+-- WoWCombatLog.txt line decoder.
+-- Purpose: Turn one log line into the tuple CombatLogGetCurrentEventInfo() returns for it.
+-- Usage: local CombatLog = dofile("scripts/bench/combatlog.lua"); local decoder = CombatLog.new()
+--        local kind, epoch = decoder:decode(line)  -- kind: "cleu", "encounter_start", ...; fields in decoder.record
+-- Note: Log lines differ from the API tuple: there is no hideCaster, advanced-logging lines carry a unit
+--       info block (GUID, HP, power, position, ...), and damage/heal suffixes log an extra base amount.
+
+local tonumber = tonumber
+local find = string.find
+local sub = string.sub
+local byte = string.byte
+local match = string.match
+local os_time = os.time
+
+local QUOTE = byte('"')
+local EMPTY_GUID = "0000000000000000"
+-- Advanced unit info block since 9.0: infoGUID, ownerGUID, currentHP, maxHP, attackPower, spellPower,
+-- armor, absorb, powerType, currentPower, maxPower, powerCost, positionX, positionY, uiMapID, facing, level.
+local DEFAULT_ADVANCED_LENGTH = 17
+
+-- Subevents whose log line carries the advanced unit info block (after the prefix parameters).
+local ADVANCED = {
+  SPELL_CAST_SUCCESS = true,
+  SPELL_DAMAGE = true,
+  SPELL_PERIODIC_DAMAGE = true,
+  SPELL_BUILDING_DAMAGE = true,
+  RANGE_DAMAGE = true,
+  SWING_DAMAGE = true,
+  ENVIRONMENTAL_DAMAGE = true,
+  DAMAGE_SPLIT = true,
+  SPELL_HEAL = true,
+  SPELL_PERIODIC_HEAL = true,
+  SPELL_ENERGIZE = true,
+  SPELL_PERIODIC_ENERGIZE = true,
+  SPELL_DRAIN = true,
+  SPELL_PERIODIC_DRAIN = true,
+  SPELL_LEECH = true,
+  SPELL_PERIODIC_LEECH = true,
+}
+
+-- Per subevent: prefix parameter count, API suffix width and the logged-only base amount position.
+local shapes = {}
+
+local function shapeOf(subEvent)
+  local shape = shapes[subEvent]
+  if shape then
+    return shape
+  end
+  local prefix = 3
+  if find(subEvent, "^SWING_") or find(subEvent, "^UNIT_") or subEvent == "PARTY_KILL" then
+    prefix = 0
+  elseif find(subEvent, "^ENVIRONMENTAL_") then
+    prefix = 1
+  end
+  local width, baseAmount = false, false
+  if find(subEvent, "_DAMAGE$") or subEvent == "DAMAGE_SPLIT" or subEvent == "DAMAGE_SHIELD" then
+    width, baseAmount = 10, 2
+  elseif find(subEvent, "_HEAL$") then
+    width, baseAmount = 4, 2
+  end
+  shape = { prefix = prefix, width = width, baseAmount = baseAmount }
+  shapes[subEvent] = shape
+  return shape
+end
+
+-- Lines the client writes that are not combat log events, or that duplicate one.
+local SKIPPED = {
+  ZONE_CHANGE = true,
+  MAP_CHANGE = true,
+  EMOTE = true,
+  WORLD_MARKER_PLACED = true,
+  WORLD_MARKER_REMOVED = true,
+  SWING_DAMAGE_LANDED = true,
+  CHALLENGE_MODE_START = true,
+  CHALLENGE_MODE_END = true,
+  ARENA_MATCH_START = true,
+  ARENA_MATCH_END = true,
+}
+
+-- COMBATANT_INFO: playerGUID, faction, 21 stats, then currentSpecID as the 24th field.
+local COMBATANT_PATTERN = "^([^,]+)" .. string.rep(",[^,]*", 22) .. ",(%d+)"
+
+local function convert(text)
+  if text == "nil" then
+    return nil
+  elseif text == EMPTY_GUID then
+    return ""
+  end
+  local number = tonumber(text)
+  if number ~= nil then
+    return number
+  end
+  return text
+end
+
+local Decoder = {}
+Decoder.__index = Decoder
+
+local M = {}
+
+function M.new(options)
+  options = options or {}
+  return setmetatable({
+    year = options.year or tonumber(os.date("%Y")),
+    -- nil until COMBAT_LOG_VERSION or the first SPELL_CAST_SUCCESS tells us.
+    advanced = nil,
+    advancedLength = DEFAULT_ADVANCED_LENGTH,
+    learned = false,
+    fields = {},
+    fieldCount = 0,
+    record = { n = 0 },
+    -- Unit info from the advanced block of the last decoded event (infoGUID == nil when absent).
+    infoGUID = nil,
+    infoHP = nil,
+    infoMaxHP = nil,
+    combatantGUID = nil,
+    specID = nil,
+    stampKey = nil,
+    stampEpoch = 0,
+  }, Decoder)
+end
+
+-- Split "a,"b,c",d" style CSV into self.fields (quotes stripped); returns the field count.
+function Decoder:split(line, start)
+  local fields = self.fields
+  local count = 0
+  local position = start
+  local length = #line
+  while position <= length do
+    local value
+    if byte(line, position) == QUOTE then
+      local closing = find(line, '"', position + 1, true)
+      if not closing then
+        closing = length + 1
+      end
+      value = sub(line, position + 1, closing - 1)
+      position = closing + 2
+    else
+      local comma = find(line, ",", position, true)
+      if not comma then
+        comma = length + 1
+      end
+      value = convert(sub(line, position, comma - 1))
+      position = comma + 1
+    end
+    count = count + 1
+    fields[count] = value
+  end
+  for index = count + 1, self.fieldCount do
+    fields[index] = nil
+  end
+  self.fieldCount = count
+  return count
+end
+
+-- "10/17/2026 21:03:04.1234-4" (or the older "10/17 21:03:04.123") to epoch seconds.
+function Decoder:parseStamp(stamp)
+  local prefix, fraction = match(stamp, "^(.-)%.(%d+)")
+  if not prefix then
+    prefix, fraction = stamp, "0"
+  end
+  if prefix ~= self.stampKey then
+    local month, day, year, hour, minute, second = match(prefix, "^(%d+)/(%d+)/?(%d*)%s+(%d+):(%d+):(%d+)$")
+    if not month then
+      return nil
+    end
+    year = tonumber(year) or self.year
+    self.stampKey = prefix
+    self.stampEpoch = os_time({
+      year = year, month = tonumber(month), day = tonumber(day),
+      hour = tonumber(hour), min = tonumber(minute), sec = tonumber(second),
+    })
+  end
+  return self.stampEpoch + tonumber(fraction) / 10 ^ #fraction
+end
+
+-- Decode one log line. Returns kind, epoch; kind is "cleu" (tuple in self.record), "encounter_start",
+-- "encounter_end", "combatant" (fields in self.fields) or nil for lines that are skipped.
+function Decoder:decode(line)
+  local separator = find(line, "  ", 1, true)
+  if not separator then
+    return nil
+  end
+  local comma = find(line, ",", separator + 2, true)
+  if not comma then
+    return nil
+  end
+  local subEvent = sub(line, separator + 2, comma - 1)
+
+  if subEvent == "COMBAT_LOG_VERSION" then
+    self.advanced = match(line, "ADVANCED_LOG_ENABLED,(%d)") == "1"
+    return nil
+  elseif subEvent == "COMBATANT_INFO" then
+    -- Only the leading stats are plain CSV; the talent/gear lists after the spec are bracketed.
+    local guid, specID = match(line, COMBATANT_PATTERN, comma + 1)
+    self.combatantGUID = guid
+    self.specID = tonumber(specID)
+    return guid and "combatant" or nil, self:parseStamp(sub(line, 1, separator - 1))
+  elseif SKIPPED[subEvent] or find(subEvent, "_SUPPORT$") then
+    return nil
+  end
+
+  local epoch = self:parseStamp(sub(line, 1, separator - 1))
+  if not epoch then
+    return nil
+  end
+  local count = self:split(line, comma + 1)
+
+  if subEvent == "ENCOUNTER_START" then
+    return "encounter_start", epoch
+  elseif subEvent == "ENCOUNTER_END" then
+    return "encounter_end", epoch
+  end
+  if count < 8 then
+    return nil
+  end
+
+  local fields = self.fields
+  local record = self.record
+  record[1] = epoch
+  record[2] = subEvent
+  record[3] = false
+  for index = 1, 8 do
+    record[index + 3] = fields[index]
+  end
+
+  local shape = shapeOf(subEvent)
+  local size = 11
+  for index = 9, 8 + shape.prefix do
+    size = size + 1
+    record[size] = fields[index]
+  end
+  local suffixStart = 9 + shape.prefix
+
+  self.infoGUID = nil
+  if ADVANCED[subEvent] and self.advanced ~= false then
+    if subEvent == "SPELL_CAST_SUCCESS" and not self.learned then
+      self.advancedLength = count - suffixStart + 1
+      self.advanced = self.advancedLength > 0
+      self.learned = true
+    end
+    local advancedLength = self.advancedLength
+    if advancedLength >= 4 and count >= suffixStart + advancedLength - 1 then
+      self.infoGUID = fields[suffixStart]
+      self.infoHP = fields[suffixStart + 2]
+      self.infoMaxHP = fields[suffixStart + 3]
+      suffixStart = suffixStart + advancedLength
+    end
+  end
+
+  local width = shape.width
+  if width and count - suffixStart + 1 > width then
+    -- Drop the logged-only base amount and anything past what the API returns.
+    local skip = suffixStart + shape.baseAmount - 1
+    for index = suffixStart, suffixStart + width do
+      if index ~= skip then
+        size = size + 1
+        record[size] = fields[index]
+      end
+    end
+  else
+    for index = suffixStart, count do
+      size = size + 1
+      record[size] = fields[index]
+    end
+  end
+
+  for index = size + 1, record.n do
+    record[index] = nil
+  end
+  record.n = size
+  return "cleu", epoch
+end
+
+M.Decoder = Decoder
+return M
@@ -0,0 +1,21 @@
+-- Command-line entry for the Core benchmark on a stock interpreter.
+-- Usage: luajit scripts/bench/core_bench.lua <repo-root> <raid25|raid40> [time|alloc]
+-- Output: one sorted key=value line per metric, parsed by run_core_bench.py.
+
+local root, scenario, mode = arg[1], arg[2], arg[3]
+if not root or not scenario then
+  io.stderr:write("usage: core_bench.lua <repo-root> <scenario> [time|alloc]\n")
+  os.exit(2)
+end
+
+local run = dofile(root .. "/scripts/bench/harness.lua")
+local result = run(root, scenario, mode or "time")
+
+local keys = {}
+for key in pairs(result) do
+  keys[#keys + 1] = key
+end
+table.sort(keys)
+for _, key in ipairs(keys) do
+  io.write(key, "=", tostring(result[key]):gsub("\n", " "), "\n")
+end
@@ -0,0 +1,697 @@
+-- Headless benchmark driver for the Core pipeline.
+-- Purpose: Load Config/ + Core/ in .toc order against wow_stubs.lua and replay a synthetic raid workload.
+-- Usage: local run = dofile("scripts/bench/harness.lua"); local result = run(root, "raid25", "time")
+-- Modes: "time" measures CPU per event/tick with the GC running; "alloc" stops the GC and counts bytes.
+
+local format = string.format
+local floor = math.floor
+local sort = table.sort
+local clock = os.clock
+local collectgarbage = collectgarbage
+
+local TICK = 0.2
+local EPOCH_OFFSET = 1700000000
+local PLAYER_CAST = { spellID = 5185, name = "Healing Touch", castTime = 2.5 }
+
+local SCENARIOS = {
+  raid25 = { size = 25, tanks = 2, healers = 5, duration = 60, seed = 2501 },
+  raid40 = { size = 40, tanks = 3, healers = 8, duration = 60, seed = 4001 },
+  -- Micro scenario: IncomingHealAggregator operations at a fixed queue depth per target.
+  incoming = { size = 40, depths = { 8, 64, 512 }, repeats = 4000, micro = "incoming" },
+  -- Micro scenario: projecting the first `counts` roster units per CalculateProjectedHealth call
+  -- versus one CalculateProjectedHealthBatch call.
+  projection = { size = 40, counts = { 10, 40 }, repeats = 400, micro = "projection" },
+}
+
+local CLASSES = { "PRIEST", "WARRIOR", "DRUID", "MAGE", "SHAMAN", "PALADIN", "MONK", "ROGUE" }
+local DIRECT_HEALS = { 2061, 2060, 8004, 19750, 116694, 5185 }
+local HOTS = {
+  { id = 774, duration = 12, period = 3 },
+  { id = 139, duration = 12, period = 3 },
+  { id = 61295, duration = 15, period = 3 },
+  { id = 115175, duration = 18, period = 2 },
+}
+-- Aura slots 1-4 hold HoTs (one per HOTS entry); slot 5 holds the raid-wide buff.
+local RAID_BUFF_SLOT = 5
+
+-- Park-Miller minimal standard generator: exact in doubles, so every interpreter sees the same workload.
+local function newRandom(seed)
+  local state = seed % 2147483647
+  if state <= 0 then
+    state = state + 2147483646
+  end
+  return function(lower, upper)
+    state = (state * 16807) % 2147483647
+    local unit = state / 2147483647
+    if lower then
+      return lower + floor(unit * (upper - lower + 1))
+    end
+    return unit
+  end
+end
+
+-- Workload --------------------------------------------------------------------
+
+local function cleuRecord(World, time, subEvent, source, dest, ...)
+  local record = {
+    time + World.epochOffset, subEvent, false,
+    source and source.guid or "", source and source.name or "", 0x514, 0,
+    dest.guid, dest.name, 0x514, 0,
+    ...
+  }
+  record.n = 11 + select("#", ...)
+  return record
+end
+
+-- Build the full, time-ordered event list up front so the measured loop only replays it.
+local function buildWorkload(World, scenario)
+  local random = newRandom(scenario.seed)
+  local roster = World.roster
+  local events = {}
+  local sequence = 0
+
+  local function push(time, event)
+    sequence = sequence + 1
+    event.time = time
+    event.sequence = sequence
+    events[#events + 1] = event
+  end
+
+  local function pushCleu(time, subEvent, source, dest, ...)
+    push(time, { cleu = cleuRecord(World, time, subEvent, source, dest, ...) })
+  end
+
+  local function pushHealth(time, unit, delta)
+    push(time, { event = "UNIT_HEALTH", arg = unit.token, unit = unit, delta = delta })
+  end
+
+  local start = World.now
+  local finish = start + scenario.duration
+  local tanks, healers = {}, {}
+  for index = 2, scenario.tanks + 1 do
+    tanks[#tanks + 1] = roster[index]
+  end
+  healers[1] = roster[1]
+  for index = scenario.tanks + 2, scenario.tanks + scenario.healers do
+    healers[#healers + 1] = roster[index]
+  end
+  local boss = { guid = "Creature-0-4184-1136-0-71543-00001", name = "Boss" }
+  local hotUntil = {}
+
+  local window = start
+  while window < finish do
+    -- Raid damage: roughly one hit per member per second, tanks take extra swings.
+    for index = 1, #roster do
+      local unit = roster[index]
+      if random() < TICK then
+        local time = window + random() * TICK
+        local amount = random(4000, 26000)
+        pushCleu(time, "SPELL_DAMAGE", boss, unit, 143412, "Sha Bolt", 32, amount, 0, 32, 0, 0, 0, false, false, false, false)
+        pushHealth(time, unit, -amount)
+      end
+    end
+    for index = 1, #tanks do
+      local unit = tanks[index]
+      if random() < 2 * TICK then
+        local time = window + random() * TICK
+        local amount = random(15000, 45000)
+        pushCleu(time, "SWING_DAMAGE", boss, unit, amount, 0, 1, 0, 0, 0, false, false, false, false)
+        pushHealth(time, unit, -amount)
+      end
+    end
+
+    -- Direct heals from every healer but the player (the player casts below).
+    for index = 2, #healers do
+      local healer = healers[index]
+      if random() < TICK / 1.5 then
+        local time = window + random() * TICK
+        local target = roster[random(1, #roster)]
+        local spellID = DIRECT_HEALS[random(1, #DIRECT_HEALS)]
+        local amount = random(20000, 60000)
+        pushCleu(time, "SPELL_CAST_SUCCESS", healer, target, spellID, "Heal", 2)
+        pushCleu(time, "SPELL_HEAL", healer, target, spellID, "Heal", 2, amount, 0, 0, false)
+        pushHealth(time, target, amount)
+      end
+    end
+
+    -- HoTs: apply/refresh, periodic ticks, and removal, each with the matching UNIT_AURA.
+    for index = 1, #healers do
+      local healer = healers[index]
+      if random() < TICK / 3 then
+        local time = window + random() * TICK
+        local target = roster[random(1, #roster)]
+        local slot = random(1, #HOTS)
+        local hot = HOTS[slot]
+        local key = target.index * 16 + slot
+        local refresh = hotUntil[key] and hotUntil[key] > time
+        hotUntil[key] = time + hot.duration
+        pushCleu(time, refresh and "SPELL_AURA_REFRESH" or "SPELL_AURA_APPLIED", healer, target, hot.id, "HoT", 8, "BUFF")
+        push(time, { event = "UNIT_AURA", arg = target.token, unit = target, aura = slot, spellId = hot.id, duration = hot.duration, source = healer.token })
+        for tick = hot.period, hot.duration, hot.period do
+          local amount = random(6000, 14000)
+          pushCleu(time + tick, "SPELL_PERIODIC_HEAL", healer, target, hot.id, "HoT", 8, amount, 0, 0, false)
+          push(time + tick, { event = "UNIT_HEALTH", arg = target.token, unit = target, delta = amount, hotKey = key, hotEnd = time + hot.duration })
+        end
+        push(time + hot.duration + 0.01, { event = "UNIT_AURA", arg = target.token, unit = target, clearAura = slot, hotKey = key, hotEnd = time + hot.duration })
+      end
+    end
+
+    -- Raid output: hits on the boss and resource gains. Most of a real raid's combat log looks like
+    -- this, and none of it reaches the healing modules.
+    for index = 1, #roster do
+      local unit = roster[index]
+      if random() < 2 * TICK then
+        pushCleu(window + random() * TICK, "SPELL_DAMAGE", unit, boss, 585, "Smite", 2, random(20000, 80000), 0, 2, 0, 0, 0, false, false, false, false)
+      end
+      if random() < TICK then
+        pushCleu(window + random() * TICK, "SPELL_ENERGIZE", unit, unit, 34914, "Vampiric Touch", 32, 1500, 0, 0, 0)
+      end
+    end
+
+    window = window + TICK
+  end
+
+  -- The player hard-casts a heal back to back on a rotating target.
+  local player = healers[1]
+  local castTime = start + 0.1
+  local castIndex = 0
+  while castTime + PLAYER_CAST.castTime < finish do
+    castIndex = castIndex + 1
+    local target = roster[(castIndex % #roster) + 1]
+    local castGUID = format("Cast-3-4184-1136-%d-%d-0000", PLAYER_CAST.spellID, castIndex)
+    local landing = castTime + PLAYER_CAST.castTime
+    push(castTime, { event = "UNIT_SPELLCAST_START", arg = "player", castGUID = castGUID, spellID = PLAYER_CAST.spellID, castStart = castTime, castEnd = landing, target = target.token })
+    pushCleu(landing, "SPELL_CAST_SUCCESS", player, target, PLAYER_CAST.spellID, PLAYER_CAST.name, 8)
+    local amount = random(60000, 90000)
+    pushCleu(landing, "SPELL_HEAL", player, target, PLAYER_CAST.spellID, PLAYER_CAST.name, 8, amount, 0, 0, false)
+    pushHealth(landing, target, amount)
+    push(landing, { event = "UNIT_SPELLCAST_SUCCEEDED", arg = "player", castGUID = castGUID, spellID = PLAYER_CAST.spellID })
+    push(landing, { event = "UNIT_SPELLCAST_STOP", arg = "player", castGUID = castGUID, spellID = PLAYER_CAST.spellID, endCast = true })
+    castTime = landing + 0.05
+  end
+
+  -- One death and battle-res every 20 seconds.
+  for time = start + 10, finish - 6, 20 do
+    local victim = roster[random(2, #roster)]
+    pushCleu(time, "UNIT_DIED", nil, victim)
+    push(time, { event = "UNIT_HEALTH", arg = victim.token, unit = victim, die = true })
+    pushCleu(time + 5, "SPELL_RESURRECT", healers[2] or player, victim, 20484, "Rebirth", 8)
+    push(time + 5, { event = "UNIT_HEALTH", arg = victim.token, unit = victim, revive = true })
+  end
+
+  sort(events, function(left, right)
+    if left.time == right.time then
+      return left.sequence < right.sequence
+    end
+    return left.time < right.time
+  end)
+
+  -- Resolve absolute HP per event in order, so replay only assigns numbers.
+  local hp = {}
+  local dead = {}
+  for index = 1, #roster do
+    hp[roster[index]] = roster[index].maxhp
+  end
+  for index = 1, #events do
+    local event = events[index]
+    local unit = event.unit
+    if unit and (event.delta or event.die or event.revive) then
+      if event.die then
+        dead[unit] = true
+        hp[unit] = 0
+      elseif event.revive then
+        dead[unit] = nil
+        hp[unit] = floor(unit.maxhp * 0.3)
+      elseif not dead[unit] then
+        local value = hp[unit] + event.delta
+        if value < 1 then
+          value = 1
+        elseif value > unit.maxhp then
+          value = unit.maxhp
+        end
+        hp[unit] = value
+      end
+      event.hp = hp[unit]
+      event.dead = dead[unit] or false
+    end
+  end
+
+  return events
+end
+
+-- Apply the world-side effect of an event (HP, auras, casts) before the addon sees it.
+local function applyEvent(World, event)
+  local unit = event.unit
+  if event.hp then
+    unit.hp = event.hp
+    unit.dead = event.dead
+  end
+  if event.aura then
+    World.setAura(unit, event.aura, event.spellId, event.duration, event.source)
+  elseif event.clearAura then
+    World.clearAura(unit, event.clearAura)
+  end
+  if event.castGUID then
+    local player = World.player
+    if event.endCast then
+      player.cast = nil
+      World.targetToken = nil
+    elseif event.castStart then
+      player.cast = {
+        name = PLAYER_CAST.name,
+        spellID = event.spellID,
+        castGUID = event.castGUID,
+        startTime = event.castStart,
+        endTime = event.castEnd,
+      }
+      World.targetToken = event.target
+    end
+  end
+end
+
+local function fireEvent(World, event, consumers)
+  if event.cleu then
+    World.fireCombatLog(event.cleu)
+  elseif event.castGUID then
+    World.fire(event.event, event.arg, event.castGUID, event.spellID)
+    consumers.markDirty(World.player)
+  else
+    World.fire(event.event, event.arg)
+    if event.unit then
+      consumers.markDirty(event.unit)
+      if event.event == "UNIT_HEALTH" then
+        consumers.overlayUpdate(event.unit)
+      end
+    end
+  end
+end
+
+-- Consumers -------------------------------------------------------------------
+
+-- Grid: mirrors the UI/GridFrame.lua scheduler, one solver projection per tick for each unit marked
+-- dirty by UNIT_HEALTH/UNIT_AURA, cast events, aggregator changes or DeathAuthority, plus casting units.
+-- (Its budget never binds at these sizes, so the lowest-HP ordering is not modelled.)
+-- Overlay: mirrors the UI/Overlay.lua heal-prediction hook, one projection per UNIT_HEALTH.
+-- Both pass the cast's landing time and spell for units that are casting.
+local function makeConsumers(World, NODHeal)
+  local solver = NODHeal:GetModule("PredictiveSolver")
+  local landing = NODHeal:GetModule("CastLandingTime")
+  local dispatcher = NODHeal:GetModule("CoreDispatcher")
+  local death = NODHeal:GetModule("DeathAuthority")
+  local telemetry = NODHeal.Telemetry
+  local roster = World.roster
+  local opts = {}
+  local dirty = {}
+  local byGUID, byToken = {}, {}
+  for index = 1, #roster do
+    byGUID[roster[index].guid] = roster[index]
+    byToken[roster[index].token] = roster[index]
+  end
+
+  local function markDirty(unit)
+    dirty[unit] = true
+  end
+
+  local function markGUID(_, guid)
+    local unit = byGUID[guid]
+    if unit then
+      dirty[unit] = true
+    end
+  end
+
+  dispatcher.RegisterHandler("NOD_INCOMING_HEAL_RECORDED", markGUID)
+  dispatcher.RegisterHandler("NOD_INCOMING_SCHEDULE_CHANGED", markGUID)
+  death.RegisterListener(function(token)
+    local unit = byToken[token]
+    if unit then
+      dirty[unit] = true
+    end
+  end)
+
+  local function project(unit)
+    local cast = unit.cast
+    if telemetry and telemetry.Increment then
+      telemetry:Increment("solverCalls")
+    end
+    if cast and cast.endTime > World.now and landing then
+      opts.tLand = landing.ComputeLandingTime(cast.spellID, cast.endTime - cast.startTime, cast.startTime * 1000)
+      opts.spellID = cast.spellID
+      solver.CalculateProjectedHealth(unit.token, opts)
+    else
+      solver.CalculateProjectedHealth(unit.token)
+    end
+  end
+
+  local function gridTick()
+    for index = 1, #roster do
+      local unit = roster[index]
+      local cast = unit.cast
+      if dirty[unit] or (cast and cast.endTime > World.now) then
+        dirty[unit] = nil
+        project(unit)
+      end
+    end
+  end
+
+  return { gridTick = gridTick, overlayUpdate = project, markDirty = markDirty }
+end
+
+-- Micro scenarios ---------------------------------------------------------------
+
+-- Each target holds `depth` landed heals (CLEU timestamps, as the live client delivers them) and `depth`
+-- keyed scheduled casts. Measured per operation: summing heals landing by a cutoff, appending a landed
+-- heal, scheduling + removing a keyed cast, and the raid-wide expiry sweep the dispatcher runs each tick.
+local function runIncoming(World, NODHeal, scenario, measureAlloc)
+  local aggregator = NODHeal:GetModule("IncomingHealAggregator")
+  local roster = World.roster
+  local size = #roster
+  local epoch = World.now + World.epochOffset
+  local spacing = 0.05
+  local metrics = {}
+  local operations = 0
+  local removal = { casterGUID = "Player-0-BENCH", spellID = 1, targets = {} }
+  local payload = {}
+  -- The first pass only warms up (JIT traces, table growth) and is not recorded.
+  local passes = { scenario.depths[1] }
+  for _, depth in ipairs(scenario.depths) do
+    passes[#passes + 1] = depth
+  end
+  local warming
+
+  local function sample()
+    return measureAlloc and collectgarbage("count") or clock()
+  end
+
+  local function record(name, depth, cost, count)
+    if warming then
+      return
+    end
+    if measureAlloc then
+      metrics[format("%s_%d_alloc_b", name, depth)] = floor(cost * 1024 / count + 0.5)
+    else
+      metrics[format("%s_%d_us", name, depth)] = floor(cost * 1e7 / count + 0.5) / 10
+    end
+    operations = operations + count
+  end
+
+  for pass, depth in ipairs(passes) do
+    warming = pass == 1
+    World.fire("GROUP_ROSTER_UPDATE")
+    for index = 1, size do
+      local guid = roster[index].guid
+      for step = 1, depth do
+        aggregator.AddHeal({
+          targetGUID = guid, amount = 1000 + step, landTime = epoch + step * spacing,
+          sourceGUID = roster[(step % size) + 1].guid, spellID = 2061, source = "SPELL_HEAL",
+        })
+        aggregator.AddScheduled({
+          targetGUID = guid, amount = 2000 + step, landTime = World.now + 1 + step * 0.01,
+          sourceGUID = roster[(step % size) + 1].guid, spellID = 2061, source = "cast",
+          key = format("bench:%d:%d", index, step),
+        })
+      end
+    end
+    local middle = (epoch + depth * spacing / 2) / 1000
+    local repeats = scenario.repeats
+    collectgarbage("collect")
+    if measureAlloc then
+      collectgarbage("stop")
+    end
+
+    -- Batches keep the clock out of sub-microsecond operations; removals between batches are not timed.
+    local before = sample()
+    for round = 1, repeats do
+      aggregator:GetIncomingForGUID(roster[(round % size) + 1].guid, middle)
+    end
+    record("query", depth, sample() - before, repeats)
+
+    local cost = 0
+    local landTime = epoch + (depth + 1) * spacing
+    local heals = {}
+    for index = 1, size do
+      heals[index] = {
+        targetGUID = roster[index].guid, amount = 500, landTime = landTime,
+        sourceGUID = removal.casterGUID, spellID = removal.spellID, source = "SPELL_HEAL",
+      }
+    end
+    for _ = 1, floor(repeats / size) do
+      before = sample()
+      for index = 1, size do
+        aggregator.AddHeal(heals[index])
+      end
+      cost = cost + sample() - before
+      for index = 1, size do
+        removal.targets[roster[index].guid] = true
+      end
+      aggregator.RemoveHeal(removal)
+      wipe(removal.targets)
+    end
+    record("add", depth, cost, floor(repeats / size) * size)
+
+    payload.amount = 500
+    payload.landTime = World.now + 1 + (depth + 1) * 0.01
+    payload.key = "bench:extra"
+    before = sample()
+    for round = 1, repeats do
+      payload.targetGUID = roster[(round % size) + 1].guid
+      aggregator.AddScheduled(payload)
+      aggregator.RemoveScheduled("bench:extra")
+    end
+    record("schedule", depth, sample() - before, repeats)
+
+    local sweeps = floor(repeats / 10)
+    before = sample()
+    for _ = 1, sweeps do
+      aggregator.CleanExpired()
+    end
+    record("sweep", depth, sample() - before, sweeps)
+
+    if measureAlloc then
+      collectgarbage("restart")
+    end
+  end
+  return metrics, operations
+end
+
+-- Every unit has landed and scheduled heals and a damage history; every fourth one casts a HoT.
+-- UNIT_HEALTH is fired for the measured units before each round (untimed) so snapshots and the
+-- projection cache are cold, as they are for the dirty units a grid tick refreshes. Reported per
+-- unit: `unit_<n>` for n CalculateProjectedHealth calls, `batch_<n>` for one batch call.
+local function runProjection(World, NODHeal, scenario, measureAlloc)
+  local solver = NODHeal:GetModule("PredictiveSolver")
+  local aggregator = NODHeal:GetModule("IncomingHealAggregator")
+  local damage = NODHeal:GetModule("DamagePrediction")
+  local roster = World.roster
+  local size = #roster
+  local epoch = World.now + World.epochOffset
+  local metrics = {}
+  local operations = 0
+
+  for index = 1, size do
+    local guid = roster[index].guid
+    for step = 1, 4 do
+      aggregator.AddHeal({
+        targetGUID = guid, amount = 900 + step, landTime = epoch + step * 0.4,
+        sourceGUID = roster[(index + step) % size + 1].guid, spellID = 2061, source = "SPELL_HEAL",
+      })
+      aggregator.AddScheduled({
+        targetGUID = guid, amount = 1800 + step, landTime = World.now + step * 0.5,
+        sourceGUID = roster[(index + step) % size + 1].guid, spellID = 2061, source = "cast",
+        key = format("bench:%d:%d", index, step),
+      })
+      damage.RecordCombatSample(guid, 3000 + index * 10, World.now - 1 + step * 0.25)
+    end
+  end
+
+  local units, spellIDs = {}, {}
+  local out = { projected = {}, overheal = {}, confidence = {}, hpNow = {}, hpMax = {} }
+  local opts = {}
+  for index = 1, size do
+    units[index] = roster[index].token
+    spellIDs[index] = index % 4 == 0 and HOTS[1].id or nil
+  end
+  local tLand = World.now + 1.5
+
+  local function sample()
+    return measureAlloc and collectgarbage("count") or clock()
+  end
+
+  local function invalidate(count)
+    for index = 1, count do
+      World.fire("UNIT_HEALTH", units[index])
+    end
+  end
+
+  -- The first pass only warms up (JIT traces, table growth) and is not recorded.
+  local passes = { scenario.counts[#scenario.counts] }
+  for _, count in ipairs(scenario.counts) do
+    passes[#passes + 1] = count
+  end
+  for pass, count in ipairs(passes) do
+    local unitCost, batchCost = 0, 0
+    collectgarbage("collect")
+    if measureAlloc then
+      collectgarbage("stop")
+    end
+    for _ = 1, scenario.repeats do
+      invalidate(count)
+      local before = sample()
+      for index = 1, count do
+        opts.tLand = tLand
+        opts.spellID = spellIDs[index]
+        solver.CalculateProjectedHealth(units[index], opts)
+      end
+      unitCost = unitCost + sample() - before
+
+      invalidate(count)
+      before = sample()
+      solver.CalculateProjectedHealthBatch(units, tLand, out, count, spellIDs)
+      batchCost = batchCost + sample() - before
+    end
+    if measureAlloc then
+      collectgarbage("restart")
+    end
+
+    if pass > 1 then
+      local calls = scenario.repeats * count
+      if measureAlloc then
+        metrics[format("unit_%d_alloc_b", count)] = floor(unitCost * 1024 / calls + 0.5)
+        metrics[format("batch_%d_alloc_b", count)] = floor(batchCost * 1024 / calls + 0.5)
+      else
+        metrics[format("unit_%d_us", count)] = floor(unitCost * 1e7 / calls + 0.5) / 10
+        metrics[format("batch_%d_us", count)] = floor(batchCost * 1e7 / calls + 0.5) / 10
+      end
+      operations = operations + 2 * calls
+    end
+  end
+  return metrics, operations
+end
+
+local function countErrors(NODHeal)
+  local ring = NODHeal.Err and NODHeal.Err.ring or {}
+  local total, first = 0, nil
+  for index = 1, #ring do
+    if ring[index] then
+      total = total + 1
+      first = first or ring[index]
+    end
+  end
+  return total, first
+end
+
+-- Entry point -----------------------------------------------------------------
+
+return function(root, scenarioName, mode)
+  mode = mode or "time"
+  local scenario = SCENARIOS[scenarioName]
+  if not scenario then
+    error("unknown scenario: " .. tostring(scenarioName))
+  end
+  if mode ~= "time" and mode ~= "alloc" then
+    error("unknown mode: " .. tostring(mode))
+  end
+
+  local World = dofile(root .. "/scripts/bench/wow_stubs.lua")
+  World.install()
+  World.epochOffset = EPOCH_OFFSET - World.now
+  World.setRoster(scenario.size, CLASSES)
+  World.loadAddon(root)
+  World.inCombat = true
+  World.fire("PLAYER_REGEN_DISABLED")
+
+  local NODHeal = _G.NODHeal
+  -- LuaJIT 2.1 appends a build stamp to jit.version; keep only the release so baselines match.
+  local runtime = (jit and jit.version:match("^LuaJIT %d+%.%d+")) or _VERSION
+  if scenario.micro then
+    collectgarbage("collect")
+    local heapStart = collectgarbage("count")
+    local runMicro = scenario.micro == "projection" and runProjection or runIncoming
+    local result, operations = runMicro(World, NODHeal, scenario, mode == "alloc")
+    collectgarbage("collect")
+    local errors, firstError = countErrors(NODHeal)
+    result.runtime = runtime
+    result.scenario = scenarioName
+    result.mode = mode
+    result.units = scenario.size
+    result.events = operations
+    result.heap_growth_kb = floor((collectgarbage("count") - heapStart) * 10 + 0.5) / 10
+    result.errors = errors
+    result.first_error = firstError
+    return result
+  end
+
+  local consumers = makeConsumers(World, NODHeal)
+  local events = buildWorkload(World, scenario)
+  local finish = World.now + scenario.duration
+
+  collectgarbage("collect")
+  collectgarbage("collect")
+  local heapStart = collectgarbage("count")
+  local measureAlloc = mode == "alloc"
+  if measureAlloc then
+    collectgarbage("stop")
+  end
+
+  local eventCost, cleuCost, tickCost = 0, 0, 0
+  local eventCount, cleuCount, tickCount = 0, 0, 0
+  local windowEnd = World.now
+  local cursor = 1
+  local total = #events
+
+  while windowEnd < finish do
+    windowEnd = windowEnd + TICK
+    while cursor <= total and events[cursor].time < windowEnd do
+      local event = events[cursor]
+      World.now = event.time
+      applyEvent(World, event)
+      local before = measureAlloc and collectgarbage("count") or clock()
+      fireEvent(World, event, consumers)
+      local cost = (measureAlloc and collectgarbage("count") or clock()) - before
+      eventCost = eventCost + cost
+      eventCount = eventCount + 1
+      if event.cleu then
+        cleuCost = cleuCost + cost
+        cleuCount = cleuCount + 1
+      end
+      cursor = cursor + 1
+    end
+
+    local before = measureAlloc and collectgarbage("count") or clock()
+    World.advance(windowEnd)
+    consumers.gridTick()
+    tickCost = tickCost + (measureAlloc and collectgarbage("count") or clock()) - before
+    tickCount = tickCount + 1
+  end
+
+  if measureAlloc then
+    collectgarbage("restart")
+  end
+  collectgarbage("collect")
+  collectgarbage("collect")
+  local heapEnd = collectgarbage("count")
+  local errors, firstError = countErrors(NODHeal)
+
+  local result = {
+    runtime = runtime,
+    scenario = scenarioName,
+    mode = mode,
+    units = scenario.size,
+    events = eventCount,
+    cleu_events = cleuCount,
+    ticks = tickCount,
+    heap_growth_kb = floor((heapEnd - heapStart) * 10 + 0.5) / 10,
+    errors = errors,
+    first_error = firstError,
+  }
+  if measureAlloc then
+    -- collectgarbage("count") is in KiB.
+    result.event_alloc_b = floor(eventCost * 1024 / eventCount + 0.5)
+    result.cleu_alloc_b = floor(cleuCost * 1024 / cleuCount + 0.5)
+    result.tick_alloc_b = floor(tickCost * 1024 / tickCount + 0.5)
+  else
+    result.event_us = floor(eventCost * 1e7 / eventCount + 0.5) / 10
+    result.cleu_us = floor(cleuCost * 1e7 / cleuCount + 0.5) / 10
+    result.tick_us = floor(tickCost * 1e7 / tickCount + 0.5) / 10
+  end
+  return result
+end
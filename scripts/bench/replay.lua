@@ -0,0 +1,447 @@
+-- Offline combat-log replay through Config/ + Core/.
+-- Purpose: Stream a WoWCombatLog.txt through the addon on a virtual clock and record, every solver tick,
+--          PredictiveSolver.CalculateProjectedHealth next to the unit's logged HP.
+-- Usage: local replay = dofile("scripts/bench/replay.lua")
+--        local summary = replay(root, { path = "WoWCombatLog.txt", mode = "fast" }, function(columns, count) ... end)
+-- Modes: "fast" delivers every line at its logged time and runs timers in between, as fast as the CPU allows;
+--        "fixed" advances in frames of `step` seconds and delivers each line at the end of its frame,
+--        the way the client batches events per OnUpdate.
+-- Note: Roster members come from COMBATANT_INFO and from player GUIDs flagged mine/party/raid (max 40).
+--       Actual HP is taken from the advanced-logging unit block, so logs need Advanced Combat Logging.
+
+local floor = math.floor
+local ceil = math.ceil
+local find = string.find
+local sub = string.sub
+local byte = string.byte
+local format = string.format
+local clock = os.clock
+
+local MAX_MEMBERS = 40
+local CARRIAGE_RETURN = 13
+-- The log does not say how long a cast takes; UnitCastingInfo reports this until SUCCESS/FAILED.
+local ASSUMED_CAST_SECONDS = 1.5
+local CONFIDENCE_CODES = { low = 0, medium = 1, high = 2 }
+
+-- dmg_conf is DamagePrediction's own bucket; dmg_taken/heal_taken are running totals of the unit's logged
+-- damage and healing (same amounts DamagePrediction and the aggregator read), for scoring windows.
+local COLUMNS = {
+  "t", "encounter", "unit", "horizon", "hp", "hp_max", "hp_proj", "confidence",
+  "dmg", "dmg_conf", "inc_heals", "hots", "dmg_taken", "heal_taken",
+}
+
+-- Payload position of the amount, as DamagePrediction reads it.
+local DAMAGE_AMOUNT = {
+  SWING_DAMAGE = 12,
+  ENVIRONMENTAL_DAMAGE = 13,
+  RANGE_DAMAGE = 15,
+  SPELL_DAMAGE = 15,
+  SPELL_PERIODIC_DAMAGE = 15,
+  SPELL_BUILDING_DAMAGE = 15,
+  DAMAGE_SPLIT = 15,
+}
+local HEAL_AMOUNT = {
+  SPELL_HEAL = 15,
+  SPELL_PERIODIC_HEAL = 15,
+}
+
+local AURA_EVENTS = {
+  SPELL_AURA_APPLIED = true,
+  SPELL_AURA_REFRESH = true,
+  SPELL_AURA_APPLIED_DOSE = true,
+  SPELL_AURA_REMOVED_DOSE = true,
+  SPELL_AURA_REMOVED = true,
+}
+
+local function defaults(options)
+  local resolved = {}
+  for key, value in pairs(options or {}) do
+    resolved[key] = value
+  end
+  resolved.mode = resolved.mode or "fast"
+  resolved.tick = resolved.tick or 0.2
+  resolved.step = resolved.step or (1 / 60)
+  resolved.chunk = resolved.chunk or 4096
+  resolved.horizons = resolved.horizons or { 1.5 }
+  if resolved.mode ~= "fast" and resolved.mode ~= "fixed" then
+    error("unknown replay mode: " .. tostring(resolved.mode))
+  end
+  if not resolved.path then
+    error("replay needs options.path")
+  end
+  return resolved
+end
+
+local function newColumns()
+  local columns = {}
+  for _, name in ipairs(COLUMNS) do
+    columns[name] = {}
+  end
+  return columns
+end
+
+local function countErrors(NODHeal)
+  local ring = NODHeal.Err and NODHeal.Err.ring or {}
+  local total, first = 0, nil
+  for index = 1, #ring do
+    if ring[index] then
+      total = total + 1
+      first = first or ring[index]
+    end
+  end
+  return total, first
+end
+
+return function(root, options, sink)
+  options = defaults(options)
+  local World = dofile(root .. "/scripts/bench/wow_stubs.lua")
+  local CombatLog = dofile(root .. "/scripts/bench/combatlog.lua")
+  World.install()
+  if options.config then
+    -- Overrides land in SavedVariables, so Config/Defaults.lua merges them like a user's settings.
+    _G.NODHealDB = { config = options.config }
+  end
+  local NODHeal = World.loadAddon(root)
+  local solver = NODHeal:GetModule("PredictiveSolver")
+  local damage = NODHeal:GetModule("DamagePrediction")
+
+  local decoder = CombatLog.new({ year = options.year })
+  local start = World.now
+  local roster = World.roster
+  local byGUID = World.byGUID
+  local encounters = {}
+  local current
+  local specs = {}
+  local castCounter = 0
+
+  -- Recording ------------------------------------------------------------------
+
+  local columns = newColumns()
+  local t, encounterColumn, unitColumn, horizonColumn = columns.t, columns.encounter, columns.unit, columns.horizon
+  local hpColumn, maxColumn, projColumn, confidenceColumn = columns.hp, columns.hp_max, columns.hp_proj, columns.confidence
+  local dmgColumn, dmgConfColumn, incColumn, hotsColumn = columns.dmg, columns.dmg_conf, columns.inc_heals, columns.hots
+  local dmgTakenColumn, healTakenColumn = columns.dmg_taken, columns.heal_taken
+  local rows, totalRows = 0, 0
+  local horizons = options.horizons
+  local solverOpts = {}
+
+  local function flush()
+    if rows > 0 then
+      sink(columns, rows)
+      totalRows = totalRows + rows
+      rows = 0
+    end
+  end
+
+  local function recordUnit(index, unit, horizon, now, encounterIndex)
+    local result, tLand
+    if horizon > 0 then
+      tLand = now + horizon
+      solverOpts.tLand = tLand
+      result = solver.CalculateProjectedHealth(unit.token, solverOpts)
+    else
+      result = solver.CalculateProjectedHealth(unit.token)
+    end
+    if not result then
+      return
+    end
+    local estimate = damage.Estimate(unit.token, tLand)
+    local components = result.components
+    rows = rows + 1
+    t[rows] = floor((now - start) * 1000 + 0.5) / 1000
+    encounterColumn[rows] = encounterIndex
+    unitColumn[rows] = index
+    horizonColumn[rows] = horizon
+    hpColumn[rows] = unit.dead and 0 or unit.hp
+    maxColumn[rows] = unit.maxhp
+    projColumn[rows] = floor(result.hp_proj + 0.5)
+    confidenceColumn[rows] = CONFIDENCE_CODES[result.confidence] or 0
+    dmgColumn[rows] = components.dmg or 0
+    dmgConfColumn[rows] = CONFIDENCE_CODES[estimate.confidence] or 0
+    incColumn[rows] = components.incHeals or 0
+    hotsColumn[rows] = components.hots or 0
+    dmgTakenColumn[rows] = unit.damageTaken
+    healTakenColumn[rows] = unit.healTaken
+    if rows >= options.chunk then
+      flush()
+    end
+  end
+
+  local function record()
+    if options.encountersOnly and not current then
+      return
+    end
+    local now = World.now
+    local encounterIndex = current and current.index or 0
+    for index = 1, #roster do
+      local unit = roster[index]
+      if unit.hpKnown then
+        for h = 1, #horizons do
+          recordUnit(index, unit, horizons[h], now, encounterIndex)
+        end
+      end
+    end
+  end
+
+  -- Created after the addon's own ticker, so each recording sees that tick's solver/aggregator pass.
+  C_Timer.NewTicker(options.tick, record)
+
+  -- World model ----------------------------------------------------------------
+
+  local function addMember(guid, name)
+    if #roster >= MAX_MEMBERS then
+      return nil
+    end
+    local unit = World.addMember(guid, name or guid)
+    -- Not recorded until an advanced-logging block reports the unit's HP.
+    unit.hp, unit.maxhp, unit.hpKnown = 1, 1, false
+    unit.auraSlots = {}
+    unit.damageTaken, unit.healTaken = 0, 0
+    unit.named = name ~= nil
+    World.fire("GROUP_ROSTER_UPDATE")
+    return unit
+  end
+
+  -- Roster member for a CLEU unit, adding player GUIDs flagged mine (0x1), party (0x2) or raid (0x4).
+  local function memberFor(guid, name, flags)
+    local unit = byGUID[guid]
+    if unit then
+      if not unit.named and name then
+        unit.name = name
+        unit.named = true
+      end
+      return unit
+    end
+    if type(flags) ~= "number" or type(guid) ~= "string" or not find(guid, "^Player%-") then
+      return nil
+    end
+    local affiliation = flags % 16
+    if affiliation ~= 1 and affiliation ~= 2 and affiliation ~= 4 then
+      return nil
+    end
+    unit = addMember(guid, name)
+    if unit and affiliation == 1 then
+      World.setPlayer(unit)
+    end
+    return unit
+  end
+
+  local function updateAura(unit, subEvent, spellId, spellName, sourceGUID)
+    local key = format("%s:%s", tostring(spellId), tostring(sourceGUID))
+    local slots = unit.auraSlots
+    local slot = slots[key]
+    if subEvent == "SPELL_AURA_REMOVED" then
+      if slot then
+        World.clearAura(unit, slot)
+        slots[key] = nil
+      end
+      return
+    end
+    if not slot then
+      local auras = unit.auras
+      slot = #auras + 1
+      for index = 1, #auras do
+        if not auras[index].active then
+          slot = index
+          break
+        end
+      end
+      slots[key] = slot
+    end
+    local source = byGUID[sourceGUID]
+    World.setAura(unit, slot, spellId, 0, source and source.token, spellName)
+  end
+
+  local function updateCast(subEvent, spellId, spellName)
+    local player = World.player
+    if subEvent == "SPELL_CAST_START" then
+      castCounter = castCounter + 1
+      player.cast = {
+        name = spellName,
+        spellID = spellId,
+        castGUID = format("Cast-3-0-0-%s-%d-0000", tostring(spellId), castCounter),
+        startTime = World.now,
+        endTime = World.now + ASSUMED_CAST_SECONDS,
+      }
+      return "UNIT_SPELLCAST_START"
+    end
+    local cast = player.cast
+    if subEvent == "SPELL_CAST_SUCCESS" then
+      player.cast = nil
+      return "UNIT_SPELLCAST_SUCCEEDED", cast
+    elseif subEvent == "SPELL_CAST_FAILED" and cast then
+      player.cast = nil
+      return "UNIT_SPELLCAST_FAILED", cast
+    end
+  end
+
+  local function handleCombatLog()
+    local event = decoder.record
+    local subEvent = event[2]
+    local source = memberFor(event[4], event[5], event[6])
+    local dest = memberFor(event[8], event[9], event[10])
+
+    if dest then
+      local amount = event[DAMAGE_AMOUNT[subEvent] or 0]
+      if type(amount) == "number" and amount > 0 then
+        dest.damageTaken = dest.damageTaken + amount
+      end
+      amount = event[HEAL_AMOUNT[subEvent] or 0]
+      if type(amount) == "number" and amount > 0 then
+        dest.healTaken = dest.healTaken + amount
+      end
+    end
+
+    local healthChanged
+    local infoUnit = decoder.infoGUID and byGUID[decoder.infoGUID]
+    if infoUnit and type(decoder.infoHP) == "number" then
+      local maxHP = decoder.infoMaxHP
+      if infoUnit.hp ~= decoder.infoHP or (type(maxHP) == "number" and infoUnit.maxhp ~= maxHP) then
+        infoUnit.hp = decoder.infoHP
+        infoUnit.hpKnown = true
+        if infoUnit.dead and decoder.infoHP > 0 then
+          -- Released and ran back, or a resurrect the log did not show.
+          infoUnit.dead = false
+        end
+        if type(maxHP) == "number" and maxHP > 0 then
+          infoUnit.maxhp = maxHP
+        end
+        healthChanged = infoUnit
+      end
+    end
+    if dest and (subEvent == "UNIT_DIED" or subEvent == "SPELL_INSTAKILL") and not dest.dead then
+      dest.dead = true
+      dest.hp = 0
+      healthChanged = dest
+    elseif dest and dest.dead and subEvent == "SPELL_RESURRECT" then
+      dest.dead = false
+      healthChanged = dest
+    end
+
+    local auraChanged
+    if dest and AURA_EVENTS[subEvent] and event[15] == "BUFF" then
+      updateAura(dest, subEvent, event[12], event[13], event[4])
+      auraChanged = dest
+    end
+
+    local castEvent, cast
+    if source and source == World.player then
+      castEvent, cast = updateCast(subEvent, event[12], event[13])
+    end
+
+    World.fireCombatLog(event)
+    if healthChanged then
+      World.fire("UNIT_HEALTH", healthChanged.token)
+    end
+    if auraChanged then
+      World.fire("UNIT_AURA", auraChanged.token)
+    end
+    if castEvent == "UNIT_SPELLCAST_START" then
+      cast = World.player.cast
+      World.fire(castEvent, "player", cast.castGUID, cast.spellID)
+    elseif castEvent and cast then
+      World.fire(castEvent, "player", cast.castGUID, cast.spellID)
+      World.fire("UNIT_SPELLCAST_STOP", "player", cast.castGUID, cast.spellID)
+    elseif castEvent then
+      World.fire(castEvent, "player", nil, event[12])
+    end
+  end
+
+  local function handleEncounter(kind)
+    local fields = decoder.fields
+    if kind == "encounter_start" then
+      current = {
+        index = #encounters + 1,
+        id = fields[1],
+        name = fields[2],
+        difficulty = fields[3],
+        size = fields[4],
+        start = World.now - start,
+      }
+      encounters[current.index] = current
+      World.inCombat = true
+      World.fire("ENCOUNTER_START", fields[1], fields[2], fields[3], fields[4])
+      World.fire("PLAYER_REGEN_DISABLED")
+    elseif current then
+      current.finish = World.now - start
+      current.success = fields[5] == 1
+      current = nil
+      World.inCombat = false
+      World.fire("ENCOUNTER_END", fields[1], fields[2], fields[3], fields[4], fields[5])
+      World.fire("PLAYER_REGEN_ENABLED")
+    end
+  end
+
+  -- Main loop ------------------------------------------------------------------
+
+  local handle = assert(io.open(options.path, "r"))
+  local fixed = options.mode == "fixed"
+  local step = options.step
+  local base
+  local lines, events, skipped = 0, 0, 0
+  local started = clock()
+
+  for line in handle:lines() do
+    lines = lines + 1
+    if byte(line, -1) == CARRIAGE_RETURN then
+      line = sub(line, 1, -2)
+    end
+    local kind, epoch = decoder:decode(line)
+    if kind then
+      base = base or epoch
+      local time = start + (epoch - base)
+      if fixed then
+        time = start + ceil((epoch - base) / step) * step
+      end
+      if time > World.now then
+        World.advance(time)
+      end
+      if kind == "cleu" then
+        events = events + 1
+        handleCombatLog()
+      elseif kind == "combatant" then
+        local unit = byGUID[decoder.combatantGUID] or addMember(decoder.combatantGUID, nil)
+        if unit then
+          specs[unit.index] = decoder.specID
+        end
+      else
+        handleEncounter(kind)
+      end
+    else
+      skipped = skipped + 1
+    end
+  end
+  handle:close()
+  World.advance(World.now + options.tick)
+  flush()
+
+  local units = {}
+  for index = 1, #roster do
+    local unit = roster[index]
+    units[index] = {
+      guid = unit.guid,
+      name = unit.name,
+      spec = specs[index] or 0,
+      player = unit == World.player,
+    }
+  end
+  for _, encounter in ipairs(encounters) do
+    encounter.index = nil
+  end
+  local errors, firstError = countErrors(NODHeal)
+
+  return {
+    runtime = (jit and jit.version:match("^LuaJIT %d+%.%d+")) or _VERSION,
+    columns = COLUMNS,
+    lines = lines,
+    events = events,
+    skipped = skipped,
+    rows = totalRows,
+    log_seconds = World.now - start,
+    cpu_seconds = clock() - started,
+    units = units,
+    encounters = encounters,
+    errors = errors,
+    first_error = firstError,
+  }
+end
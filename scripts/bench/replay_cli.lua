@@ -0,0 +1,58 @@
+-- Command-line entry for the combat-log replay on a stock interpreter.
+-- Usage: luajit scripts/bench/replay_cli.lua <repo-root> path=<WoWCombatLog.txt> [mode=fast|fixed] [step=S]
+--        [tick=S] [horizons=1.5,3] [encountersOnly=1] [year=YYYY] [config.<section>.<key>=value ...]
+-- Output: "C <column> <comma-separated values>" per column and chunk, then "S/U/E" summary lines,
+--         read back by replay_combatlog.py.
+
+local root = arg[1]
+if not root then
+  io.stderr:write("usage: replay_cli.lua <repo-root> path=<log> [key=value ...]\n")
+  os.exit(2)
+end
+
+local options = {}
+for index = 2, #arg do
+  local key, value = arg[index]:match("^([%w_.]+)=(.*)$")
+  local section, setting = (key or ""):match("^config%.([%w_]+)%.([%w_]+)$")
+  if section then
+    options.config = options.config or {}
+    options.config[section] = options.config[section] or {}
+    options.config[section][setting] = tonumber(value) or value
+  elseif key == "horizons" then
+    options.horizons = {}
+    for horizon in value:gmatch("[^,]+") do
+      options.horizons[#options.horizons + 1] = tonumber(horizon)
+    end
+  elseif key == "encountersOnly" then
+    options.encountersOnly = value == "1"
+  elseif key then
+    options[key] = tonumber(value) or value
+  end
+end
+
+local write = io.write
+local concat = table.concat
+local replay = dofile(root .. "/scripts/bench/replay.lua")
+
+local summary = replay(root, options, function(columns, count)
+  for name, values in pairs(columns) do
+    write("C ", name, " ", concat(values, ",", 1, count), "\n")
+  end
+end)
+
+local function clean(value)
+  return (tostring(value):gsub("[\t\n]", " "))
+end
+
+for key, value in pairs(summary) do
+  if type(value) ~= "table" then
+    write("S ", key, "\t", clean(value), "\n")
+  end
+end
+for index, unit in ipairs(summary.units) do
+  write("U ", index, "\t", clean(unit.guid), "\t", clean(unit.name), "\t", unit.spec, "\t", unit.player and 1 or 0, "\n")
+end
+for _, encounter in ipairs(summary.encounters) do
+  write("E ", clean(encounter.id), "\t", clean(encounter.name), "\t", clean(encounter.difficulty), "\t",
+    clean(encounter.size), "\t", encounter.start, "\t", clean(encounter.finish), "\t", encounter.success and 1 or 0, "\n")
+end
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Replay a WoWCombatLog.txt through the addon's Core offline and store solver projections vs. actual HP.
+
+The Lua side (``replay.lua``) decodes each line into the tuple
+``CombatLogGetCurrentEventInfo`` would return, fires it on a virtual clock and
+records one row per roster unit, horizon and solver tick. This script picks a
+Lua runtime, streams those rows into a columnar file (see ``columnar.py``) and
+prints throughput.
+"""
+from __future__ import annotations
+
+import argparse
+import array
+import importlib
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from columnar import ColumnWriter
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent.parent
+OUTPUT_SUFFIX = '.replay.nodcol'
+INTERPRETERS = ('luajit', 'lua5.1', 'lua51', 'lua')
+LUPA_MODULES = ('lupa.luajit21', 'lupa.luajit20', 'lupa.lua51')
+
+# Column order and storage type; must match COLUMNS in replay.lua.
+SCHEMA = (
+    ('t', 'd'),
+    ('encounter', 'H'),
+    ('unit', 'B'),
+    ('horizon', 'f'),
+    ('hp', 'i'),
+    ('hp_max', 'i'),
+    ('hp_proj', 'i'),
+    ('confidence', 'b'),
+    ('dmg', 'f'),
+    ('dmg_conf', 'b'),
+    ('inc_heals', 'f'),
+    ('hots', 'f'),
+    ('dmg_taken', 'd'),
+    ('heal_taken', 'd'),
+)
+CONFIDENCE_LEVELS = ('low', 'medium', 'high')
+
+Emit = Callable[[str, str], None]
+
+_LUPA_ENTRY = '''
+local replay, root, options, emit = ...
+local concat = table.concat
+return replay(root, options, function(columns, count)
+  for name, values in pairs(columns) do
+    emit(name, concat(values, ",", 1, count))
+  end
+end)
+'''
+
+
+class ChunkSink:
+    """Collects per-column CSV chunks from Lua and hands complete row blocks to the writer."""
+
+    def __init__(self, writer: ColumnWriter) -> None:
+        self.writer = writer
+        self.types = dict(SCHEMA)
+        self.pending: Dict[str, array.array] = {}
+
+    def __call__(self, name: str, values: str) -> None:
+        typecode = self.types[name]
+        convert = float if typecode in 'fd' else int
+        self.pending[name] = array.array(typecode, map(convert, values.split(',')))
+        if len(self.pending) == len(SCHEMA):
+            self.writer.extend(self.pending)
+            self.pending = {}
+
+
+def replay_options(args: argparse.Namespace) -> Dict[str, object]:
+    """Lua-side options for ``replay.lua`` from parsed command-line arguments."""
+    options: Dict[str, object] = {
+        'mode': args.mode,
+        'tick': args.tick,
+        'step': args.step,
+        'horizons': args.horizon or [1.5],
+    }
+    if args.encounters_only:
+        options['encountersOnly'] = True
+    if args.year:
+        options['year'] = args.year
+    return options
+
+
+def run_lupa(module_name: str, options: Dict[str, object], emit: Emit) -> dict:
+    module = importlib.import_module(module_name)
+    runtime = module.LuaRuntime()
+
+    def to_lua(value: object) -> object:
+        if isinstance(value, dict):
+            return runtime.table_from({key: to_lua(item) for key, item in value.items()})
+        if isinstance(value, list):
+            return runtime.table_from([to_lua(item) for item in value])
+        return value
+
+    lua_options = to_lua(options)
+    replay = runtime.execute('return dofile(...)', str(BENCH_DIR / 'replay.lua'))
+    summary = runtime.execute(_LUPA_ENTRY, replay, str(REPO_ROOT), lua_options, emit)
+
+    def plain(value: object) -> object:
+        if module.lua_type(value) == 'table':
+            items = dict(value.items())
+            if items and all(isinstance(key, int) for key in items):
+                return [plain(items[key]) for key in sorted(items)]
+            return {key: plain(item) for key, item in items.items()}
+        return value
+
+    return plain(summary)
+
+
+def run_subprocess(interpreter: str, options: Dict[str, object], emit: Emit) -> dict:
+    command = [interpreter, str(BENCH_DIR / 'replay_cli.lua'), str(REPO_ROOT)]
+    for key, value in options.items():
+        if key == 'config':
+            for section, settings in value.items():
+                command.extend(f'config.{section}.{name}={setting}' for name, setting in settings.items())
+            continue
+        if isinstance(value, list):
+            value = ','.join(str(item) for item in value)
+        elif isinstance(value, bool):
+            value = int(value)
+        command.append(f'{key}={value}')
+
+    summary: dict = {'units': [], 'encounters': []}
+    with subprocess.Popen(command, stdout=subprocess.PIPE, text=True) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            kind, _, payload = line.rstrip('\n').partition(' ')
+            if kind == 'C':
+                name, _, values = payload.partition(' ')
+                emit(name, values)
+            elif kind == 'S':
+                key, _, value = payload.partition('\t')
+                summary[key] = _coerce(value)
+            elif kind == 'U':
+                guid, name, spec, player = payload.split('\t')[1:]
+                summary['units'].append({'guid': guid, 'name': name, 'spec': int(spec), 'player': player == '1'})
+            elif kind == 'E':
+                fields = payload.split('\t')
+                summary['encounters'].append({
+                    'id': _coerce(fields[0]), 'name': fields[1], 'difficulty': _coerce(fields[2]),
+                    'size': _coerce(fields[3]), 'start': float(fields[4]), 'finish': _coerce(fields[5]),
+                    'success': fields[6] == '1',
+                })
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return summary
+
+
+def _coerce(value: str) -> object:
+    if value == 'nil':
+        return None
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def default_output(log: Path) -> Path:
+    return log.with_name(log.name + OUTPUT_SUFFIX)
+
+
+def run_replay(log: Path, output: Path, options: Dict[str, object], lua: Optional[str] = None) -> dict:
+    """Replay ``log`` into ``output`` with the best available runtime; returns the Lua summary.
+
+    ``options`` are ``replay.lua`` options (see :func:`replay_options`); ``config`` may carry
+    ``{section: {key: value}}`` overrides that are merged like saved settings.
+    """
+    options = dict(options, path=str(log))
+    with ColumnWriter(output, SCHEMA) as writer:
+        sink = ChunkSink(writer)
+        started = time.perf_counter()
+        summary: Optional[dict] = None
+        if not lua:
+            for module_name in LUPA_MODULES:
+                try:
+                    summary = run_lupa(module_name, options, sink)
+                    break
+                except ImportError:
+                    continue
+        if summary is None:
+            interpreter = lua or next(filter(None, map(shutil.which, INTERPRETERS)), None)
+            if not interpreter:
+                raise SystemExit('no Lua 5.1/LuaJIT interpreter or lupa module available')
+            summary = run_subprocess(interpreter, options, sink)
+        summary['wall_seconds'] = round(time.perf_counter() - started, 3)
+        meta = {key: value for key, value in summary.items() if key != 'columns'}
+        meta.update({
+            'source': log.name,
+            'source_bytes': log.stat().st_size,
+            'mode': options.get('mode', 'fast'),
+            'tick': options.get('tick', 0.2),
+            'step': options.get('step') if options.get('mode') == 'fixed' else None,
+            'horizons': options.get('horizons', [1.5]),
+            'config': options.get('config', {}),
+            'confidence_levels': list(CONFIDENCE_LEVELS),
+        })
+        writer.close(meta)
+    summary['output'] = str(output)
+    return summary
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('log', type=Path, help='WoWCombatLog.txt recorded with Advanced Combat Logging')
+    parser.add_argument('--output', type=Path, help=f'columnar output file (default: <log>{OUTPUT_SUFFIX})')
+    parser.add_argument('--mode', choices=('fast', 'fixed'), default='fast',
+                        help='fast: exact log timestamps, unthrottled; fixed: quantise events to --step frames')
+    parser.add_argument('--step', type=float, default=1 / 60, help='frame length in seconds for --mode fixed')
+    parser.add_argument('--tick', type=float, default=0.2, help='recording interval in seconds (default 0.2)')
+    parser.add_argument('--horizon', type=float, action='append',
+                        help='landing horizon in seconds to project (repeatable, default 1.5; 0 = no tLand)')
+    parser.add_argument('--encounters-only', action='store_true', help='record only between ENCOUNTER_START/END')
+    parser.add_argument('--year', type=int, help='year for logs whose timestamps omit it')
+    parser.add_argument('--lua', help='run this Lua 5.1/LuaJIT interpreter instead of the embedded lupa runtime')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    summary = run_replay(args.log, args.output or default_output(args.log), replay_options(args), args.lua)
+    wall = summary['wall_seconds'] or 1e-9
+    print(
+        f'{summary["lines"]} lines ({summary["events"]} events) in {wall:.1f}s '
+        f'[{summary["lines"] / wall:,.0f} lines/s, {summary["log_seconds"] / wall:,.0f}x real time, {summary["runtime"]}]'
+    )
+    print(f'{summary["rows"]} rows for {len(summary["units"])} units, '
+          f'{len(summary["encounters"])} encounters -> {summary["output"]}')
+    if summary.get('errors'):
+        print(f'addon errors: {summary["errors"]}, first: {summary.get("first_error")}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Run the headless Core benchmark and compare it against committed baselines."""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent.parent
+BASELINE_FILE = BENCH_DIR / 'baselines.json'
+SCENARIOS = ('raid25', 'raid40', 'incoming', 'projection')
+MODES = ('time', 'alloc')
+INTERPRETERS = ('luajit', 'lua5.1', 'lua51', 'lua')
+LUPA_MODULES = ('lupa.luajit21', 'lupa.luajit20', 'lupa.lua51')
+
+# Pipeline scenarios report these; micro scenarios report their own ``*_us`` / ``*_alloc_b`` metrics.
+TIME_METRICS = ('event_us', 'cleu_us', 'tick_us')
+ALLOC_METRICS = ('event_alloc_b', 'cleu_alloc_b', 'tick_alloc_b')
+TIME_SUFFIX = '_us'
+ALLOC_SUFFIX = '_alloc_b'
+MEMORY_METRIC = 'heap_growth_kb'
+# Absolute slack on top of the relative tolerance, so near-zero metrics do not flap.
+ALLOC_SLACK_B = 16
+MEMORY_SLACK_KB = 64
+MEMORY_TOLERANCE = 0.25
+
+Metrics = Dict[str, object]
+Runner = Callable[[str, str], Metrics]
+
+
+def _coerce(value: str) -> object:
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def subprocess_runner(interpreter: str) -> Runner:
+    script = BENCH_DIR / 'core_bench.lua'
+
+    def run(scenario: str, mode: str) -> Metrics:
+        completed = subprocess.run(
+            [interpreter, str(script), str(REPO_ROOT), scenario, mode],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        metrics: Metrics = {}
+        for line in completed.stdout.splitlines():
+            key, _, value = line.partition('=')
+            if key:
+                metrics[key] = _coerce(value)
+        return metrics
+
+    return run
+
+
+def lupa_runner(module_name: str) -> Runner:
+    module = importlib.import_module(module_name)
+    harness = str(BENCH_DIR / 'harness.lua')
+
+    def run(scenario: str, mode: str) -> Metrics:
+        # A fresh Lua state per run: the addon keeps module-level state between events.
+        runtime = module.LuaRuntime()
+        entry = runtime.execute('return dofile(...)', harness)
+        return dict(entry(str(REPO_ROOT), scenario, mode).items())
+
+    return run
+
+
+def find_runner(interpreter: Optional[str]) -> Optional[Runner]:
+    """Prefer a real interpreter on PATH; fall back to an embedded Lua via ``lupa``."""
+    if interpreter:
+        return subprocess_runner(interpreter)
+    for candidate in INTERPRETERS:
+        path = shutil.which(candidate)
+        if path:
+            return subprocess_runner(path)
+    for module_name in LUPA_MODULES:
+        try:
+            return lupa_runner(module_name)
+        except ImportError:
+            continue
+    return None
+
+
+def time_metrics(metrics: Metrics) -> List[str]:
+    return sorted(metric for metric in metrics if metric.endswith(TIME_SUFFIX))
+
+
+def alloc_metrics(metrics: Metrics) -> List[str]:
+    return sorted(metric for metric in metrics if metric.endswith(ALLOC_SUFFIX))
+
+
+def measure(runner: Runner, scenarios: Sequence[str], repeat: int) -> Dict[str, Metrics]:
+    """Best-of-``repeat`` timings plus one allocation run per scenario."""
+    results: Dict[str, Metrics] = {}
+    for scenario in scenarios:
+        timed = [runner(scenario, 'time') for _ in range(max(repeat, 1))]
+        merged: Metrics = dict(timed[0])
+        for metric in time_metrics(merged):
+            merged[metric] = min(run[metric] for run in timed)
+        alloc = runner(scenario, 'alloc')
+        for metric in alloc_metrics(alloc):
+            merged[metric] = alloc[metric]
+        merged[MEMORY_METRIC] = max(merged[MEMORY_METRIC], alloc[MEMORY_METRIC])
+        merged['errors'] = max(merged['errors'], alloc['errors'])
+        merged.pop('mode', None)
+        results[scenario] = merged
+    return results
+
+
+def print_table(results: Dict[str, Metrics]) -> None:
+    pipeline = {scenario: metrics for scenario, metrics in results.items() if 'ticks' in metrics}
+    columns = ('events', 'ticks', *TIME_METRICS, *ALLOC_METRICS, MEMORY_METRIC, 'errors')
+    if pipeline:
+        print('scenario  ' + '  '.join(f'{column:>14}' for column in columns))
+    for scenario, metrics in pipeline.items():
+        print(f'{scenario:<8}  ' + '  '.join(f'{metrics.get(column, "-")!s:>14}' for column in columns))
+    for scenario, metrics in results.items():
+        if scenario in pipeline:
+            continue
+        print(f'{scenario}: {metrics["events"]} operations, {MEMORY_METRIC}={metrics[MEMORY_METRIC]}, '
+              f'errors={metrics["errors"]}')
+        for time_metric in time_metrics(metrics):
+            operation = time_metric[:-len(TIME_SUFFIX)]
+            alloc = metrics.get(operation + ALLOC_SUFFIX, '-')
+            print(f'  {operation:<16} {metrics[time_metric]:>10} us  {alloc!s:>8} B')
+
+
+def load_baselines() -> dict:
+    if not BASELINE_FILE.is_file():
+        return {}
+    return json.loads(BASELINE_FILE.read_text(encoding='utf-8'))
+
+
+def save_baselines(runtime: str, results: Dict[str, Metrics]) -> None:
+    baselines = load_baselines()
+    baselines.setdefault(runtime, {})
+    for scenario, metrics in results.items():
+        keep = (*time_metrics(metrics), *alloc_metrics(metrics), MEMORY_METRIC, 'events', 'ticks')
+        baselines[runtime][scenario] = {metric: metrics[metric] for metric in keep if metric in metrics}
+    BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def compare(results: Dict[str, Metrics], baseline: dict, time_tolerance: float, alloc_tolerance: float) -> List[str]:
+    failures: List[str] = []
+    for scenario, metrics in results.items():
+        if metrics.get('errors'):
+            failures.append(f'{scenario}: {metrics["errors"]} addon errors, first: {metrics.get("first_error")}')
+        expected = baseline.get(scenario)
+        if not expected:
+            continue
+        if metrics['events'] != expected['events']:
+            failures.append(f'{scenario}: workload changed ({metrics["events"]} events, baseline {expected["events"]})')
+        limits = [(metric, expected[metric] * (1 + time_tolerance)) for metric in time_metrics(expected)]
+        limits += [(metric, expected[metric] * (1 + alloc_tolerance) + ALLOC_SLACK_B) for metric in alloc_metrics(expected)]
+        limits.append((MEMORY_METRIC, expected[MEMORY_METRIC] * (1 + MEMORY_TOLERANCE) + MEMORY_SLACK_KB))
+        for metric, limit in limits:
+            if metrics[metric] > limit:
+                failures.append(f'{scenario}: {metric} {metrics[metric]} exceeds {limit:.1f} (baseline {expected[metric]})')
+    return failures
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lua', help='Lua 5.1/LuaJIT interpreter to run (default: first found on PATH, then lupa)')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='scenario to run (repeatable, default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per scenario; the fastest is kept')
+    parser.add_argument('--check', action='store_true', help='fail when a metric regresses past its baseline')
+    parser.add_argument('--update-baselines', action='store_true', help=f'record results in {BASELINE_FILE.name}')
+    parser.add_argument('--time-tolerance', type=float, default=0.5, help='allowed relative slowdown (default 0.5)')
+    parser.add_argument('--alloc-tolerance', type=float, default=0.10, help='allowed relative allocation growth (default 0.10)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    runner = find_runner(args.lua)
+    if runner is None:
+        print('[bench] no Lua 5.1/LuaJIT interpreter or lupa module available; skipping')
+        return 0
+
+    results = measure(runner, args.scenario or SCENARIOS, args.repeat)
+    runtime = str(next(iter(results.values()))['runtime'])
+    print(f'[bench] runtime: {runtime}')
+    print_table(results)
+
+    if args.update_baselines:
+        save_baselines(runtime, results)
+        print(f'[bench] baselines updated for {runtime}')
+    if not args.check:
+        return 0
+
+    baseline = load_baselines().get(runtime)
+    if baseline is None:
+        print(f'[bench] no baseline recorded for {runtime}; run with --update-baselines')
+    failures = compare(results, baseline or {}, args.time_tolerance, args.alloc_tolerance)
+    for failure in failures:
+        print(f'[bench] FAIL {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
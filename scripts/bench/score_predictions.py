@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""Score replayed solver projections against what the log says happened at T_land.
+
+Every row ``replay_combatlog.py`` records at time ``t`` with horizon ``h`` predicts
+the unit's state at ``t + h``. This script looks up that unit's logged HP and
+damage/healing totals at ``t + h`` (interpolated between the two nearest
+recorded ticks) and reports mean absolute error for projected HP, predicted
+damage and predicted healing, plus how well each confidence bucket is
+calibrated, split by role and encounter.
+
+Inputs are replay files (recognised by their header, not their name) or raw
+combat logs (replayed first). With ``--sweep section.key=v1,v2`` the logs are
+replayed once per combination of ``NODHeal.Config`` overrides, in parallel, and
+the combinations are ranked.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import tempfile
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from columnar import is_columnar, read_columns
+from replay_combatlog import CONFIDENCE_LEVELS, OUTPUT_SUFFIX, run_replay
+
+TANK_SPECS = frozenset((66, 73, 104, 250, 268, 581))
+HEALER_SPECS = frozenset((65, 105, 256, 257, 264, 270, 1468))
+# Largest gap between the two recorded ticks around t + h, in ticks, that still counts as a match.
+MAX_GAP_TICKS = 1.5
+OBJECTIVES = ('hp_mae', 'hp_mae_pct', 'dmg_mae', 'heal_mae', 'hp_hit')
+
+Override = Dict[str, Dict[str, object]]
+
+
+def role_of(spec: int) -> str:
+    if not spec:
+        return 'unknown'
+    if spec in TANK_SPECS:
+        return 'tank'
+    if spec in HEALER_SPECS:
+        return 'healer'
+    return 'dps'
+
+
+class ErrorStats:
+    """Running absolute/signed error totals plus hits within a tolerance."""
+
+    __slots__ = ('n', 'abs_sum', 'signed_sum', 'pct_sum', 'hits')
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.abs_sum = 0.0
+        self.signed_sum = 0.0
+        self.pct_sum = 0.0
+        self.hits = 0
+
+    def add(self, error: float, scale: float, tolerance: float) -> None:
+        magnitude = abs(error)
+        self.n += 1
+        self.abs_sum += magnitude
+        self.signed_sum += error
+        self.pct_sum += magnitude / scale
+        if magnitude <= tolerance * scale:
+            self.hits += 1
+
+    def merge(self, other: 'ErrorStats') -> None:
+        self.n += other.n
+        self.abs_sum += other.abs_sum
+        self.signed_sum += other.signed_sum
+        self.pct_sum += other.pct_sum
+        self.hits += other.hits
+
+    def summary(self) -> Dict[str, float]:
+        if not self.n:
+            return {'n': 0}
+        return {
+            'n': self.n,
+            'mae': round(self.abs_sum / self.n, 1),
+            'bias': round(self.signed_sum / self.n, 1),
+            'mae_pct': round(100 * self.pct_sum / self.n, 2),
+            'hit_rate': round(self.hits / self.n, 4),
+        }
+
+
+class Group:
+    """HP, damage and heal errors for one slice of rows."""
+
+    __slots__ = ('hp', 'dmg', 'heal')
+
+    def __init__(self) -> None:
+        self.hp = ErrorStats()
+        self.dmg = ErrorStats()
+        self.heal = ErrorStats()
+
+    def merge(self, other: 'Group') -> None:
+        self.hp.merge(other.hp)
+        self.dmg.merge(other.dmg)
+        self.heal.merge(other.heal)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {'hp': self.hp.summary(), 'dmg': self.dmg.summary(), 'heal': self.heal.summary()}
+
+
+class Scores:
+    """All slices: overall, per horizon, role, encounter and confidence bucket."""
+
+    def __init__(self) -> None:
+        self.overall = Group()
+        self.slices: Dict[str, Dict[str, Group]] = {
+            'horizon': {}, 'role': {}, 'encounter': {}, 'confidence': {}, 'dmg_confidence': {},
+        }
+        self.unmatched = 0
+
+    def group(self, kind: str, key: str) -> Group:
+        groups = self.slices[kind]
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = Group()
+        return group
+
+    def merge(self, other: 'Scores') -> None:
+        self.overall.merge(other.overall)
+        self.unmatched += other.unmatched
+        for kind, groups in other.slices.items():
+            for key, group in groups.items():
+                self.group(kind, key).merge(group)
+
+    def to_json(self) -> dict:
+        return {
+            'overall': self.overall.summary(),
+            'unmatched': self.unmatched,
+            **{kind: {key: group.summary() for key, group in sorted(groups.items())}
+               for kind, groups in self.slices.items()},
+        }
+
+    def objective(self, name: str) -> float:
+        hp = self.overall.hp.summary()
+        if name == 'hp_hit':
+            # Ranked ascending like the error metrics.
+            return -hp.get('hit_rate', 0.0)
+        if name == 'hp_mae_pct':
+            return hp.get('mae_pct', float('inf'))
+        stats = {'hp_mae': self.overall.hp, 'dmg_mae': self.overall.dmg, 'heal_mae': self.overall.heal}[name]
+        return stats.summary().get('mae', float('inf'))
+
+
+def _interpolate(times: Sequence[float], values: Sequence[float], position: int, target: float) -> float:
+    before, after = times[position - 1], times[position]
+    if after == before:
+        return values[position]
+    weight = (target - before) / (after - before)
+    return values[position - 1] + (values[position] - values[position - 1]) * weight
+
+
+def score_file(path: Path, tolerance: float) -> Scores:
+    columns, meta = read_columns(path)
+    tick = float(meta.get('tick') or 0.2)
+    max_gap = tick * MAX_GAP_TICKS
+    units = meta.get('units', [])
+    encounters = meta.get('encounters', [])
+    roles = [role_of(int(unit.get('spec') or 0)) for unit in units]
+    names = [f'{encounter.get("name")} ({encounter.get("difficulty")})' for encounter in encounters]
+
+    t, unit_col, horizon_col = columns['t'], columns['unit'], columns['horizon']
+    hp_col, max_col = columns['hp'], columns['hp_max']
+    dmg_taken, heal_taken = columns['dmg_taken'], columns['heal_taken']
+
+    # One timeline per unit with the logged state; every horizon repeats it, so keep the first row per t.
+    timelines: Dict[int, Tuple[List[float], List[float], List[float], List[float]]] = {}
+    for row in range(len(t)):
+        timeline = timelines.setdefault(unit_col[row], ([], [], [], []))
+        if timeline[0] and timeline[0][-1] >= t[row]:
+            continue
+        timeline[0].append(t[row])
+        timeline[1].append(hp_col[row])
+        timeline[2].append(dmg_taken[row])
+        timeline[3].append(heal_taken[row])
+
+    scores = Scores()
+    projected, predicted_dmg, incoming, hots = columns['hp_proj'], columns['dmg'], columns['inc_heals'], columns['hots']
+    confidence, dmg_confidence, encounter_col = columns['confidence'], columns['dmg_conf'], columns['encounter']
+    for row in range(len(t)):
+        horizon = horizon_col[row]
+        hp_max = max_col[row]
+        # Horizon 0 has no landing time, and an HP max of 1 means the log has not reported the unit yet.
+        if horizon <= 0 or hp_max <= 1:
+            continue
+        times, hps, damage, healing = timelines[unit_col[row]]
+        target = t[row] + horizon
+        position = bisect_left(times, target)
+        if position == 0 or position >= len(times) or times[position] - times[position - 1] > max_gap:
+            scores.unmatched += 1
+            continue
+        start = bisect_left(times, t[row])
+        hp_error = projected[row] - _interpolate(times, hps, position, target)
+        dmg_error = predicted_dmg[row] - (_interpolate(times, damage, position, target) - damage[start])
+        heal_error = incoming[row] + hots[row] - (_interpolate(times, healing, position, target) - healing[start])
+
+        unit_index = unit_col[row] - 1
+        encounter_index = encounter_col[row]
+        slices = (
+            scores.overall,
+            scores.group('horizon', f'{horizon:g}s'),
+            scores.group('role', roles[unit_index] if unit_index < len(roles) else 'unknown'),
+            scores.group('encounter', names[encounter_index - 1] if encounter_index else 'trash'),
+        )
+        for group in slices:
+            group.hp.add(hp_error, hp_max, tolerance)
+            group.dmg.add(dmg_error, hp_max, tolerance)
+            group.heal.add(heal_error, hp_max, tolerance)
+        scores.group('confidence', CONFIDENCE_LEVELS[confidence[row]]).hp.add(hp_error, hp_max, tolerance)
+        scores.group('dmg_confidence', CONFIDENCE_LEVELS[dmg_confidence[row]]).dmg.add(dmg_error, hp_max, tolerance)
+    return scores
+
+
+def score_files(paths: Iterable[Path], tolerance: float) -> Scores:
+    total = Scores()
+    for path in paths:
+        total.merge(score_file(path, tolerance))
+    return total
+
+
+def _format_stats(stats: Dict[str, float]) -> str:
+    if not stats.get('n'):
+        return f'{"-":>10} {"-":>10} {"-":>7} {"-":>6}'
+    return f'{stats["mae"]:>10,.0f} {stats["bias"]:>+10,.0f} {stats["mae_pct"]:>6.2f}% {stats["hit_rate"]:>6.1%}'
+
+
+def print_report(scores: Scores, tolerance: float) -> None:
+    report = scores.to_json()
+    header = f'{"MAE":>10} {"bias":>10} {"%max":>7} {"hit":>6}'
+    print(f'hit = |error| <= {tolerance:.0%} of max HP; {report["unmatched"]} rows had no logged state at t + h')
+    print(f'{"slice":<32} {"rows":>8}  {"projected HP":^36}  {"damage":^36}  {"healing":^36}')
+    print(f'{"":<32} {"":>8}  {header}  {header}  {header}')
+    rows = [('overall', report['overall'])]
+    for kind in ('horizon', 'role', 'encounter'):
+        rows += [(f'{kind}: {key}', group) for key, group in report[kind].items()]
+    for label, group in rows:
+        print(f'{label[:32]:<32} {group["hp"].get("n", 0):>8}  {_format_stats(group["hp"])}  '
+              f'{_format_stats(group["dmg"])}  {_format_stats(group["heal"])}')
+
+    print('\ncalibration (a higher bucket should have a higher hit rate and lower MAE)')
+    for kind, metric, label in (('confidence', 'hp', 'solver'), ('dmg_confidence', 'dmg', 'damage')):
+        for level in CONFIDENCE_LEVELS:
+            stats = report[kind].get(level, {}).get(metric, {'n': 0})
+            print(f'  {label:<7} {level:<7} {stats["n"]:>8}  {_format_stats(stats)}')
+
+
+# Sweeps ---------------------------------------------------------------------------------------------------
+
+
+def parse_sweep(specs: Sequence[str]) -> List[Override]:
+    """``['damage.emaWindow=2,3', 'damage.highAge=1,2']`` -> the cartesian product as config overrides."""
+    axes: List[Tuple[str, str, List[object]]] = []
+    for spec in specs:
+        key, _, values = spec.partition('=')
+        section, _, name = key.partition('.')
+        if not section or not name or not values:
+            raise SystemExit(f'invalid --sweep {spec!r}; expected section.key=v1,v2,...')
+        axes.append((section, name, [_number(value) for value in values.split(',')]))
+    combinations: List[Override] = []
+    for values in itertools.product(*(axis[2] for axis in axes)):
+        override: Override = {}
+        for (section, name, _), value in zip(axes, values):
+            override.setdefault(section, {})[name] = value
+        combinations.append(override)
+    return combinations
+
+
+def _number(value: str) -> object:
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def describe(override: Override) -> str:
+    return ' '.join(f'{section}.{name}={value}' for section, settings in override.items()
+                    for name, value in settings.items()) or 'defaults'
+
+
+def _replay_job(log: Path, output: Path, options: dict, lua: Optional[str]) -> dict:
+    summary = run_replay(log, output, options, lua)
+    return {key: summary.get(key) for key in ('rows', 'errors', 'first_error', 'wall_seconds')}
+
+
+def replay_all(logs: Sequence[Path], overrides: Sequence[Override], options: dict, workdir: Path,
+               jobs: int, lua: Optional[str]) -> List[List[Path]]:
+    """Replay every log under every override in a process pool; returns the outputs per override."""
+    outputs = [[workdir / f'{index}-{log.name}{OUTPUT_SUFFIX}' for log in logs] for index in range(len(overrides))]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        for override, paths in zip(overrides, outputs):
+            job_options = dict(options, config=override) if override else dict(options)
+            futures += [(override, log, pool.submit(_replay_job, log, path, job_options, lua))
+                        for log, path in zip(logs, paths)]
+        for override, log, future in futures:
+            result = future.result()
+            if result.get('errors'):
+                raise SystemExit(f'{describe(override)}: {result["errors"]} addon errors, first: {result["first_error"]}')
+            if not result.get('rows'):
+                raise SystemExit(f'{log}: replay recorded no rows; is it a combat log?')
+    return outputs
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', type=Path, nargs='+', help='replay files (any name) or combat logs')
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help='error that still counts as a hit, as a fraction of max HP (default 0.05)')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    parser.add_argument('--sweep', action='append', default=[], metavar='SECTION.KEY=V1,V2',
+                        help='replay logs once per value (repeatable; all combinations are run)')
+    parser.add_argument('--objective', choices=OBJECTIVES, default='hp_mae', help='sweep ranking (default hp_mae)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='parallel replays (default: CPU count)')
+    parser.add_argument('--horizon', type=float, action='append', help='horizons for replayed logs (default 1.5)')
+    parser.add_argument('--tick', type=float, default=0.2, help='recording interval for replayed logs')
+    parser.add_argument('--encounters-only', action='store_true', help='replay only between ENCOUNTER_START/END')
+    parser.add_argument('--year', type=int, help='year for logs whose timestamps omit it')
+    parser.add_argument('--lua', help='Lua 5.1/LuaJIT interpreter for replays (default: embedded lupa)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    # Replay files are recognised by their header: replay_combatlog.py --output accepts any name.
+    columnar = {path: is_columnar(path) for path in args.inputs}
+    replays = [path for path in args.inputs if columnar[path]]
+    logs = [path for path in args.inputs if not columnar[path]]
+    if args.sweep and replays:
+        raise SystemExit('--sweep needs combat logs, not replay files')
+
+    options: dict = {'mode': 'fast', 'tick': args.tick, 'horizons': args.horizon or [1.5]}
+    if args.encounters_only:
+        options['encountersOnly'] = True
+    if args.year:
+        options['year'] = args.year
+    overrides = parse_sweep(args.sweep) if args.sweep else [{}]
+
+    with tempfile.TemporaryDirectory(prefix='nod-score-') as workdir:
+        outputs = replay_all(logs, overrides, options, Path(workdir), args.jobs, args.lua) if logs else [[]]
+        results = [(override, score_files(replays + paths, args.tolerance)) for override, paths in zip(overrides, outputs)]
+
+    if not args.sweep:
+        scores = results[0][1]
+        if args.json:
+            print(json.dumps(scores.to_json(), indent=2))
+        else:
+            print_report(scores, args.tolerance)
+        return 0
+
+    ranked = sorted(results, key=lambda item: item[1].objective(args.objective))
+    if args.json:
+        print(json.dumps([{'config': override, args.objective: scores.objective(args.objective), **scores.to_json()}
+                          for override, scores in ranked], indent=2))
+        return 0
+    print(f'{len(ranked)} configurations ranked by {args.objective} '
+          f'({len(logs)} log(s), hit = |error| <= {args.tolerance:.0%} of max HP)')
+    print(f'{"rank":>4}  {"hp MAE":>10} {"hp %max":>8} {"hp hit":>7} {"dmg MAE":>10} {"heal MAE":>10}  config')
+    for rank, (override, scores) in enumerate(ranked, 1):
+        hp, dmg, heal = (stats.summary() for stats in (scores.overall.hp, scores.overall.dmg, scores.overall.heal))
+        if not hp.get('n'):
+            print(f'{rank:>4}  {"no scored rows":>49}  {describe(override)}')
+            continue
+        print(f'{rank:>4}  {hp["mae"]:>10,.0f} {hp["mae_pct"]:>7.2f}% {hp["hit_rate"]:>7.1%} '
+              f'{dmg["mae"]:>10,.0f} {heal["mae"]:>10,.0f}  {describe(override)}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,476 @@
+-- Headless stand-ins for the WoW client API used by Config/ and Core/.
+-- Purpose: Let the Core pipeline run on a stock Lua 5.1/LuaJIT interpreter with a virtual clock.
+-- Usage: local World = dofile("scripts/bench/wow_stubs.lua"); World.install(); World.setRoster(25)
+-- Note: Only the calls Core actually makes are modelled; everything else on a frame is a no-op.
+
+local ipairs = ipairs
+local pairs = pairs
+local type = type
+local format = string.format
+local match = string.match
+local unpack = unpack or table.unpack
+
+local World = {
+  now = 1000,
+  units = {},
+  roster = {},
+  byGUID = {},
+  frames = {},
+  tickers = {},
+  cleu = { n = 0 },
+  inCombat = false,
+  targetToken = nil,
+  raid = true,
+}
+
+local function noop() end
+
+-- Frames ----------------------------------------------------------------------
+
+local Frame = {}
+local frameMeta = {
+  __index = function(_, key)
+    local method = Frame[key]
+    if method ~= nil then
+      return method
+    end
+    return noop
+  end,
+}
+
+function Frame:RegisterEvent(event)
+  self.events[event] = true
+end
+
+function Frame:UnregisterEvent(event)
+  self.events[event] = nil
+end
+
+function Frame:IsEventRegistered(event)
+  return self.events[event] == true
+end
+
+function Frame:UnregisterAllEvents()
+  for event in pairs(self.events) do
+    self.events[event] = nil
+  end
+end
+
+function Frame:SetScript(name, handler)
+  self.scripts[name] = handler
+end
+
+function Frame:GetScript(name)
+  return self.scripts[name]
+end
+
+local function createFrame()
+  local frame = setmetatable({ events = {}, scripts = {} }, frameMeta)
+  World.frames[#World.frames + 1] = frame
+  return frame
+end
+
+-- Fire an event at every frame registered for it, in creation order (as the client does).
+function World.fire(event, ...)
+  local frames = World.frames
+  for index = 1, #frames do
+    local frame = frames[index]
+    if frame.events[event] then
+      local handler = frame.scripts.OnEvent
+      if handler then
+        handler(frame, event, ...)
+      end
+    end
+  end
+end
+
+-- Publish a combat log record (array + n) and fire COMBAT_LOG_EVENT_UNFILTERED for it.
+function World.fireCombatLog(record)
+  World.cleu = record
+  World.fire("COMBAT_LOG_EVENT_UNFILTERED")
+end
+
+local function combatLogGetCurrentEventInfo()
+  local record = World.cleu
+  return unpack(record, 1, record.n)
+end
+
+-- Timers ----------------------------------------------------------------------
+
+local Ticker = {}
+Ticker.__index = Ticker
+
+function Ticker:Cancel()
+  self.cancelled = true
+end
+
+function Ticker:IsCancelled()
+  return self.cancelled == true
+end
+
+local function newTicker(interval, callback, iterations)
+  local ticker = setmetatable({
+    interval = interval,
+    callback = callback,
+    remaining = iterations,
+    nextAt = World.now + interval,
+    cancelled = false,
+  }, Ticker)
+  World.tickers[#World.tickers + 1] = ticker
+  return ticker
+end
+
+local function after(delay, callback)
+  newTicker(delay, callback, 1)
+end
+
+-- Move the clock to `time`, running due timers in time order (creation order on ties).
+-- Returns the number of callbacks fired.
+function World.advance(time)
+  local fired = 0
+  local tickers = World.tickers
+  while true do
+    local due
+    for index = 1, #tickers do
+      local ticker = tickers[index]
+      if not ticker.cancelled and ticker.nextAt <= time and (not due or ticker.nextAt < due.nextAt) then
+        due = ticker
+      end
+    end
+    if not due then
+      break
+    end
+    World.now = due.nextAt
+    due.nextAt = due.nextAt + due.interval
+    due.callback(due)
+    fired = fired + 1
+    if due.remaining then
+      due.remaining = due.remaining - 1
+      if due.remaining <= 0 then
+        due.cancelled = true
+      end
+    end
+  end
+  for index = #tickers, 1, -1 do
+    if tickers[index].cancelled then
+      table.remove(tickers, index)
+    end
+  end
+  World.now = time
+  return fired
+end
+
+-- Units -----------------------------------------------------------------------
+
+local AURA_SLOTS = 8
+
+local function newAura()
+  return { active = false, name = "", spellId = 0, duration = 0, expirationTime = 0, source = nil }
+end
+
+local function newUnit(index, token, guid, name)
+  local auras = {}
+  for slot = 1, AURA_SLOTS do
+    auras[slot] = newAura()
+  end
+  return {
+    token = token,
+    index = index,
+    guid = guid or format("Player-4184-%08X", index),
+    name = name or ("Member" .. index),
+    class = "PRIEST",
+    hp = 400000,
+    maxhp = 400000,
+    absorbs = 0,
+    incoming = 0,
+    dead = false,
+    ghost = false,
+    connected = true,
+    auras = auras,
+  }
+end
+
+-- Append a raid member (raid<N>); the first member is also "player". Returns the unit.
+function World.addMember(guid, name)
+  local roster = World.roster
+  local index = #roster + 1
+  local unit = newUnit(index, "raid" .. index, guid, name)
+  roster[index] = unit
+  World.units[unit.token] = unit
+  World.byGUID[unit.guid] = unit
+  if index == 1 then
+    World.setPlayer(unit)
+  end
+  World.raid = true
+  return unit
+end
+
+-- Make `unit` answer to the "player" token.
+function World.setPlayer(unit)
+  World.units.player = unit
+  World.player = unit
+end
+
+-- Build a raid (or a solo player when size <= 1); raid1 is the player.
+function World.setRoster(size, classes)
+  local units, roster, byGUID = World.units, World.roster, World.byGUID
+  for key in pairs(units) do
+    units[key] = nil
+  end
+  for key in pairs(byGUID) do
+    byGUID[key] = nil
+  end
+  for index = #roster, 1, -1 do
+    roster[index] = nil
+  end
+
+  for index = 1, math.max(size, 1) do
+    local unit = World.addMember()
+    if classes then
+      unit.class = classes[(index - 1) % #classes + 1]
+    end
+  end
+  if size <= 1 then
+    local unit = roster[1]
+    units[unit.token] = nil
+    unit.token = "player"
+    World.raid = false
+  end
+end
+
+local function resolve(token)
+  if type(token) ~= "string" then
+    return nil
+  end
+  local unit = World.units[token]
+  if unit then
+    return unit
+  end
+  if token == "target" and World.targetToken then
+    return World.units[World.targetToken]
+  end
+  return nil
+end
+
+World.resolve = resolve
+
+-- A duration of 0 marks a permanent aura (expirationTime 0), as UnitAura reports them.
+function World.setAura(unit, slot, spellId, duration, source, name)
+  local aura = unit.auras[slot]
+  if not aura then
+    aura = newAura()
+    unit.auras[slot] = aura
+  end
+  aura.active = true
+  aura.name = name or ("Spell" .. spellId)
+  aura.spellId = spellId
+  aura.duration = duration
+  aura.expirationTime = duration > 0 and World.now + duration or 0
+  aura.source = source
+end
+
+function World.clearAura(unit, slot)
+  unit.auras[slot].active = false
+end
+
+local function unitAura(token, index, filter)
+  local unit = resolve(token)
+  if not unit or (filter and not match(filter, "HELPFUL")) then
+    return nil
+  end
+  local seen = 0
+  local auras = unit.auras
+  for slot = 1, #auras do
+    local aura = auras[slot]
+    if aura.active and (aura.expirationTime == 0 or aura.expirationTime > World.now) then
+      seen = seen + 1
+      if seen == index then
+        return aura.name, 136081, 1, nil, aura.duration, aura.expirationTime, aura.source, false, false, aura.spellId
+      end
+    end
+  end
+  return nil
+end
+
+local function unitCastingInfo(token)
+  local unit = resolve(token)
+  local cast = unit and unit.cast
+  if not cast or cast.endTime <= World.now then
+    return nil
+  end
+  return cast.name, "", 136041, cast.startTime * 1000, cast.endTime * 1000, false, cast.castGUID, false, cast.spellID
+end
+
+-- Addon ---------------------------------------------------------------------
+
+local ADDON_NAME = "NOD_Heal"
+
+local function tocFiles(root)
+  local files = {}
+  local handle = assert(io.open(root .. "/" .. ADDON_NAME .. ".toc", "r"))
+  for line in handle:lines() do
+    local path = line:gsub("\r$", ""):match("^%s*(.-)%s*$")
+    if path ~= "" and not path:match("^#") and (path:match("^Config/") or path:match("^Core/")) then
+      files[#files + 1] = path:gsub("\\", "/")
+    end
+  end
+  handle:close()
+  return files
+end
+
+-- Load Config/ + Core/ in .toc order (UI/ needs real widgets) and fire the login events.
+function World.loadAddon(root)
+  local addonTable = {}
+  for _, path in ipairs(tocFiles(root)) do
+    local chunk = assert(loadfile(root .. "/" .. path))
+    chunk(ADDON_NAME, addonTable)
+  end
+  World.fire("ADDON_LOADED", ADDON_NAME)
+  World.fire("PLAYER_ENTERING_WORLD")
+  World.fire("GROUP_ROSTER_UPDATE")
+  return _G.NODHeal
+end
+
+-- Install ---------------------------------------------------------------------
+
+-- The game client's xpcall forwards extra arguments (as Lua 5.2+/LuaJIT do); stock Lua 5.1 drops them.
+local function forwardingXpcall()
+  local _, forwarded = xpcall(function(value)
+    return value
+  end, noop, true)
+  if forwarded then
+    return xpcall
+  end
+  local xpcall51 = xpcall
+  return function(func, handler, ...)
+    local count = select("#", ...)
+    if count == 0 then
+      return xpcall51(func, handler)
+    end
+    local args = { ... }
+    return xpcall51(function()
+      return func(unpack(args, 1, count))
+    end, handler)
+  end
+end
+
+function World.install(env)
+  env = env or _G
+
+  env.xpcall = forwardingXpcall()
+  env.GetTime = function()
+    return World.now
+  end
+  env.date = os.date
+  env.print = noop
+  env.wipe = function(tbl)
+    for key in pairs(tbl) do
+      tbl[key] = nil
+    end
+    return tbl
+  end
+  env.CreateFrame = createFrame
+  env.C_Timer = { NewTicker = newTicker, After = after }
+  env.InCombatLockdown = function()
+    return World.inCombat
+  end
+  env.CombatLogGetCurrentEventInfo = combatLogGetCurrentEventInfo
+  env.SlashCmdList = {}
+  env.NODHealDB = nil
+
+  env.IsInRaid = function()
+    return World.raid
+  end
+  env.IsInGroup = function()
+    return World.raid
+  end
+  env.GetNumGroupMembers = function()
+    return World.raid and #World.roster or 0
+  end
+
+  env.UnitExists = function(token)
+    return resolve(token) ~= nil
+  end
+  env.UnitGUID = function(token)
+    local unit = resolve(token)
+    return unit and unit.guid or nil
+  end
+  env.UnitName = function(token)
+    local unit = resolve(token)
+    return unit and unit.name or nil
+  end
+  env.UnitClass = function(token)
+    local unit = resolve(token)
+    if unit then
+      return unit.class, unit.class
+    end
+  end
+  env.UnitIsUnit = function(left, right)
+    local a, b = resolve(left), resolve(right)
+    return a ~= nil and a == b
+  end
+  env.UnitIsFriend = function(left, right)
+    return resolve(left) ~= nil and resolve(right) ~= nil
+  end
+  env.UnitHealth = function(token)
+    local unit = resolve(token)
+    return unit and unit.hp or 0
+  end
+  env.UnitHealthMax = function(token)
+    local unit = resolve(token)
+    return unit and unit.maxhp or 0
+  end
+  env.UnitGetTotalAbsorbs = function(token)
+    local unit = resolve(token)
+    return unit and unit.absorbs or 0
+  end
+  env.UnitGetIncomingHeals = function(token)
+    local unit = resolve(token)
+    return unit and unit.incoming or 0
+  end
+  env.UnitIsDeadOrGhost = function(token)
+    local unit = resolve(token)
+    return unit ~= nil and (unit.dead or unit.ghost)
+  end
+  env.UnitIsGhost = function(token)
+    local unit = resolve(token)
+    return unit ~= nil and unit.ghost
+  end
+  env.UnitIsFeignDeath = function()
+    return false
+  end
+  env.UnitIsConnected = function(token)
+    local unit = resolve(token)
+    return unit ~= nil and unit.connected
+  end
+  env.UnitAura = unitAura
+  env.UnitBuff = function(token, index)
+    return unitAura(token, index, "HELPFUL")
+  end
+  env.UnitCastingInfo = unitCastingInfo
+  env.UnitChannelInfo = function()
+    return nil
+  end
+
+  env.GetNetStats = function()
+    return 0, 0, 40, 60
+  end
+  env.C_CVar = {
+    GetCVar = function(name)
+      if name == "SpellQueueWindow" then
+        return "400"
+      end
+      return nil
+    end,
+  }
+  env.GetSpellCooldown = function()
+    return 0, 0, 1
+  end
+  env.GetSpellInfo = function(spellId)
+    return "Spell" .. tostring(spellId), nil, 136041, 1500, 0, 40, spellId
+  end
+
+  return World
+end
+
+return World
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Size report and learned-data compactor for the addon's SavedVariables file.
+
+Prints the size of every table down to ``--depth`` levels (``NODHealDB.learned``
+is depth 1) so it is clear what makes the file slow to load. With ``--output`` or
+``--in-place`` it also rewrites the learned HoT and cooldown tables: plain
+``learned.hots``/``learned.cds`` entries (numeric-string keys and legacy ``true``
+HoT markers normalized as LearnedStore.Save does) and an existing ``learned.packed``
+are merged, blocked, expired (``lastSeen`` older than ``--max-age-days``, default the
+``config.learn.agingHardDays`` setting) and low-confidence entries are dropped, and
+the rest is stored as ``learned.packed``, the flat layout Core/LearnedStore.lua
+expands on first use. Run it with the game closed; the client overwrites the file
+at logout.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from savedvariables import SavedVariablesError, Subtree, dumps, loads, subtree_sizes
+
+# Mirrors Core/LearnedStore.lua.
+FORMAT_VERSION = 1
+LAYOUTS = {
+    'hots': ('seen', 'avg_tick', 'period', 'lastTimestamp', 'lastSeen'),
+    'cds': ('class', 'lastSeen'),
+}
+ROUNDING = {'avg_tick': 100, 'period': 1000, 'lastTimestamp': 1000}
+EPOCH_MIN = 1_000_000_000
+SECONDS_PER_DAY = 86400
+DEFAULT_MAX_AGE_DAYS = 90
+# Older versions marked a known HoT as ``hots[spellId] = true``; packed as this record.
+LEGACY_RECORDS = {'hots': {'seen': 1}}
+
+Entry = Dict[str, object]
+
+
+@dataclass
+class Pruning:
+    now: float
+    max_age_days: float
+    min_seen: int
+    blocked: Set[int]
+
+
+@dataclass
+class KindStats:
+    kind: str
+    read: int = 0
+    kept: int = 0
+    dropped: Dict[str, int] = field(default_factory=dict)
+
+    def drop(self, reason: str) -> None:
+        self.dropped[reason] = self.dropped.get(reason, 0) + 1
+
+    def summary(self) -> str:
+        reasons = ', '.join(f'{count} {reason}' for reason, count in sorted(self.dropped.items())) or 'none dropped'
+        return f'{self.kind}: {self.read} read, {self.kept} kept ({reasons})'
+
+
+def _number(value: object) -> Optional[float]:
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def spell_id(key: object) -> Optional[int]:
+    """Positive integer spellId for a table key (numeric strings included), else None."""
+    if isinstance(key, str):
+        try:
+            key = float(key)
+        except ValueError:
+            return None
+    number = _number(key)
+    if number is not None and math.isfinite(number) and number > 0 and float(number).is_integer():
+        return int(number)
+    return None
+
+
+def as_map(table: object) -> Dict[object, object]:
+    if isinstance(table, list):
+        return dict(enumerate(table, 1))
+    return table if isinstance(table, dict) else {}
+
+
+def unpack(source: object) -> Dict[object, Entry]:
+    """Records of one ``learned.packed`` kind keyed by their stored spellId (first record wins)."""
+    if not isinstance(source, dict):
+        return {}
+    fields, data = source.get('fields'), source.get('data')
+    if not isinstance(fields, list) or not isinstance(data, list):
+        return {}
+    stride = len(fields) + 1
+    records: Dict[object, Entry] = {}
+    for offset in range(0, len(data) - stride + 1, stride):
+        values = data[offset + 1:offset + stride]
+        records.setdefault(data[offset], {
+            str(name): value for name, value in zip(fields, values) if value is not False and value is not None
+        })
+    return records
+
+
+def drop_reason(kind: str, spell: Optional[int], entry: object, pruning: Pruning) -> Optional[str]:
+    if spell is None or not isinstance(entry, dict):
+        return 'invalid'
+    if spell in pruning.blocked:
+        return 'blocked'
+    last_seen = _number(entry.get('lastSeen'))
+    # Stamps below EPOCH_MIN are GetTime() uptimes from older versions; their age is unknown.
+    if last_seen is not None and last_seen >= EPOCH_MIN \
+            and pruning.now - last_seen > pruning.max_age_days * SECONDS_PER_DAY:
+        return 'expired'
+    if entry == LEGACY_RECORDS.get(kind):
+        # A converted ``true`` marker has no statistics to judge; HotDetector.IsHot still relies on it.
+        return None
+    if kind == 'hots':
+        seen, tick = _number(entry.get('seen')), _number(entry.get('avg_tick'))
+        if seen is None or seen < pruning.min_seen or tick is None or not tick > 0:
+            return 'low confidence'
+    elif not isinstance(entry.get('class'), str) or entry['class'] == 'UNKNOWN':
+        return 'low confidence'
+    return None
+
+
+def rounded(name: str, value: object) -> object:
+    """Packed value as LearnedStore writes it: rounded to its step, False for nil."""
+    if value is None:
+        return False
+    steps = ROUNDING.get(name)
+    number = _number(value)
+    if steps and number is not None and math.isfinite(number):
+        return math.floor(number * steps + 0.5) / steps
+    return value
+
+
+def merged_entries(plain: Dict[object, object], packed: Dict[object, Entry],
+                   kind: str) -> List[Tuple[Optional[int], object]]:
+    """``(spellId, entry)`` pairs in the order LearnedStore.Save writes them: plain entries with number
+    keys, then numeric-string keys, then packed records; legacy ``true`` becomes LEGACY_RECORDS."""
+    def order(key: object) -> Tuple[bool, float, str]:
+        return isinstance(key, str), spell_id(key) or 0, str(key)
+
+    merged: List[Tuple[Optional[int], object]] = []
+    for key in sorted(plain, key=order):
+        entry = plain[key]
+        if entry is True and kind in LEGACY_RECORDS:
+            entry = dict(LEGACY_RECORDS[kind])
+        merged.append((spell_id(key), entry))
+    merged.extend((spell_id(key), packed[key]) for key in sorted(packed, key=order))
+    return merged
+
+
+def compact_kind(learned: Dict[str, object], packed: object, kind: str,
+                 pruning: Pruning) -> Tuple[KindStats, Dict[str, object]]:
+    """Pop ``learned[kind]`` and merge it with ``packed[kind]`` into one pruned record list, by spellId."""
+    # Plain entries are the live state of the last session and win over packed copies.
+    entries = merged_entries(as_map(learned.pop(kind, None)), unpack(as_map(packed).get(kind)), kind)
+
+    stats = KindStats(kind)
+    layout = LAYOUTS[kind]
+    records: Dict[int, Entry] = {}
+    claimed: Set[int] = set()
+    for spell, entry in entries:
+        stats.read += 1
+        # The first record for a spell decides it, as in LearnedStore.Save, even when it is pruned.
+        reason = 'duplicate' if spell in claimed else drop_reason(kind, spell, entry, pruning)
+        if reason != 'invalid' and spell is not None:
+            claimed.add(spell)
+        if reason:
+            stats.drop(reason)
+            continue
+        records[spell] = entry
+    data: List[object] = []
+    for spell in sorted(records):
+        data.append(spell)
+        data.extend(rounded(name, records[spell].get(name)) for name in layout)
+    stats.kept = len(records)
+    return stats, {'fields': list(layout), 'data': data}
+
+
+def compact(variables: Dict[str, object], pruning: Pruning) -> List[KindStats]:
+    database = variables.get('NODHealDB')
+    learned = database.get('learned') if isinstance(database, dict) else None
+    if not isinstance(learned, dict):
+        raise SavedVariablesError('no NODHealDB.learned table')
+    packed = learned.get('packed')
+    stats: List[KindStats] = []
+    result: Dict[str, object] = {'version': FORMAT_VERSION}
+    for kind in LAYOUTS:
+        kind_stats, records = compact_kind(learned, packed, kind, pruning)
+        stats.append(kind_stats)
+        result[kind] = records
+    learned['packed'] = result
+    return stats
+
+
+def blocked_ids(variables: Dict[str, object]) -> Set[int]:
+    database = as_map(variables.get('NODHealDB'))
+    block = as_map(as_map(database.get('learned')).get('block'))
+    return {spell for key, flag in block.items() if flag for spell in [spell_id(key)] if spell}
+
+
+def configured_max_age(variables: Dict[str, object]) -> float:
+    learn = as_map(as_map(as_map(variables.get('NODHealDB')).get('config')).get('learn'))
+    days = _number(learn.get('agingHardDays'))
+    return days if days and days > 0 else DEFAULT_MAX_AGE_DAYS
+
+
+def print_sizes(title: str, subtrees: Sequence[Subtree], total: int, min_bytes: int) -> None:
+    print(f'{title}: {total} bytes')
+    print(f'{"table":<56} {"bytes":>10} {"share":>7} {"entries":>8}')
+    for subtree in subtrees:
+        if subtree.size < min_bytes:
+            continue
+        path = '  ' * subtree.depth + subtree.path
+        share = subtree.size / total * 100 if total else 0.0
+        print(f'{path:<56} {subtree.size:>10} {share:>6.1f}% {subtree.entries:>8}')
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('savedvariables', type=Path, help='WTF/Account/<account>/SavedVariables/NOD_Heal.lua')
+    parser.add_argument('--depth', type=int, default=2, help='table levels to report (default 2)')
+    parser.add_argument('--min-bytes', type=int, default=0, help='hide tables smaller than this')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--output', type=Path, help='write the compacted file here')
+    target.add_argument('--in-place', action='store_true', help='overwrite the input file')
+    parser.add_argument('--max-age-days', type=float,
+                        help=f'drop entries not seen for this long (default config.learn.agingHardDays or {DEFAULT_MAX_AGE_DAYS})')
+    parser.add_argument('--min-seen', type=int, default=3, help='drop HoTs observed fewer times (default 3)')
+    parser.add_argument('--now', type=float, help='reference time for ages (default: current time)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    raw = args.savedvariables.read_bytes()
+    # latin-1 keeps one character per byte, so offsets from the scanner are byte counts.
+    print_sizes(str(args.savedvariables), subtree_sizes(raw.decode('latin-1'), args.depth), len(raw), args.min_bytes)
+
+    output = args.savedvariables if args.in_place else args.output
+    if output is None:
+        return 0
+
+    variables = loads(raw.decode('utf-8', errors='surrogateescape'))
+    pruning = Pruning(
+        now=args.now if args.now is not None else time.time(),
+        max_age_days=args.max_age_days if args.max_age_days is not None else configured_max_age(variables),
+        min_seen=args.min_seen,
+        blocked=blocked_ids(variables),
+    )
+    try:
+        stats = compact(variables, pruning)
+    except SavedVariablesError as error:
+        raise SystemExit(f'{args.savedvariables}: {error}') from None
+    result = dumps(variables).encode('utf-8', errors='surrogateescape')
+    output.write_bytes(result)
+
+    print()
+    for kind_stats in stats:
+        print(kind_stats.summary())
+    print_sizes(str(output), subtree_sizes(result.decode('latin-1'), args.depth), len(result), args.min_bytes)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
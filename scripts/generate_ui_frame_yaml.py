@@ -2,22 +2,52 @@
 """Generate YAML documentation for UI frames grouped by category."""
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import os
 import re
+import tempfile
+import time
+import tracemalloc
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
-SOURCE_FILE = Path('DOCU/NOD_Konzept_Funktionsliste.txt')
-OUTPUT_DIR = Path('docu/ui_frames')
+from ui_frame_index import IndexRow, replacement_mode, write_index
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SOURCE_FILE = REPO_ROOT / 'docs' / 'legacy' / 'DOCU' / 'NOD_Konzept_Funktionsliste.txt'
+OUTPUT_DIR = REPO_ROOT / 'docs' / 'legacy' / 'DOCU' / 'ui_frames'
+MERGED_OUTPUT_DIR = REPO_ROOT / 'docs' / 'legacy' / 'DOCU' / 'ui_frames_merged'
+MANIFEST_SUFFIX = '.manifest.json'
+MANIFEST_VERSION = 2
+INDEX_SUFFIX = '.sqlite'
+HASH_CHUNK_SIZE = 1024 * 1024
 MAX_ENTRIES_PER_FILE = 500
 AUTO_MIN_GROUP_SIZE = 10
+READ_CHUNK_SIZE = 64 * 1024
+RECORD_FIELDS = frozenset({'name', 'type'})
+SKIPPED_KEYS = frozenset({'frameDumpText'})
 
 @dataclass
 class FrameRecord:
     name: str
     type: str
 
+@dataclass
+class MergedFrame(FrameRecord):
+    """A frame seen in one or more dumps; ``type`` is the majority type across them."""
+    dumps: List[str] = field(default_factory=list)
+    type_variants: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def has_type_conflict(self) -> bool:
+        return len(self.type_variants) > 1
+
 @dataclass
 class CategoryRule:
     name: str
@@ -360,54 +390,368 @@ AUTO_LABEL_OVERRIDES: Dict[str, str] = {
 HEADER_COMMENT = '# Auto-generated from DOCU/NOD_Konzept_Funktionsliste.txt'
 
 
+_TOKEN_RE = re.compile(
+    r'\s*(?:([{}\[\]=,;])'
+    r'|"([^"\\]*(?:\\.[^"\\]*)*)"'
+    r"|'([^'\\]*(?:\\.[^'\\]*)*)'"
+    r'|([^\s{}\[\]=,;"\']+))',
+    re.S,
+)
+_SPACE_RE = re.compile(r'\s*')
+_STRING_BODY_RE = {
+    '"': re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S),
+    "'": re.compile(r"[^'\\]*(?:\\.[^'\\]*)*", re.S),
+}
+_ESCAPE_RE = re.compile(r'\\(\d{1,3}|.)', re.S)
+_PREFIX_RE = re.compile(r'([A-Za-z]+)')
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v'}
+
+
+def _unescape(raw: str) -> str:
+    if '\\' not in raw:
+        return raw
+
+    def replace(match: re.Match) -> str:
+        code = match.group(1)
+        if code.isdigit():
+            return chr(int(code))
+        return _ESCAPES.get(code, code)
+
+    return _ESCAPE_RE.sub(replace, raw)
+
+
+class LuaTableTokenizer:
+    """Incremental tokenizer for Lua table dumps read from a text stream.
+
+    Only a window of roughly ``chunk_size`` characters is held in memory; string
+    values that the caller does not need are consumed without being buffered.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self.keep_strings = True
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _read_string(self, quote: str, keep: bool) -> Optional[str]:
+        body_re = _STRING_BODY_RE[quote]
+        pieces: List[str] = []
+        pos = self._pos + 1
+        while True:
+            buffer = self._buffer
+            end = body_re.match(buffer, pos).end()
+            if end < len(buffer) and buffer[end] == quote:
+                if keep:
+                    pieces.append(buffer[pos:end])
+                self._pos = end + 1
+                break
+            # Chunk boundary inside the string (a trailing backslash stays buffered).
+            if keep:
+                pieces.append(buffer[pos:end])
+            self._pos = end
+            if not self._fill():
+                self._pos = len(self._buffer)
+                break
+            pos = self._pos
+        return _unescape(''.join(pieces)) if keep else None
+
+    def tokens(self) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yield ``(kind, value)`` pairs until the stream is exhausted.
+
+        ``kind`` is the punctuation character itself, ``'string'`` or ``'atom'``.
+        While ``keep_strings`` is False, a string that spans chunks is consumed
+        without being collected and yields ``None`` as its value.
+        """
+        match_token = _TOKEN_RE.match
+        while True:
+            buffer = self._buffer
+            size = len(buffer)
+            eof = self._eof
+            pos = self._pos
+            while True:
+                match = match_token(buffer, pos)
+                if match is None:
+                    break
+                end = match.end()
+                if end == size and not eof:
+                    break
+                pos = end
+                group = match.lastindex
+                if group == 1:
+                    value = match.group(1)
+                    yield value, value
+                elif group == 4:
+                    yield 'atom', match.group(4)
+                else:
+                    yield 'string', _unescape(match.group(group))
+            self._pos = pos
+
+            start = _SPACE_RE.match(buffer, pos).end()
+            if match is None and start < size:
+                # String longer than the current window: stream through it.
+                self._pos = start
+                yield 'string', self._read_string(buffer[start], self.keep_strings)
+            elif not self._fill() and start >= size:
+                return
+
+
+def iter_frame_records(stream: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[FrameRecord]:
+    """Yield every table carrying string ``name`` and ``type`` fields as a FrameRecord.
+
+    Tolerates arbitrary whitespace and line endings, unbalanced braces at the
+    edges of a truncated dump and nested tables of any depth. Values stored
+    under ``SKIPPED_KEYS`` (the multi-megabyte ``frameDumpText``) are skipped.
+    """
+    tokenizer = LuaTableTokenizer(stream, chunk_size)
+    stack: List[Dict[str, str]] = []
+    key: Optional[str] = None
+    in_brackets = False
+    assigning = False
+    skip_depth = 0
+
+    for kind, value in tokenizer.tokens():
+        if skip_depth:
+            if kind == '{':
+                skip_depth += 1
+            elif kind == '}':
+                skip_depth -= 1
+        elif kind == '{':
+            if assigning and key in SKIPPED_KEYS:
+                skip_depth = 1
+            else:
+                stack.append({})
+            key = None
+            assigning = False
+        elif kind == '}':
+            if stack:
+                fields = stack.pop()
+                name = fields.get('name')
+                frame_type = fields.get('type')
+                if name and frame_type:
+                    yield FrameRecord(name=name, type=frame_type)
+            key = None
+            assigning = False
+        elif kind == '[':
+            in_brackets = True
+        elif kind == ']':
+            in_brackets = False
+        elif kind == '=':
+            assigning = key is not None
+        elif kind in (',', ';'):
+            key = None
+            assigning = False
+        elif in_brackets:
+            key = value
+        elif assigning:
+            if kind == 'string' and key in RECORD_FIELDS and stack:
+                stack[-1][key] = value
+            key = None
+            assigning = False
+        elif kind == 'atom':
+            key = value
+        tokenizer.keep_strings = not skip_depth and not (assigning and key in SKIPPED_KEYS)
+
+
+def iter_records(source: Path, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[FrameRecord]:
+    with source.open('r', encoding='utf-8', errors='ignore', newline='') as stream:
+        yield from iter_frame_records(stream, chunk_size)
+
+
 def parse_records(source: Path) -> List[FrameRecord]:
-    text = source.read_text(encoding='utf-8', errors='ignore')
-    raw_entries = text.strip()[1:-1].split('},\n{')
-    records: List[FrameRecord] = []
-    for raw in raw_entries:
-        if 'frameDumpText' in raw:
-            continue
-        name = None
-        frame_type = None
-        for line in raw.splitlines():
-            line = line.strip()
-            if line.startswith('["name"]'):
-                name = line.split('=', 1)[1].strip().strip(',').strip('"')
-            elif line.startswith('["type"]'):
-                frame_type = line.split('=', 1)[1].strip().strip(',').strip('"')
-        if name and frame_type:
-            records.append(FrameRecord(name=name, type=frame_type))
-    return records
-
-
-def match_rule(name: str, patterns: Sequence[str]) -> bool:
-    for pattern in patterns:
-        if name.startswith(pattern):
-            return True
-    return False
-
-
-def assign_manual(records: Iterable[FrameRecord]) -> tuple[Dict[str, List[FrameRecord]], List[FrameRecord]]:
+    return list(iter_records(source))
+
+
+@dataclass
+class PatternConflict:
+    kind: str
+    pattern: str
+    rule: str
+    winner_pattern: str
+    winner_rule: str
+
+    def describe(self) -> str:
+        if self.kind == 'shadowed':
+            return (
+                f"pattern '{self.pattern}' ({self.rule}) never wins: "
+                f"'{self.winner_pattern}' ({self.winner_rule}) takes precedence"
+            )
+        if self.kind == 'redundant':
+            return f"pattern '{self.pattern}' ({self.rule}) is covered by '{self.winner_pattern}' in the same rule"
+        if self.kind == 'overlap':
+            return (
+                f"pattern '{self.pattern}' ({self.rule}) overlaps '{self.winner_pattern}' "
+                f"({self.winner_rule}); rule order decides"
+            )
+        return (
+            f"auto label override '{self.pattern}' is unreachable: "
+            f"'{self.winner_pattern}' ({self.winner_rule}) claims those frames first"
+        )
+
+
+class _TrieNode:
+    __slots__ = ('children', 'rule_index', 'pattern', 'subtree_min')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        self.rule_index: Optional[int] = None
+        self.pattern: Optional[str] = None
+        self.subtree_min = 0
+
+
+class CategoryClassifier:
+    """Prefix trie over every manual rule pattern.
+
+    A name belongs to the first rule (in ``MANUAL_RULES`` order) owning any
+    pattern that prefixes it. Each node stores the lowest rule index in its
+    subtree, so a lookup walks the name once and stops as soon as no deeper
+    pattern could beat the best match so far.
+    """
+
+    def __init__(self, rules: Sequence[CategoryRule], overrides: Optional[Dict[str, str]] = None) -> None:
+        self._rule_names = [rule.name for rule in rules]
+        self._no_match = len(rules)
+        self._root = _TrieNode()
+        self._root.subtree_min = self._no_match
+        self.conflicts: List[PatternConflict] = []
+
+        for index, rule in enumerate(rules):
+            for pattern in rule.patterns:
+                self._insert(pattern, index)
+        self._collect_pattern_conflicts(rules)
+        if overrides:
+            self._collect_override_conflicts(overrides)
+
+    def _insert(self, pattern: str, rule_index: int) -> None:
+        node = self._root
+        for char in pattern:
+            child = node.children.get(char)
+            if child is None:
+                child = _TrieNode()
+                child.subtree_min = rule_index
+                node.children[char] = child
+            elif rule_index < child.subtree_min:
+                child.subtree_min = rule_index
+            node = child
+        if node.rule_index is None or rule_index < node.rule_index:
+            node.rule_index = rule_index
+            node.pattern = pattern
+
+    def _winner(self, text: str, exclude_exact: bool) -> Optional[_TrieNode]:
+        """Return the terminal node that decides ``text`` (ignoring ``text`` itself when asked)."""
+        best: Optional[_TrieNode] = None
+        node = self._root
+        last = len(text) - 1
+        for position, char in enumerate(text):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.rule_index is None or (exclude_exact and position == last):
+                continue
+            if best is None or node.rule_index < best.rule_index:
+                best = node
+        return best
+
+    def _collect_pattern_conflicts(self, rules: Sequence[CategoryRule]) -> None:
+        seen: Dict[str, int] = {}
+        for index, rule in enumerate(rules):
+            for pattern in rule.patterns:
+                previous = seen.get(pattern)
+                if previous is not None and previous < index:
+                    self.conflicts.append(PatternConflict('shadowed', pattern, rule.name, pattern, rules[previous].name))
+                    continue
+                seen.setdefault(pattern, index)
+                winner = self._winner(pattern, exclude_exact=True)
+                if winner is None:
+                    continue
+                if winner.rule_index < index:
+                    self.conflicts.append(
+                        PatternConflict('shadowed', pattern, rule.name, winner.pattern, rules[winner.rule_index].name)
+                    )
+                elif winner.rule_index == index:
+                    self.conflicts.append(PatternConflict('redundant', pattern, rule.name, winner.pattern, rule.name))
+                else:
+                    self.conflicts.append(
+                        PatternConflict('overlap', pattern, rule.name, winner.pattern, rules[winner.rule_index].name)
+                    )
+
+    def _collect_override_conflicts(self, overrides: Dict[str, str]) -> None:
+        # Overrides are keyed by the lower-cased alphabetic prefix, so compare case-insensitively.
+        patterns: List[Tuple[str, int]] = []
+        self._walk_patterns(self._root, '', patterns)
+        for prefix in sorted(overrides):
+            best: Optional[Tuple[int, str]] = None
+            for pattern, rule_index in patterns:
+                if prefix.startswith(pattern.lower()) and (best is None or rule_index < best[0]):
+                    best = (rule_index, pattern)
+            if best is not None:
+                self.conflicts.append(
+                    PatternConflict('override', prefix, 'auto', best[1], self._rule_names[best[0]])
+                )
+
+    def _walk_patterns(self, node: _TrieNode, prefix: str, into: List[Tuple[str, int]]) -> None:
+        if node.rule_index is not None:
+            into.append((prefix, node.rule_index))
+        for char, child in node.children.items():
+            self._walk_patterns(child, prefix + char, into)
+
+    def classify(self, name: str) -> Optional[str]:
+        best = self._no_match
+        node = self._root
+        for char in name:
+            node = node.children.get(char)
+            if node is None or node.subtree_min >= best:
+                break
+            rule_index = node.rule_index
+            if rule_index is not None and rule_index < best:
+                best = rule_index
+        if best == self._no_match:
+            return None
+        return self._rule_names[best]
+
+
+@lru_cache(maxsize=None)
+def default_classifier() -> CategoryClassifier:
+    return CategoryClassifier(MANUAL_RULES, AUTO_LABEL_OVERRIDES)
+
+
+def assign_manual(
+    records: Iterable[FrameRecord],
+    classifier: Optional[CategoryClassifier] = None,
+) -> tuple[Dict[str, List[FrameRecord]], List[FrameRecord]]:
+    classifier = classifier or default_classifier()
     buckets: Dict[str, List[FrameRecord]] = {rule.name: [] for rule in MANUAL_RULES}
     leftover: List[FrameRecord] = []
     for record in records:
-        matched = False
-        for rule in MANUAL_RULES:
-            if match_rule(record.name, rule.patterns):
-                buckets[rule.name].append(record)
-                matched = True
-                break
-        if not matched:
+        category = classifier.classify(record.name)
+        if category is None:
             leftover.append(record)
+        else:
+            buckets[category].append(record)
     return buckets, leftover
 
 
+def frame_prefix(name: str) -> str:
+    match = _PREFIX_RE.match(name)
+    return match.group(1).lower() if match else 'misc'
+
+
 def group_by_prefix(records: Iterable[FrameRecord]) -> Dict[str, List[FrameRecord]]:
     groups: Dict[str, List[FrameRecord]] = defaultdict(list)
     for record in records:
-        match = re.match(r'([A-Za-z]+)', record.name)
-        prefix = match.group(1).lower() if match else 'misc'
-        groups[prefix].append(record)
+        groups[frame_prefix(record.name)].append(record)
     return groups
 
 
@@ -437,21 +781,101 @@ def chunk_entries(entries: Sequence[FrameRecord], max_size: int = MAX_ENTRIES_PE
     return [list(entries[i:i + max_size]) for i in range(0, len(entries), max_size)]
 
 
-def write_yaml_file(path: Path, category_name: str, description: str, entries: Sequence[FrameRecord]) -> None:
-    lines: List[str] = [HEADER_COMMENT, f'# Category: {category_name}', f'# Description: {description}', '']
+def render_yaml(
+    category_name: str,
+    description: str,
+    entries: Sequence[FrameRecord],
+    header: str = HEADER_COMMENT,
+) -> str:
+    lines: List[str] = [header, f'# Category: {category_name}', f'# Description: {description}', '']
     for record in entries:
         key = sanitize_key(record.name)
         lines.append(f"'{key}':")
         lines.append(f'  type: {record.type}')
         lines.append("  description: ''")
-        lines.append('  source: NOD_Konzept_Funktionsliste.txt')
+        if isinstance(record, MergedFrame):
+            lines.append('  sources:')
+            lines.extend(f"    - '{sanitize_key(dump)}'" for dump in record.dumps)
+            if record.has_type_conflict:
+                lines.append('  type_conflicts:')
+                for frame_type, dumps in sorted(record.type_variants.items()):
+                    listed = ', '.join(f"'{sanitize_key(dump)}'" for dump in dumps)
+                    lines.append(f'    {frame_type}: [{listed}]')
+        else:
+            lines.append('  source: NOD_Konzept_Funktionsliste.txt')
     lines.append('')
+    return '\n'.join(lines)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write via a sibling temp file + rename so readers never observe a partial file."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text('\n'.join(lines), encoding='utf-8')
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.chmod(tmp_name, replacement_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
 
 
-def main() -> None:
-    records = parse_records(SOURCE_FILE)
+def write_yaml_file(path: Path, category_name: str, description: str, entries: Sequence[FrameRecord]) -> None:
+    write_atomic(path, render_yaml(category_name, description, entries).encode('utf-8'))
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open('rb') as handle:
+        for block in iter(lambda: handle.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def manifest_path(output_dir: Path) -> Path:
+    return output_dir.with_name(output_dir.name + MANIFEST_SUFFIX)
+
+
+def index_path(output_dir: Path) -> Path:
+    return output_dir.with_name(output_dir.name + INDEX_SUFFIX)
+
+
+def load_manifest(path: Path) -> Dict[str, object]:
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data
+
+
+def build_outputs(
+    records: Iterable[FrameRecord],
+    header: str = HEADER_COMMENT,
+    index_rows: Optional[List[IndexRow]] = None,
+) -> Dict[str, bytes]:
+    """Render every category file in memory, keyed by file name.
+
+    When ``index_rows`` is given, it receives one (name, type, prefix, category, file) row per entry.
+    """
+    outputs: Dict[str, bytes] = {}
+
+    def emit(filename: str, category_name: str, description: str, entries: Sequence[FrameRecord]) -> None:
+        outputs[filename] = render_yaml(category_name, description, entries, header).encode('utf-8')
+        if index_rows is not None:
+            index_rows.extend(
+                (record.name, record.type, frame_prefix(record.name), category_name, filename) for record in entries
+            )
+
     manual_buckets, leftover = assign_manual(records)
 
     groups = group_by_prefix(leftover)
@@ -462,15 +886,15 @@ def main() -> None:
         entries = sorted(manual_buckets[rule.name], key=lambda rec: rec.name)
         if not entries:
             # Ensure the file exists even if empty to signal intentional absence.
-            write_yaml_file(OUTPUT_DIR / f'{rule.name}.yaml', rule.name, rule.description, [])
+            emit(f'{rule.name}.yaml', rule.name, rule.description, [])
             continue
         chunks = chunk_entries(entries)
         if len(chunks) == 1:
-            write_yaml_file(OUTPUT_DIR / f'{rule.name}.yaml', rule.name, rule.description, chunks[0])
+            emit(f'{rule.name}.yaml', rule.name, rule.description, chunks[0])
         else:
             for index, chunk in enumerate(chunks, start=1):
                 suffix = f'_{index}'
-                write_yaml_file(OUTPUT_DIR / f'{rule.name}{suffix}.yaml', rule.name, rule.description, chunk)
+                emit(f'{rule.name}{suffix}.yaml', rule.name, rule.description, chunk)
 
     # Write auto-generated prefix groups.
     for prefix, entries in sorted(auto_groups.items(), key=lambda item: item[0]):
@@ -479,21 +903,284 @@ def main() -> None:
         sorted_entries = sorted(entries, key=lambda rec: rec.name)
         chunks = chunk_entries(sorted_entries)
         if len(chunks) == 1:
-            filename = f'{label}.yaml'
-            write_yaml_file(OUTPUT_DIR / filename, label, description, chunks[0])
+            emit(f'{label}.yaml', label, description, chunks[0])
         else:
             for index, chunk in enumerate(chunks, start=1):
-                filename = f'{label}_{index}.yaml'
-                write_yaml_file(OUTPUT_DIR / filename, label, description, chunk)
+                emit(f'{label}_{index}.yaml', label, description, chunk)
 
     # Write unsorted entries last.
     unsorted_sorted = sorted(unsorted_entries, key=lambda rec: rec.name)
-    write_yaml_file(
-        OUTPUT_DIR / 'unsorted.yaml',
-        'unsorted',
-        'Entries without a dominant prefix grouping (<=500).',
-        unsorted_sorted,
+    emit('unsorted.yaml', 'unsorted', 'Entries without a dominant prefix grouping (<=500).', unsorted_sorted)
+    return outputs
+
+
+def sync_outputs(
+    output_dir: Path,
+    outputs: Dict[str, bytes],
+    previous: Dict[str, str],
+    trust_manifest: bool = True,
+) -> Tuple[Dict[str, str], int, int]:
+    """Write changed files, drop files the previous run produced but this one did not.
+
+    Returns the new per-file hashes plus the number of files written and removed.
+    """
+    hashes: Dict[str, str] = {}
+    written = 0
+    for filename, data in outputs.items():
+        digest = sha256_bytes(data)
+        hashes[filename] = digest
+        path = output_dir / filename
+        if path.is_file():
+            known = previous.get(filename) if trust_manifest else None
+            if known is None:
+                # No manifest entry yet: compare against what is on disk instead of rewriting.
+                known = sha256_file(path)
+            if known == digest:
+                continue
+        write_atomic(path, data)
+        written += 1
+
+    removed = 0
+    for filename in sorted(set(previous) - set(outputs)):
+        try:
+            (output_dir / filename).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return hashes, written, removed
+
+
+def _regenerate(
+    output_dir: Path,
+    sources: Dict[str, str],
+    build: Callable[[List[IndexRow]], Dict[str, bytes]],
+    force: bool,
+) -> bool:
+    """Shared manifest check + sync for the single and merged modes."""
+    manifest_file = manifest_path(output_dir)
+    index_file = index_path(output_dir)
+    manifest = load_manifest(manifest_file)
+    generator_hash = sha256_file(Path(__file__))
+    previous = manifest.get('files') if isinstance(manifest.get('files'), dict) else {}
+
+    if (
+        not force
+        and manifest.get('sources') == sources
+        and manifest.get('generator_sha256') == generator_hash
+        and all((output_dir / filename).is_file() for filename in previous)
+        and index_file.is_file()
+    ):
+        print(f'{output_dir.name}: {len(sources)} source(s) unchanged, skipping ({len(previous)} files)')
+        return False
+
+    index_rows: List[IndexRow] = []
+    outputs = build(index_rows)
+    hashes, written, removed = sync_outputs(output_dir, outputs, previous, trust_manifest=not force)
+    # The index is a build artifact (not committed), so it is simply rebuilt whenever the YAML is re-checked.
+    indexed = write_index(index_file, index_rows, {'sources': ','.join(sorted(sources))})
+    payload = {
+        'version': MANIFEST_VERSION,
+        'sources': dict(sorted(sources.items())),
+        'generator_sha256': generator_hash,
+        'files': dict(sorted(hashes.items())),
+    }
+    write_atomic(manifest_file, (json.dumps(payload, indent=2) + '\n').encode('utf-8'))
+    print(
+        f'{output_dir.name}: wrote {written}, unchanged {len(hashes) - written}, removed {removed} '
+        f'(manifest {manifest_file.name}, index {index_file.name}: {indexed} frames)'
+    )
+    return True
+
+
+def generate(source: Path, output_dir: Path, force: bool = False) -> bool:
+    """Regenerate ``output_dir`` from ``source``; returns False when the manifest says nothing changed."""
+    return _regenerate(
+        output_dir,
+        {source.name: sha256_file(source)},
+        lambda index_rows: build_outputs(iter_records(source), index_rows=index_rows),
+        force,
+    )
+
+
+def dump_labels(paths: Sequence[Path]) -> List[str]:
+    """Label dumps by file name, falling back to the path relative to their common parent on clashes."""
+    names = [path.name for path in paths]
+    if len(set(names)) == len(names):
+        return names
+    common = Path(os.path.commonpath([str(path.resolve()) for path in paths]))
+    return [path.resolve().relative_to(common).as_posix() for path in paths]
+
+
+def _parse_dump(path: Path) -> List[Tuple[str, str]]:
+    """Process-pool worker: parse one dump into (name, type) pairs, first occurrence wins."""
+    seen: Dict[str, str] = {}
+    for record in iter_records(path):
+        seen.setdefault(record.name, record.type)
+    return list(seen.items())
+
+
+def parse_dumps(paths: Sequence[Path], jobs: Optional[int] = None) -> Iterator[List[Tuple[str, str]]]:
+    """Parse dumps in input order, spreading them over a process pool when there is more than one."""
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        for path in paths:
+            yield _parse_dump(path)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_parse_dump, paths)
+
+
+def merge_dumps(labels: Sequence[str], parsed: Iterable[List[Tuple[str, str]]]) -> Dict[str, MergedFrame]:
+    """Merge per-dump frame lists into one index keyed by frame name."""
+    index: Dict[str, MergedFrame] = {}
+    for label, frames in zip(labels, parsed):
+        for name, frame_type in frames:
+            merged = index.get(name)
+            if merged is None:
+                merged = index[name] = MergedFrame(name, frame_type)
+            merged.dumps.append(label)
+            merged.type_variants.setdefault(frame_type, []).append(label)
+
+    for merged in index.values():
+        if merged.has_type_conflict:
+            # Majority type wins; ties go to the type seen in the earliest dump.
+            variants = merged.type_variants
+            merged.type = max(variants, key=lambda frame_type: len(variants[frame_type]))
+    return index
+
+
+def generate_merged(
+    dumps: Sequence[Path],
+    output_dir: Path,
+    jobs: Optional[int] = None,
+    force: bool = False,
+) -> bool:
+    """Regenerate ``output_dir`` from the merged frame index of several dumps."""
+    labels = dump_labels(dumps)
+    sources = {label: sha256_file(path) for label, path in zip(labels, dumps)}
+
+    def build(index_rows: List[IndexRow]) -> Dict[str, bytes]:
+        index = merge_dumps(labels, parse_dumps(dumps, jobs))
+        conflicts = sum(1 for merged in index.values() if merged.has_type_conflict)
+        print(f'merged: dumps={len(dumps)} frames={len(index)} type_conflicts={conflicts}')
+        header = f'# Auto-generated from {len(dumps)} merged frame dumps'
+        return build_outputs(index.values(), header, index_rows)
+
+    return _regenerate(output_dir, sources, build, force)
+
+
+SYNTHETIC_PREFIXES = ('CompactRaidFrame', 'ChatFrame', 'ContainerFrame', 'ActionButton', 'QuestLogTitle')
+SYNTHETIC_TYPES = ('Frame', 'Button', 'FontString', 'Texture', 'StatusBar')
+
+
+def write_synthetic_dump(path: Path, record_count: int) -> None:
+    """Write a dump shaped like the client export, mixing LF/CRLF and spacing styles."""
+    with path.open('w', encoding='utf-8', newline='') as out:
+        out.write('{\r\n["frameDumpText"] = "')
+        for index in range(record_count):
+            prefix = SYNTHETIC_PREFIXES[index % len(SYNTHETIC_PREFIXES)]
+            frame_type = SYNTHETIC_TYPES[index % len(SYNTHETIC_TYPES)]
+            out.write(f'{prefix}{index} ({frame_type})\\n')
+        out.write('",\r\n["frames"] = {\r\n')
+        for index in range(record_count):
+            prefix = SYNTHETIC_PREFIXES[index % len(SYNTHETIC_PREFIXES)]
+            frame_type = SYNTHETIC_TYPES[index % len(SYNTHETIC_TYPES)]
+            newline = '\r\n' if index % 2 else '\n'
+            out.write('{' + newline)
+            out.write(f'  ["name"]  =  "{prefix}{index}Child",{newline}')
+            out.write(f'["type"]="{frame_type}",{newline}')
+            out.write('["anchor"] = { "TOPLEFT", 0, 0 },' + newline)
+            out.write('},' + newline)
+        out.write('},\r\n}\r\n')
+
+
+def benchmark_parser(record_count: int, chunk_size: int = READ_CHUNK_SIZE) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        dump = Path(tmp) / 'synthetic_dump.txt'
+        write_synthetic_dump(dump, record_count)
+        size_mib = dump.stat().st_size / (1024 * 1024)
+
+        started = time.perf_counter()
+        names = [record.name for record in iter_records(dump, chunk_size)]
+        elapsed = time.perf_counter() - started
+        parsed = len(names)
+
+        classifier = default_classifier()
+        started = time.perf_counter()
+        for name in names:
+            classifier.classify(name)
+        classify_elapsed = time.perf_counter() - started
+
+        # Second pass under tracemalloc so the tracing overhead does not skew the rate.
+        tracemalloc.start()
+        for _ in iter_records(dump, chunk_size):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    rate = parsed / elapsed if elapsed > 0 else float('inf')
+    classify_rate = parsed / classify_elapsed if classify_elapsed > 0 else float('inf')
+    print(
+        f'benchmark: records={parsed} size={size_mib:.1f}MiB time={elapsed:.2f}s '
+        f'rate={rate:,.0f} records/s peak_memory={peak / 1024:.0f}KiB '
+        f'classify_rate={classify_rate:,.0f} names/s'
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--benchmark',
+        type=int,
+        metavar='RECORDS',
+        help='parse a synthetic dump with RECORDS frames and report records/sec and peak memory',
+    )
+    parser.add_argument(
+        '--report-conflicts',
+        action='store_true',
+        help='list shadowed, redundant and overlapping category patterns and unreachable overrides, then exit',
     )
+    parser.add_argument(
+        '--dumps',
+        nargs='+',
+        type=Path,
+        metavar='DUMP',
+        help='merge several frame dumps into one deduplicated index instead of reading SOURCE_FILE',
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        help=f'output directory (default: {OUTPUT_DIR.name}, or {MERGED_OUTPUT_DIR.name} with --dumps)',
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='worker processes for --dumps (default: one per CPU)',
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='ignore the build manifest and re-check every output file against the disk',
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.benchmark:
+        benchmark_parser(args.benchmark)
+        return
+    if args.report_conflicts:
+        conflicts = default_classifier().conflicts
+        for conflict in conflicts:
+            print(conflict.describe())
+        print(f'{len(conflicts)} conflict(s)')
+        return
+
+    if args.dumps:
+        generate_merged(args.dumps, args.output or MERGED_OUTPUT_DIR, jobs=args.jobs, force=args.force)
+        return
+    generate(SOURCE_FILE, args.output or OUTPUT_DIR, force=args.force)
 
 
 if __name__ == '__main__':
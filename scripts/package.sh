@@ -7,6 +7,13 @@ OUTPUT_ZIP="$ROOT_DIR/NOD-Heal-clean.zip"
 TMP_DIR="$(mktemp -d)"
 trap 'rm -rf "$TMP_DIR"' EXIT
 
+# Refresh the UI frame docs first; the manifest makes this a no-op when the dump is unchanged.
+if command -v python3 >/dev/null 2>&1; then
+    python3 "$ROOT_DIR/scripts/generate_ui_frame_yaml.py"
+else
+    echo "[package] python3 not found, skipping ui_frames regeneration" >&2
+fi
+
 DEST_DIR="$TMP_DIR/NOD_Heal"
 mkdir -p "$DEST_DIR"
 
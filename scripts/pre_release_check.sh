@@ -21,4 +21,7 @@ grep -Fq "/nod qa" "$ROOT_DIR/AGENTS.md"
 echo "[pre-release] validating changelog entries"
 grep -Fq "fix(ui/hooks): guard CompactUnitFrame_* hooks" "$ROOT_DIR/CHANGELOG.md"
 
+echo "[pre-release] core benchmark"
+python3 "$ROOT_DIR/scripts/bench/run_core_bench.py" --check
+
 echo "[pre-release] OK"
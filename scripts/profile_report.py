@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Hot-spot report for dispatcher profiles saved with ``/nod prof save`` (or on logout).
+
+Reads ``NODHealDB.profiling.sessions`` from the addon's SavedVariables file and
+prints handlers sorted by CPU time per second of profiling, optionally rolled up
+per module (the label's ``<owner>:`` prefix). ``--compare A B`` lines two sessions
+up label by label to show what got faster or slower between them.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from savedvariables import load
+
+SORT_KEYS = ('ms_per_s', 'total_ms', 'max_ms', 'calls', 'gc_kb')
+
+
+@dataclass
+class HandlerStats:
+    label: str
+    calls: int
+    total_ms: float
+    max_ms: float
+    gc_kb: float
+    hist: List[int]
+
+    @property
+    def module(self) -> str:
+        return self.label.partition(':')[0] if ':' in self.label else '(unlabelled)'
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+@dataclass
+class Session:
+    index: int
+    elapsed: float
+    saved_at: int
+    note: str
+    buckets: List[float]
+    handlers: List[HandlerStats]
+
+    @property
+    def title(self) -> str:
+        stamp = datetime.datetime.fromtimestamp(self.saved_at).strftime('%Y-%m-%d %H:%M') if self.saved_at else '?'
+        note = f' [{self.note}]' if self.note else ''
+        return f'session {self.index} ({stamp}, {self.elapsed:.1f}s){note}'
+
+    def per_second(self, value: float) -> float:
+        return value / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _as_list(value: object) -> list:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        return [value[key] for key in sorted(value, key=str)]
+    return []
+
+
+def load_sessions(path: Path) -> List[Session]:
+    database = load(path).get('NODHealDB')
+    profiling = database.get('profiling') if isinstance(database, dict) else None
+    raw_sessions = _as_list(profiling.get('sessions')) if isinstance(profiling, dict) else []
+    sessions: List[Session] = []
+    for index, raw in enumerate(raw_sessions, 1):
+        handlers = [
+            HandlerStats(
+                label=str(entry.get('label', '?')),
+                calls=int(entry.get('calls', 0)),
+                total_ms=float(entry.get('totalMs', 0)),
+                max_ms=float(entry.get('maxMs', 0)),
+                gc_kb=float(entry.get('gcKB', 0)),
+                hist=[int(count) for count in _as_list(entry.get('hist'))],
+            )
+            for entry in _as_list(raw.get('handlers'))
+            if isinstance(entry, dict)
+        ]
+        sessions.append(Session(
+            index=index,
+            elapsed=float(raw.get('elapsed', 0)),
+            saved_at=int(raw.get('savedAt', 0)),
+            note=str(raw.get('note', '')),
+            buckets=[float(bound) for bound in _as_list(raw.get('buckets'))],
+            handlers=handlers,
+        ))
+    return sessions
+
+
+def by_module(handlers: Sequence[HandlerStats]) -> List[HandlerStats]:
+    """Roll handlers up into one row per module; histograms are summed bucket by bucket."""
+    modules: Dict[str, HandlerStats] = {}
+    for handler in handlers:
+        row = modules.get(handler.module)
+        if row is None:
+            modules[handler.module] = HandlerStats(handler.module, 0, 0.0, 0.0, 0.0, [0] * len(handler.hist))
+            row = modules[handler.module]
+        row.calls += handler.calls
+        row.total_ms += handler.total_ms
+        row.max_ms = max(row.max_ms, handler.max_ms)
+        row.gc_kb += handler.gc_kb
+        row.hist = [left + right for left, right in zip(row.hist, handler.hist)] or list(handler.hist)
+    return list(modules.values())
+
+
+def percentile_bound(hist: Sequence[int], buckets: Sequence[float], fraction: float) -> str:
+    """Upper bound of the histogram bucket holding the ``fraction`` quantile ('>10' for the overflow bucket)."""
+    total = sum(hist)
+    if not total:
+        return '-'
+    threshold = fraction * total
+    seen = 0
+    for index, count in enumerate(hist):
+        seen += count
+        if seen >= threshold:
+            return f'{buckets[index]:g}' if index < len(buckets) else f'>{buckets[-1]:g}' if buckets else '?'
+    return '?'
+
+
+def sort_value(session: Session, handler: HandlerStats, key: str) -> float:
+    return {
+        'ms_per_s': session.per_second(handler.total_ms),
+        'total_ms': handler.total_ms,
+        'max_ms': handler.max_ms,
+        'calls': handler.calls,
+        'gc_kb': handler.gc_kb,
+    }[key]
+
+
+def print_report(session: Session, rows: List[HandlerStats], sort_key: str, top: int) -> None:
+    rows = sorted(rows, key=lambda row: sort_value(session, row, sort_key), reverse=True)[:top]
+    total_ms = sum(row.total_ms for row in rows)
+    print(session.title)
+    print(f'{"handler":<48} {"calls":>8} {"ms/s":>8} {"total ms":>10} {"avg ms":>8} {"p95 ms":>7} '
+          f'{"max ms":>8} {"KB/s":>7} {"share":>6}')
+    for row in rows:
+        share = row.total_ms / total_ms * 100 if total_ms else 0.0
+        print(f'{row.label:<48} {row.calls:>8} {session.per_second(row.total_ms):>8.3f} {row.total_ms:>10.2f} '
+              f'{row.avg_ms:>8.4f} {percentile_bound(row.hist, session.buckets, 0.95):>7} {row.max_ms:>8.2f} '
+              f'{session.per_second(row.gc_kb):>7.2f} {share:>5.1f}%')
+
+
+def print_comparison(before: Session, after: Session, modules: bool, top: int) -> None:
+    rows_before = {row.label: row for row in (by_module(before.handlers) if modules else before.handlers)}
+    rows_after = {row.label: row for row in (by_module(after.handlers) if modules else after.handlers)}
+    labels = set(rows_before) | set(rows_after)
+
+    def rate(session: Session, rows: Dict[str, HandlerStats], label: str, field: str) -> float:
+        row = rows.get(label)
+        return session.per_second(getattr(row, field)) if row else 0.0
+
+    def delta(label: str) -> float:
+        return rate(after, rows_after, label, 'total_ms') - rate(before, rows_before, label, 'total_ms')
+
+    print(f'before: {before.title}')
+    print(f'after:  {after.title}')
+    print(f'{"handler":<48} {"ms/s before":>12} {"ms/s after":>11} {"delta":>9} {"KB/s before":>12} {"KB/s after":>11}')
+    for label in sorted(labels, key=lambda name: abs(delta(name)), reverse=True)[:top]:
+        print(f'{label:<48} {rate(before, rows_before, label, "total_ms"):>12.3f} '
+              f'{rate(after, rows_after, label, "total_ms"):>11.3f} {delta(label):>+9.3f} '
+              f'{rate(before, rows_before, label, "gc_kb"):>12.2f} {rate(after, rows_after, label, "gc_kb"):>11.2f}')
+
+
+def pick(sessions: List[Session], number: int) -> Session:
+    """1-based session number; negative numbers count from the newest."""
+    try:
+        return sessions[number - 1] if number > 0 else sessions[number]
+    except IndexError:
+        raise SystemExit(f'no session {number} ({len(sessions)} saved)') from None
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('savedvariables', type=Path, help='WTF/Account/<account>/SavedVariables/NOD_Heal.lua')
+    parser.add_argument('--session', type=int, default=-1, help='session to report (1-based, negative from newest; default -1)')
+    parser.add_argument('--compare', type=int, nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two sessions')
+    parser.add_argument('--modules', action='store_true', help='one row per module instead of per handler')
+    parser.add_argument('--sort', choices=SORT_KEYS, default='ms_per_s', help='report order (default ms_per_s)')
+    parser.add_argument('--top', type=int, default=20, help='rows to print (default 20)')
+    parser.add_argument('--list', action='store_true', help='list saved sessions and exit')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    sessions = load_sessions(args.savedvariables)
+    if not sessions:
+        print(f'{args.savedvariables}: no profiling sessions (use /nod prof on, then /nod prof save)')
+        return 1
+    if args.list:
+        for session in sessions:
+            print(f'{session.title}: {len(session.handlers)} handlers')
+        return 0
+    if args.compare:
+        print_comparison(pick(sessions, args.compare[0]), pick(sessions, args.compare[1]), args.modules, args.top)
+        return 0
+    session = pick(sessions, args.session)
+    rows = by_module(session.handlers) if args.modules else session.handlers
+    print_report(session, rows, args.sort, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Read WoW SavedVariables files (``WTF/Account/<name>/SavedVariables/NOD_Heal.lua``).
+
+The client writes each variable as ``Name = <value>`` with nested tables in
+``["key"] = value,`` / ``[1] = value,`` form or as positional entries followed by
+``-- [n]`` comments. :func:`loads` turns such a file into ``{name: value}``:
+tables whose keys are exactly ``1..n`` become lists, every other table a dict.
+:func:`dumps` writes that structure back and :func:`subtree_sizes` measures tables
+in one pass over the tokens without building them.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+_TOKEN = re.compile(r'''
+    (?P<space>\s+|--[^\n]*)
+  | (?P<number>-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf\b|nan\b))
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<punct>[{}\[\]=,;])
+''', re.VERBOSE | re.DOTALL)
+_ESCAPES = {b'n': b'\n', b't': b'\t', b'r': b'\r', b'a': b'\a', b'b': b'\b', b'f': b'\f', b'v': b'\v',
+            b'\\': b'\\', b'"': b'"', b"'": b"'", b'\n': b'\n'}
+_ESCAPE = re.compile(rb'\\(\d{1,3}|.)', re.DOTALL)
+
+Token = Tuple[str, str, int]
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+_KEYWORDS = frozenset({'and', 'break', 'do', 'else', 'elseif', 'end', 'false', 'for', 'function', 'if', 'in',
+                       'local', 'nil', 'not', 'or', 'repeat', 'return', 'then', 'true', 'until', 'while'})
+_DUMP_ESCAPES = {'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+class SavedVariablesError(ValueError):
+    """Raised for input that is not in the client's SavedVariables format."""
+
+
+def _unescape(body: str) -> str:
+    # Lua strings are bytes: ``\195\169`` is one UTF-8 character, so escapes are resolved on
+    # the encoded form and decoded the same way the file is read.
+    def replace(match: re.Match) -> bytes:
+        code = match.group(1)
+        if code.isdigit():
+            return bytes([int(code) & 0xFF])
+        return _ESCAPES.get(code, code)
+
+    raw = _ESCAPE.sub(replace, body.encode('utf-8', errors='surrogateescape'))
+    return raw.decode('utf-8', errors='surrogateescape')
+
+
+def _tokenize(text: str) -> Iterator[Token]:
+    """Yield ``(kind, literal, offset)`` lazily; whitespace and comments are skipped."""
+    position = 0
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise SavedVariablesError(f'unexpected input at offset {position}: {text[position:position + 20]!r}')
+        kind = match.lastgroup or ''
+        if kind != 'space':
+            yield kind, match.group(), position
+        position = match.end()
+
+
+def _number(literal: str) -> object:
+    body = literal.lstrip('-')
+    sign = -1 if literal.startswith('-') else 1
+    if body in ('inf', 'nan'):
+        return sign * float(body)
+    if body[:2].lower() == '0x':
+        return sign * int(body, 16)
+    value = float(body)
+    if value.is_integer() and not any(mark in body for mark in '.eE'):
+        return sign * int(body)
+    return sign * value
+
+
+class _Parser:
+    """Recursive descent over a token stream with two tokens of lookahead."""
+
+    def __init__(self, tokens: Iterator[Token]) -> None:
+        self.tokens = tokens
+        self.buffer: List[Token] = []
+
+    def peek(self, ahead: int = 0) -> Optional[Token]:
+        while len(self.buffer) <= ahead:
+            token = next(self.tokens, None)
+            if token is None:
+                return None
+            self.buffer.append(token)
+        return self.buffer[ahead]
+
+    def take(self, value: Optional[str] = None) -> Token:
+        token = self.peek()
+        if token is None or (value is not None and token[1] != value):
+            raise SavedVariablesError(f'expected {value or "a value"}, got {token}')
+        return self.buffer.pop(0)
+
+    def scalar(self, kind: str, literal: str, offset: int) -> object:
+        if kind == 'number':
+            return _number(literal)
+        if kind == 'string':
+            return _unescape(literal[1:-1])
+        if kind == 'name' and literal in ('true', 'false', 'nil'):
+            return {'true': True, 'false': False, 'nil': None}[literal]
+        raise SavedVariablesError(f'unexpected {literal!r} at offset {offset}')
+
+    def value(self) -> object:
+        kind, literal, offset = self.take()
+        if literal == '{':
+            return self.table()
+        return self.scalar(kind, literal, offset)
+
+    def key(self, position: int) -> Tuple[object, bool]:
+        """Key of the next table entry and whether it was explicit (``[k] =`` / ``name =``)."""
+        token = self.peek()
+        if token is not None and token[1] == '[':
+            self.take()
+            key = self.value()
+            self.take(']')
+            self.take('=')
+            return key, True
+        following = self.peek(1)
+        if token is not None and token[0] == 'name' and following is not None and following[1] == '=':
+            self.take()
+            self.take()
+            return token[1], True
+        return position, False
+
+    def end_entry(self) -> None:
+        token = self.peek()
+        if token is not None and token[1] in (',', ';'):
+            self.take()
+
+    def table(self) -> object:
+        entries: Dict[object, object] = {}
+        position = 1
+        while True:
+            token = self.peek()
+            if token is None:
+                raise SavedVariablesError('unterminated table')
+            if token[1] == '}':
+                self.take()
+                break
+            key, explicit = self.key(position)
+            if not explicit:
+                position += 1
+            entries[key] = self.value()
+            self.end_entry()
+        return as_list(entries)
+
+    def measure(self, path: str, depth: int, max_depth: int, found: List['Subtree']) -> None:
+        """Skip one value, recording every table down to ``max_depth`` in file order."""
+        kind, literal, offset = self.take()
+        if literal != '{':
+            self.scalar(kind, literal, offset)
+            return
+        record = Subtree(path, depth, 0, 0)
+        if depth <= max_depth:
+            found.append(record)
+        position = 1
+        while True:
+            token = self.peek()
+            if token is None:
+                raise SavedVariablesError('unterminated table')
+            if token[1] == '}':
+                self.take()
+                record.size = token[2] + 1 - offset
+                return
+            key, explicit = self.key(position)
+            if not explicit:
+                position += 1
+            record.entries += 1
+            self.measure(_child_path(path, key), depth + 1, max_depth, found)
+            self.end_entry()
+
+
+def as_list(entries: Dict[object, object]) -> object:
+    """``entries`` as a list when its keys are exactly ``1..n``, else unchanged."""
+    count = len(entries)
+    if count and all(isinstance(key, int) and not isinstance(key, bool) and 1 <= key <= count for key in entries):
+        return [entries[index] for index in range(1, count + 1)]
+    return entries
+
+
+@dataclass
+class Subtree:
+    path: str
+    depth: int
+    size: int
+    entries: int
+
+
+def _child_path(path: str, key: object) -> str:
+    if isinstance(key, str) and _IDENTIFIER.match(key) and key not in _KEYWORDS:
+        return f'{path}.{key}'
+    return f'{path}[{_dump_scalar(key)}]'
+
+
+def _variables(parser: _Parser) -> Iterator[str]:
+    while parser.peek() is not None:
+        kind, name, _ = parser.take()
+        if kind != 'name':
+            raise SavedVariablesError(f'expected a variable name, got {name!r}')
+        parser.take('=')
+        yield name
+
+
+def loads(text: str) -> Dict[str, object]:
+    """Parse SavedVariables source into ``{variable: value}``."""
+    parser = _Parser(_tokenize(text))
+    return {name: parser.value() for name in _variables(parser)}
+
+
+def load(path: Path) -> Dict[str, object]:
+    return loads(path.read_text(encoding='utf-8', errors='surrogateescape'))
+
+
+def subtree_sizes(text: str, max_depth: int = 2) -> List[Subtree]:
+    """Source length and direct entry count of every table down to ``max_depth`` levels below its
+    variable (the variable itself is depth 0), in file order. Pass latin-1 decoded text to get bytes."""
+    parser = _Parser(_tokenize(text))
+    found: List[Subtree] = []
+    for name in _variables(parser):
+        parser.measure(name, 0, max_depth, found)
+    return found
+
+
+def _dump_scalar(value: object) -> str:
+    if value is None:
+        return 'nil'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise SavedVariablesError(f'cannot write non-finite number {value}')
+        return str(int(value)) if value.is_integer() and abs(value) < 2 ** 53 else repr(value)
+    if isinstance(value, str):
+        body = ''.join(_DUMP_ESCAPES.get(char, char if char >= ' ' else f'\\{ord(char):03d}')
+                       for char in value)
+        return f'"{body}"'
+    raise SavedVariablesError(f'cannot write {type(value).__name__} values')
+
+
+def _dump_value(value: object, indent: str, out: List[str]) -> None:
+    if isinstance(value, list):
+        if all(not isinstance(item, (list, dict)) for item in value):
+            out.append('{' + ', '.join(_dump_scalar(item) for item in value) + '}')
+            return
+        out.append('{\n')
+        for item in value:
+            out.append(indent + '\t')
+            _dump_value(item, indent + '\t', out)
+            out.append(',\n')
+        out.append(indent + '}')
+    elif isinstance(value, dict):
+        out.append('{\n')
+        for key, item in value.items():
+            out.append(f'{indent}\t[{_dump_scalar(key)}] = ')
+            _dump_value(item, indent + '\t', out)
+            out.append(',\n')
+        out.append(indent + '}')
+    else:
+        out.append(_dump_scalar(value))
+
+
+def dumps(variables: Dict[str, object]) -> str:
+    """SavedVariables source for ``{variable: value}``: the client's tab-indented ``[key] = value,``
+    layout, with lists of scalars on one line."""
+    out: List[str] = []
+    for name, value in variables.items():
+        out.append(f'{name} = ')
+        _dump_value(value, '', out)
+        out.append('\n')
+    return ''.join(out)
+
+
+def dump(variables: Dict[str, object], path: Path) -> None:
+    path.write_text(dumps(variables), encoding='utf-8', errors='surrogateescape')
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', type=Path, help='SavedVariables .lua file')
+    parser.add_argument('--variable', help='print only this variable')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    variables = load(args.path)
+    if args.variable:
+        if args.variable not in variables:
+            raise SystemExit(f'{args.path}: no variable {args.variable}')
+        variables = variables[args.variable]
+    print(json.dumps(variables, indent=2, default=str))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
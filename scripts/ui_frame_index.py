@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""SQLite index of generated UI frame docs, plus a small query API and CLI."""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import stat
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+INDEX_SCHEMA_VERSION = 1
+# Highest code point; appended to a prefix it bounds a BINARY-collated range scan.
+_PREFIX_UPPER = '\U0010ffff'
+
+_SCHEMA = (
+    '''CREATE TABLE frames (
+        name TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        prefix TEXT NOT NULL,
+        category TEXT NOT NULL,
+        file TEXT NOT NULL
+    ) WITHOUT ROWID''',
+    'CREATE INDEX frames_type ON frames (type, name)',
+    'CREATE INDEX frames_prefix ON frames (prefix, name)',
+    'CREATE INDEX frames_category ON frames (category, name)',
+    'CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID',
+)
+
+IndexRow = Tuple[str, str, str, str, str]
+
+
+@dataclass(frozen=True)
+class IndexedFrame:
+    name: str
+    type: str
+    prefix: str
+    category: str
+    file: str
+
+
+def replacement_mode(path: Path) -> int:
+    """Permission bits for a file about to replace ``path`` (mkstemp creates 0600 files)."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_index(path: Path, rows: Iterable[IndexRow], meta: Optional[dict] = None) -> int:
+    """Build the index in a sibling temp file and rename it over ``path``; returns the row count."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(tmp_name)
+        try:
+            connection.execute('PRAGMA journal_mode = OFF')
+            connection.execute('PRAGMA synchronous = OFF')
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            # Duplicate names in a single dump keep their first placement, matching the YAML order.
+            connection.executemany('INSERT OR IGNORE INTO frames VALUES (?, ?, ?, ?, ?)', rows)
+            entries = {'schema_version': str(INDEX_SCHEMA_VERSION)}
+            entries.update({key: str(value) for key, value in (meta or {}).items()})
+            connection.executemany('INSERT INTO meta VALUES (?, ?)', sorted(entries.items()))
+            count = connection.execute('SELECT COUNT(*) FROM frames').fetchone()[0]
+            connection.commit()
+            connection.execute('VACUUM')
+        finally:
+            connection.close()
+        os.chmod(tmp_name, replacement_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    return count
+
+
+class FrameIndex:
+    """Read-only view over an index written by :func:`write_index`.
+
+    Open it once and reuse it for many lookups; every query is a single indexed
+    SQLite statement, so nothing is loaded up front.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise FileNotFoundError(f'frame index not found: {self.path}')
+        self._connection = sqlite3.connect(f'{self.path.resolve().as_uri()}?mode=ro', uri=True)
+        version = self.meta().get('schema_version')
+        if version != str(INDEX_SCHEMA_VERSION):
+            self.close()
+            raise ValueError(f'unsupported frame index schema {version!r} in {self.path}')
+
+    def __enter__(self) -> 'FrameIndex':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def meta(self) -> dict:
+        return dict(self._connection.execute('SELECT key, value FROM meta'))
+
+    def _select(self, where: str, params: Sequence[object], limit: Optional[int]) -> List[IndexedFrame]:
+        sql = f'SELECT name, type, prefix, category, file FROM frames WHERE {where} ORDER BY name'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params = (*params, limit)
+        return [IndexedFrame(*row) for row in self._connection.execute(sql, params)]
+
+    def get(self, name: str) -> Optional[IndexedFrame]:
+        rows = self._select('name = ?', (name,), 1)
+        return rows[0] if rows else None
+
+    def category_of(self, name: str) -> Optional[str]:
+        frame = self.get(name)
+        return frame.category if frame else None
+
+    def with_prefix(self, prefix: str, frame_type: Optional[str] = None, limit: Optional[int] = None) -> List[IndexedFrame]:
+        """Frames whose name starts with ``prefix`` (case-sensitive), optionally of one type."""
+        where = 'name >= ? AND name < ?'
+        params: List[object] = [prefix, prefix + _PREFIX_UPPER]
+        if frame_type is not None:
+            where += ' AND type = ?'
+            params.append(frame_type)
+        return self._select(where, params, limit)
+
+    def of_type(self, frame_type: str, limit: Optional[int] = None) -> List[IndexedFrame]:
+        return self._select('type = ?', (frame_type,), limit)
+
+    def in_category(self, category: str, limit: Optional[int] = None) -> List[IndexedFrame]:
+        return self._select('category = ?', (category,), limit)
+
+    def in_group(self, prefix: str, limit: Optional[int] = None) -> List[IndexedFrame]:
+        """Frames sharing the generator's lower-cased alphabetic grouping prefix."""
+        return self._select('prefix = ?', (prefix.lower(),), limit)
+
+
+def default_index_path() -> Path:
+    docs = Path(__file__).resolve().parent.parent / 'docs' / 'legacy' / 'DOCU'
+    return docs / 'ui_frames.sqlite'
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('name', nargs='?', help='exact frame name to look up')
+    parser.add_argument('--index', type=Path, default=default_index_path(), help='index file to query')
+    parser.add_argument('--prefix', help='list frames whose name starts with PREFIX')
+    parser.add_argument('--type', dest='frame_type', help='restrict to frames of TYPE')
+    parser.add_argument('--category', help='list frames in CATEGORY')
+    parser.add_argument('--limit', type=int, help='maximum number of rows to print')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    with FrameIndex(args.index) as index:
+        if args.name:
+            frames = [frame for frame in [index.get(args.name)] if frame]
+        elif args.prefix is not None:
+            frames = index.with_prefix(args.prefix, args.frame_type, args.limit)
+        elif args.category:
+            frames = index.in_category(args.category, args.limit)
+        elif args.frame_type:
+            frames = index.of_type(args.frame_type, args.limit)
+        else:
+            print(f'{args.index.name}: {index.meta()}')
+            return 0
+    for frame in frames:
+        print(f'{frame.name}\t{frame.type}\t{frame.category}\t{frame.file}')
+    return 0 if frames else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())